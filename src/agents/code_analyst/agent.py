@@ -19,6 +19,7 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 
 from src.agents.code_analyst.config import CodeAnalystSettings
+from src.shared.config import get_settings
 from src.shared.llms import get_openai_model
 from src.shared.logging import setup_logging
 from src.shared.observability import MCPTraceContextInterceptor, is_langfuse_enabled
@@ -94,7 +95,7 @@ class CodeAnalystAgent:
         """
         import os
         logger.info("Creating CodeAnalystAgent...")
-        settings = settings or CodeAnalystSettings()
+        settings = settings or get_settings(CodeAnalystSettings)
         logger.info("Using analysis model: %s", settings.analysis_model)
 
         # Connect via HTTP/SSE to the code_analyst service
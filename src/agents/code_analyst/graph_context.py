@@ -12,6 +12,7 @@ from typing import Any
 from langchain_neo4j import Neo4jGraph
 
 from src.agents.code_analyst.config import CodeAnalystSettings
+from src.shared.config import get_settings
 from src.shared.exceptions import CodeAnalystError
 
 logger = logging.getLogger("code_analyst.graph_context")
@@ -21,7 +22,7 @@ class GraphContextRetriever:
     """Read-only query interface over the enriched FastAPI knowledge graph."""
 
     def __init__(self, settings: CodeAnalystSettings | None = None):
-        settings = settings or CodeAnalystSettings()
+        settings = settings or get_settings(CodeAnalystSettings)
         self._graph = Neo4jGraph(
             url=settings.neo4j_uri,
             username=settings.neo4j_username,
@@ -78,10 +79,10 @@ class GraphContextRetriever:
 
         return None
 
-    def _get_file_path(self, qualified_name: str) -> str | None:
-        """Return the file path containing this entity."""
+    def _get_file_path(self, qualified_name: str, label: str) -> str | None:
+        """Return the file path containing this ``label`` (Function or Class) entity."""
         rows = self._query(
-            "MATCH (f:File)-[:CONTAINS*1..3]->(n {qualified_name: $qname}) "
+            f"MATCH (f:File)-[:CONTAINS*1..3]->(n:{label} {{qualified_name: $qname}}) "
             "RETURN f.path AS path LIMIT 1",
             {"qname": qualified_name},
         )
@@ -118,6 +119,7 @@ class GraphContextRetriever:
                 "message": "This entity does not exist in the knowledge graph. It may be from an external library or not yet indexed."
             }
         qname = entity["qualified_name"]
+        label = entity.get("_label", "Function")
 
         result: dict[str, Any] = {
             "qualified_name": qname,
@@ -202,7 +204,7 @@ class GraphContextRetriever:
         )
 
         # Location context
-        result["file_path"] = self._get_file_path(qname)
+        result["file_path"] = self._get_file_path(qname, label)
         result["parent_class"] = self._get_parent_class(qname)
 
         # Success indicator
@@ -341,7 +343,7 @@ class GraphContextRetriever:
         )
 
         # Location
-        result["file_path"] = self._get_file_path(qname)
+        result["file_path"] = self._get_file_path(qname, "Class")
 
         # Success indicator
         result["found"] = True
@@ -453,7 +455,7 @@ class GraphContextRetriever:
             "name": entity.get("name"),
             "type": label,
             "source": entity.get("source"),
-            "file_path": self._get_file_path(qname),
+            "file_path": self._get_file_path(qname, label),
             "parent_class": self._get_parent_class(qname) if label == "Function" else None,
         }
 
@@ -499,7 +501,7 @@ class GraphContextRetriever:
         # File imports
         if include_imports:
             result["imports"] = self._query(
-                "MATCH (f:File)-[:CONTAINS*1..3]->({qualified_name: $qname}) "
+                f"MATCH (f:File)-[:CONTAINS*1..3]->(:{label} {{qualified_name: $qname}}) "
                 "MATCH (f)-[:DEFINES_MODULE]->(m:Module)-[r:IMPORTS]->(target:Module) "
                 "RETURN target.qualified_name AS module, r.names AS names",
                 {"qname": qname},
@@ -534,6 +536,7 @@ class GraphContextRetriever:
                 "message": "This entity does not exist in the knowledge graph. It may be from an external library or not yet indexed."
             }
         qname = entity["qualified_name"]
+        label = entity.get("_label", "Function")
 
         result: dict[str, Any] = {
             "qualified_name": qname,
@@ -555,14 +558,14 @@ class GraphContextRetriever:
 
         # Decorators
         result["decorators"] = self._query(
-            "MATCH (n {qualified_name: $qname})-[:DECORATED_BY]->(d:Decorator) "
+            f"MATCH (n:{label} {{qualified_name: $qname}})-[:DECORATED_BY]->(d:Decorator) "
             "RETURN d.name AS name, d.arguments AS arguments",
             {"qname": qname},
         )
 
         # Domain concepts
         result["domain_concepts"] = self._query(
-            "MATCH (n {qualified_name: $qname})-[:RELATES_TO_CONCEPT]->(c:DomainConcept) "
+            f"MATCH (n:{label} {{qualified_name: $qname}})-[:RELATES_TO_CONCEPT]->(c:DomainConcept) "
             "RETURN c.name AS name",
             {"qname": qname},
         )
@@ -570,7 +573,7 @@ class GraphContextRetriever:
         # Data flow chain
         if follow_data_flow:
             result["data_flow_chain"] = self._query(
-                f"MATCH path = (n {{qualified_name: $qname}})-[:DATA_FLOWS_TO*1..{int(max_depth)}]->(target) "
+                f"MATCH path = (n:{label} {{qualified_name: $qname}})-[:DATA_FLOWS_TO*1..{int(max_depth)}]->(target) "
                 "UNWIND nodes(path)[1..] AS step "
                 "RETURN DISTINCT step.qualified_name AS qualified_name, "
                 "       step.name AS name, step.purpose AS purpose, "
@@ -593,7 +596,7 @@ class GraphContextRetriever:
             result["call_chain"] = []
 
         # Location context
-        result["file_path"] = self._get_file_path(qname)
+        result["file_path"] = self._get_file_path(qname, label)
         result["parent_class"] = self._get_parent_class(qname)
 
         # Success indicator
@@ -666,7 +669,7 @@ class GraphContextRetriever:
 
         # Parameters / Attributes
         profile["parameters"] = self._query(
-            "MATCH (n {qualified_name: $qname})-[:HAS_PARAMETER]->(p:Parameter) "
+            f"MATCH (n:{label} {{qualified_name: $qname}})-[:HAS_PARAMETER]->(p:Parameter) "
             "RETURN p.name AS name, p.type_annotation AS type, p.kind AS kind "
             "ORDER BY p.position",
             {"qname": qname},
@@ -674,7 +677,7 @@ class GraphContextRetriever:
 
         # Decorators
         profile["decorators"] = self._query(
-            "MATCH (n {qualified_name: $qname})-[:DECORATED_BY]->(d:Decorator) "
+            f"MATCH (n:{label} {{qualified_name: $qname}})-[:DECORATED_BY]->(d:Decorator) "
             "RETURN d.name AS name",
             {"qname": qname},
         )
@@ -694,12 +697,12 @@ class GraphContextRetriever:
 
             # Patterns and concepts (edges)
             profile["patterns"] = self._query(
-                "MATCH (n {qualified_name: $qname})-[:IMPLEMENTS_PATTERN]->(p:DesignPattern) "
+                f"MATCH (n:{label} {{qualified_name: $qname}})-[:IMPLEMENTS_PATTERN]->(p:DesignPattern) "
                 "RETURN p.name AS name",
                 {"qname": qname},
             )
             profile["concepts"] = self._query(
-                "MATCH (n {qualified_name: $qname})-[:RELATES_TO_CONCEPT]->(c:DomainConcept) "
+                f"MATCH (n:{label} {{qualified_name: $qname}})-[:RELATES_TO_CONCEPT]->(c:DomainConcept) "
                 "RETURN c.name AS name",
                 {"qname": qname},
             )
@@ -717,7 +720,7 @@ class GraphContextRetriever:
                     {"qname": qname},
                 )
 
-        profile["file_path"] = self._get_file_path(qname)
+        profile["file_path"] = self._get_file_path(qname, label)
 
         # Success indicator
         profile["found"] = True
@@ -16,6 +16,7 @@ from mcp.server.transport_security import TransportSecuritySettings
 
 from src.agents.code_analyst.config import CodeAnalystSettings
 from src.agents.code_analyst.graph_context import GraphContextRetriever
+from src.shared.config import get_settings
 from src.shared.logging import setup_logging
 
 logger = setup_logging("code_analyst", level="INFO")
@@ -40,7 +41,7 @@ def _get_settings() -> CodeAnalystSettings:
     global _settings
     if _settings is None:
         logger.info("Initializing CodeAnalystSettings from environment...")
-        _settings = CodeAnalystSettings()
+        _settings = get_settings(CodeAnalystSettings)
         logger.info("CodeAnalystSettings initialized")
     return _settings
 
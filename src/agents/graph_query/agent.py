@@ -19,6 +19,7 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 
 from src.agents.graph_query.config import GraphQuerySettings
+from src.shared.config import get_settings
 from src.shared.llms.models import get_openai_model
 from src.shared.logging import setup_logging
 from src.shared.observability import MCPTraceContextInterceptor, is_langfuse_enabled
@@ -144,7 +145,7 @@ class GraphQueryAgent:
         """
         import os
         logger.info("Creating GraphQueryAgent...")
-        settings = settings or GraphQuerySettings()
+        settings = settings or get_settings(GraphQuerySettings)
         logger.info("Using query model: %s", settings.query_model)
 
         # Connect via HTTP/SSE to the graph_query service
@@ -14,6 +14,7 @@ from typing import Any
 from langchain_neo4j import Neo4jGraph
 
 from src.agents.graph_query.config import GraphQuerySettings
+from src.shared.config import get_settings
 from src.shared.exceptions import GraphQueryError
 from src.shared.llms.models import get_openai_embeddings
 
@@ -76,7 +77,7 @@ class GraphStore:
     """Read-only query interface over the enriched FastAPI knowledge graph."""
 
     def __init__(self, settings: GraphQuerySettings | None = None):
-        settings = settings or GraphQuerySettings()
+        settings = settings or get_settings(GraphQuerySettings)
         self._graph = Neo4jGraph(
             url=settings.neo4j_uri,
             username=settings.neo4j_username,
@@ -242,7 +243,7 @@ class GraphStore:
         source_field = ", target.source AS source" if include_source else ""
 
         rows = self._query(
-            f"MATCH path = (source {{qualified_name: $qname}})"
+            f"MATCH path = (source:{entity['type']} {{qualified_name: $qname}})"
             f"-[:{rel_filter}*1..{depth}]->(target) "
             "WHERE target.qualified_name IS NOT NULL "
             "RETURN DISTINCT target.qualified_name AS qualified_name, "
@@ -285,7 +286,7 @@ class GraphStore:
         rows = self._query(
             f"MATCH path = (src)"
             f"-[:{rel_filter}*1..{depth}]->"
-            "(target {qualified_name: $qname}) "
+            f"(target:{entity['type']} {{qualified_name: $qname}}) "
             "WHERE src.qualified_name IS NOT NULL "
             "RETURN DISTINCT src.qualified_name AS qualified_name, "
             "       src.name AS name, labels(src)[0] AS type, "
@@ -399,7 +400,7 @@ class GraphStore:
 
         if direction in ("outgoing", "both"):
             results.extend(self._query(
-                f"MATCH (source {{qualified_name: $qname}})"
+                f"MATCH (source:{entity['type']} {{qualified_name: $qname}})"
                 f"-[r:{rel_filter}]->(target{target_label}) "
                 "RETURN target.qualified_name AS qualified_name, "
                 "       target.name AS name, labels(target)[0] AS type, "
@@ -415,7 +416,7 @@ class GraphStore:
             if remaining > 0:
                 results.extend(self._query(
                     f"MATCH (source{target_label})"
-                    f"-[r:{rel_filter}]->(target {{qualified_name: $qname}}) "
+                    f"-[r:{rel_filter}]->(target:{entity['type']} {{qualified_name: $qname}}) "
                     "RETURN source.qualified_name AS qualified_name, "
                     "       source.name AS name, labels(source)[0] AS type, "
                     "       source.purpose AS purpose, "
@@ -16,6 +16,7 @@ from mcp.server.transport_security import TransportSecuritySettings
 
 from src.agents.graph_query.config import GraphQuerySettings
 from src.agents.graph_query.graph_store import GraphStore
+from src.shared.config import get_settings
 from src.shared.logging import setup_logging
 
 logger = setup_logging("graph_query", level="INFO")
@@ -40,7 +41,7 @@ def _get_settings() -> GraphQuerySettings:
     global _settings
     if _settings is None:
         logger.info("Initializing GraphQuerySettings from environment...")
-        _settings = GraphQuerySettings()
+        _settings = get_settings(GraphQuerySettings)
         logger.info("GraphQuerySettings initialized")
     return _settings
 
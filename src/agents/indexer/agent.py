@@ -18,6 +18,7 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 
 from src.agents.indexer.config import IndexerSettings
+from src.shared.config import get_settings
 from src.shared.llms.models import get_openai_model
 from src.shared.logging import setup_logging
 from src.shared.observability import MCPTraceContextInterceptor, is_langfuse_enabled
@@ -106,7 +107,7 @@ class IndexerAgent:
         """
         import os
         logger.info("Creating IndexerAgent...")
-        settings = settings or IndexerSettings()
+        settings = settings or get_settings(IndexerSettings)
         logger.info("Using enrichment model: %s", settings.enrichment_model)
 
         # Connect via HTTP/SSE to the indexer service
@@ -14,6 +14,9 @@ class IndexerSettings(BaseAgentSettings):
     enrichment_model: str = os.getenv("DEFAULT_MINI_MODEL", "gpt-5-mini-2025-08-07")
     embedding_model: str = os.getenv("DEFAULT_EMBEDDING_MODEL", "text-embedding-3-large")
     enrichment_batch_size: int = 30
+    enrichment_use_batch_api: bool = False
+    enrichment_rpm: int = 500
+    enrichment_tpm: int = 90_000
     max_concurrent_files: int = 10
 
     class Config:
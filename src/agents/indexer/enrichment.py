@@ -8,13 +8,16 @@ Supports caching via content hash to avoid re-enriching unchanged code.
 
 import asyncio
 import logging
+from collections import OrderedDict
 from typing import Any
 
+import orjson
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_openai import ChatOpenAI
 
-from src.shared.llms import get_enrichment_model
+from src.shared.llms import CreditSemaphore, get_enrichment_model
 from src.shared.models import FunctionEnrichment, ClassEnrichment
+from src.agents.indexer.models import ClassView, FunctionView
 from src.agents.indexer.enrichment_prompts import (
     ENRICHMENT_SYSTEM_PROMPT,
     build_enrichment_prompt,
@@ -22,16 +25,70 @@ from src.agents.indexer.enrichment_prompts import (
 
 logger = logging.getLogger("indexer-agent.enrichment")
 
+# Upper bound on enrichments held in the process-local cache
+LOCAL_CACHE_MAX_ENTRIES = 50_000
+
+# Provider rate-limit window, in seconds
+RATE_LIMIT_WINDOW = 60.0
+
+# Identical for every entity, so built once and shared across calls
+_SYSTEM_MSG = SystemMessage(content=ENRICHMENT_SYSTEM_PROMPT)
+# Rough token estimate (~4 chars per token) for the system prompt
+_SYSTEM_PROMPT_TOKENS = len(ENRICHMENT_SYSTEM_PROMPT) // 4
+
+# Minimal enrichments returned when every LLM attempt fails; these mirror
+# the model_dump() of an otherwise-empty Function/ClassEnrichment
+_FALLBACK_FUNCTION_ENRICHMENT = {
+    "purpose": "",
+    "summary": "",
+    "design_patterns": [],
+    "complexity": "low",
+    "side_effects": [],
+    "domain_concepts": [],
+    "parameters_explained": [],
+    "data_flows_to": [],
+}
+_FALLBACK_CLASS_ENRICHMENT = {
+    "purpose": "",
+    "summary": "",
+    "design_patterns": [],
+    "role": "other",
+    "key_methods": [],
+    "collaborators": [],
+    "domain_concepts": [],
+    "data_flows_to": [],
+}
+
+# OpenAI Batch API job states that will not change any further
+_BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _hash_key(content_hash: str) -> int:
+    """
+    Compact set key for a content hash.
+
+    Content hashes are 16 hex chars (64 bits), so they fit in a machine-word
+    int, which is smaller and cheaper to hash/compare than the string.
+    """
+    try:
+        return int(content_hash, 16)
+    except ValueError:
+        return hash(content_hash)
+
 
 class LLMEnricher:
     """
     Enriches code entities with semantic information via LLM calls.
 
     Features:
-    - Batched async requests for throughput
-    - Content hash caching to skip unchanged entities
+    - Bounded worker pool of concurrent LLM requests for throughput
+    - Requests-/tokens-per-minute credit limits to avoid bursting into 429s
+    - Content hash caching to skip unchanged entities, with a process-local
+      LRU and known-hash filter in front of the Neo4j cache
     - Structured JSON output parsing with retry
     - Enriches nested functions with parent context
+    - Optional OpenAI Batch API path for cold-cache full-graph runs
+    - Results buffered and written to Neo4j in UNWIND batches
     """
 
     def __init__(
@@ -39,9 +96,15 @@ class LLMEnricher:
         model: ChatOpenAI | None = None,
         batch_size: int = 30,
         max_retries: int = 3,
+        use_batch_api: bool = False,
+        batch_poll_interval: float = 30.0,
+        rpm: int = 500,
+        tpm: int = 90_000,
     ):
         base_model = get_enrichment_model()
         logger.info("Initializing LLMEnricher with enrichment model: %s", base_model.model_name)
+        self._model_name = base_model.model_name
+        self._openai_client = base_model.root_async_client
         self._function_chain = base_model.with_structured_output(
             FunctionEnrichment
         )
@@ -50,6 +113,24 @@ class LLMEnricher:
         )
         self._batch_size = batch_size
         self._max_retries = max_retries
+        # Caps in-flight LLM requests across the worker pool and direct callers
+        self._llm_semaphore = asyncio.Semaphore(batch_size)
+        # Requests/tokens per minute, refunded once the provider window passes
+        self._rpm_sem = CreditSemaphore(capacity=rpm, refund_time=RATE_LIMIT_WINDOW)
+        self._tpm_sem = CreditSemaphore(capacity=tpm, refund_time=RATE_LIMIT_WINDOW)
+        self._use_batch_api = use_batch_api
+        self._batch_poll_interval = batch_poll_interval
+        # content_hash -> enrichment, most recently used last
+        self._local_cache: OrderedDict[str, dict] = OrderedDict()
+        # Hashes present in the Neo4j cache (as ints, see _hash_key); None until preloaded
+        self._known_hashes: set[int] | None = None
+        # (qname, entity_type, enrichment, content_hash) awaiting a bulk write
+        self._pending_writes: list[tuple[str, str, dict, str]] = []
+        # Entities counted as enriched whose node write later failed
+        self._failed_writes = 0
+        self._write_lock = asyncio.Lock()
+        # content_hash -> (qname, entity_type) duplicates waiting on an in-flight enrichment
+        self._inflight: dict[str, list[tuple[str, str]]] = {}
 
     async def enrich_entity(
         self,
@@ -61,7 +142,8 @@ class LLMEnricher:
         Enrich a single entity with LLM analysis.
 
         Args:
-            entity: Parsed entity dict (from AST parser or reconstructed from graph).
+            entity: Parsed entity dict from the AST parser, or a FunctionView /
+                ClassView reconstructed from graph properties.
             entity_type: 'function' or 'class'.
             context: Optional context (parent class, callers, callees, parent_function).
 
@@ -90,16 +172,8 @@ class LLMEnricher:
         logger.error(f"All enrichment attempts failed for {entity.get('qualified_name')}")
         docstring_snippet = entity.get("docstring", "") or "Unable to enrich"
         if entity_type == "class":
-            return ClassEnrichment(
-                purpose=docstring_snippet,
-                summary="",
-                role="other",
-            ).model_dump()
-        return FunctionEnrichment(
-            purpose=docstring_snippet,
-            summary="",
-            complexity="low",
-        ).model_dump()
+            return {**_FALLBACK_CLASS_ENRICHMENT, "purpose": docstring_snippet}
+        return {**_FALLBACK_FUNCTION_ENRICHMENT, "purpose": docstring_snippet}
 
     async def enrich_all_nodes(self, graph_manager, progress_callback=None) -> int:
         """
@@ -109,6 +183,15 @@ class LLMEnricher:
         Enriches nested functions with parent context.
         Returns the number of entities enriched.
 
+        Entities that need an LLM call are queued to a pool of ``batch_size``
+        workers, so a new call starts as soon as any in-flight call finishes
+        instead of waiting for the slowest call of a fixed-size wave.
+
+        With ``use_batch_api`` set, top-level entities are instead collected
+        and submitted as one OpenAI Batch API job (cheaper, no latency
+        guarantee).  Nested functions, small runs, and any entity the batch
+        job fails to return still go through the real-time worker pool.
+
         Args:
             graph_manager: Neo4j graph manager instance.
             progress_callback: Optional async callable(message: str) to report progress.
@@ -116,254 +199,586 @@ class LLMEnricher:
         from src.agents.indexer.graph_manager import Neo4jGraphManager
 
         gm: Neo4jGraphManager = graph_manager
-        enriched_count = 0
+        stats = {"enriched": 0}
+        self._pending_writes = []
+        self._failed_writes = 0
+        self._inflight = {}
+
+        await self._load_known_hashes(gm)
+
+        # Bounded so paging through the graph stays just ahead of the workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._batch_size * 2)
+        workers = [
+            asyncio.create_task(self._worker(gm, queue, stats))
+            for _ in range(self._batch_size)
+        ]
+
+        batch_items: list[tuple] = []
+
+        async def dispatch(item: tuple) -> None:
+            entity, entity_type, context = item
+            # Enrichment is a function of content_hash: an entity identical to
+            # one already in flight just reuses its result when it lands
+            content_hash = entity.get("content_hash")
+            if content_hash:
+                duplicates = self._inflight.get(content_hash)
+                if duplicates is not None:
+                    duplicates.append((entity["qualified_name"], entity_type))
+                    return
+                self._inflight[content_hash] = []
+            if self._use_batch_api and not context.get("parent_function"):
+                batch_items.append(item)
+            else:
+                await queue.put(item)
+
+        try:
+            await self._queue_functions(gm, dispatch, stats, progress_callback)
+            await self._queue_classes(gm, dispatch, stats, progress_callback)
+
+            if len(batch_items) >= self._batch_size:
+                leftovers = await self._run_batch_job(
+                    gm, batch_items, stats, progress_callback,
+                )
+            else:
+                leftovers = batch_items
+            for item in leftovers:
+                await queue.put(item)
+
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self._flush_writes(gm)
+
+        # Entities are counted when their write is queued; take back any
+        # whose bulk write failed so the total reflects what was persisted
+        enriched = stats["enriched"] - self._failed_writes
+        if self._failed_writes:
+            logger.error(
+                "Enrichment: %d entities were not persisted (bulk write failed)",
+                self._failed_writes,
+            )
+        logger.info("Enrichment complete: %d total entities enriched", enriched)
+        return enriched
+
+    async def _worker(self, gm, queue: asyncio.Queue, stats: dict) -> None:
+        """Pull (entity, entity_type, context) items off the queue until cancelled."""
+        while True:
+            entity, entity_type, context = await queue.get()
+            try:
+                # Await before reading the counter: `+= await` would read it
+                # first and drop increments made by other workers meanwhile
+                stored = await self._enrich_and_store(gm, entity, entity_type, context)
+                stats["enriched"] += stored
+            except Exception as e:
+                logger.error(
+                    f"Enrichment task failed for {entity.get('qualified_name', '?')}: {e}"
+                )
+                # Same-hash duplicates parked behind this entity share its fate;
+                # release them so they are reported instead of silently dropped
+                content_hash = entity.get("content_hash")
+                duplicates = self._inflight.pop(content_hash, []) if content_hash else []
+                if duplicates:
+                    logger.error(
+                        f"Enrichment skipped for {len(duplicates)} duplicates of "
+                        f"{entity.get('qualified_name', '?')}: "
+                        f"{', '.join(qname for qname, _ in duplicates)}"
+                    )
+            finally:
+                queue.task_done()
+
+    async def _queue_functions(
+        self, gm, dispatch, stats: dict, progress_callback=None,
+    ) -> None:
+        """Page through unenriched functions, applying cache hits and queueing the rest."""
+        total_functions = await self._count_unenriched(gm, "Function")
+        logger.info("Enrichment: %d functions to process", total_functions)
+        if progress_callback:
+            await progress_callback(f"Starting enrichment: {total_functions} functions to process")
+
+        progress_done = 0
+        next_page = asyncio.create_task(self._fetch_function_page(gm, ""))
+        try:
+            while True:
+                batch, bundles = await next_page
+                if not batch:
+                    break
+                # Prefetch the next page while this one is checked and queued
+                next_page = asyncio.create_task(
+                    self._fetch_function_page(gm, batch[-1]["qname"])
+                )
+
+                for func in batch:
+                    # Check cache first
+                    cached = await self.get_cached_enrichment(gm, func["content_hash"])
+                    if cached:
+                        await self._queue_write(gm, func["qname"], "function", cached)
+                        stats["enriched"] += 1
+                        continue
+
+                    bundle = bundles.get(func["qname"], {})
+
+                    # Build context from graph
+                    context = self._function_context_from_bundle(func, bundle)
+
+                    # Reconstruct entity from graph properties
+                    entity = FunctionView(
+                        source=func["source"],
+                        qualified_name=func["qname"],
+                        content_hash=func["content_hash"],
+                        docstring=func.get("docstring", ""),
+                        is_async=func.get("is_async", False),
+                        decorators=[{"name": name} for name in bundle.get("decorators", [])],
+                        parameters=bundle.get("parameters", []),
+                    )
+
+                    await dispatch((entity, "function", context))
+
+                progress_done += len(batch)
+                logger.info(
+                    "Enrichment progress: %d/%d functions queued",
+                    progress_done,
+                    total_functions,
+                )
+                if progress_callback:
+                    await progress_callback(f"Enriching functions: {progress_done}/{total_functions}")
+        finally:
+            next_page.cancel()
+
+    async def _fetch_function_page(self, gm, after: str) -> tuple[list[dict], dict[str, dict]]:
+        """
+        Fetch the next page of unenriched functions and their context bundles.
 
-        # ─── Functions (including methods and nested functions) ───
-        functions = await gm._run(
+        Pages by qualified_name (keyset pagination: enriched rows drop out
+        of the filter, so SKIP would skip unprocessed rows).
+        """
+        batch = await gm._run(
             """
             MATCH (f:Function)
-            WHERE f.enrichment_hash IS NULL OR f.enrichment_hash <> f.content_hash
+            WHERE (f.enrichment_hash IS NULL OR f.enrichment_hash <> f.content_hash)
+              AND f.qualified_name > $after
+            WITH f
+            ORDER BY f.qualified_name
+            LIMIT $limit
+            OPTIONAL MATCH (cls:Class)-[:CONTAINS]->(f)
+            OPTIONAL MATCH (pf:Function)-[:CONTAINS]->(f)
             RETURN f.qualified_name AS qname, f.source AS source,
                    f.content_hash AS content_hash, f.docstring AS docstring,
                    f.is_method AS is_method, f.is_nested AS is_nested,
-                   f.is_async AS is_async
-            """
+                   f.is_async AS is_async,
+                   cls.qualified_name AS parent_class,
+                   pf.qualified_name AS parent_function
+            ORDER BY f.qualified_name
+            """,
+            {"after": after, "limit": self._batch_size},
         )
-        total_functions = len(functions)
-        logger.info("Enrichment: %d functions to process", total_functions)
+        if not batch:
+            return [], {}
+        # Fetch decorators, parameters and call context for the whole batch
+        bundles = await self._fetch_function_bundle(gm, [func["qname"] for func in batch])
+        return batch, bundles
+
+    async def _queue_classes(
+        self, gm, dispatch, stats: dict, progress_callback=None,
+    ) -> None:
+        """Page through unenriched classes, applying cache hits and queueing the rest."""
+        total_classes = await self._count_unenriched(gm, "Class")
+        logger.info("Enrichment: %d classes to process", total_classes)
         if progress_callback:
-            await progress_callback(f"Starting enrichment: {total_functions} functions to process")
+            await progress_callback(f"Starting class enrichment: {total_classes} classes to process")
 
-        for i in range(0, total_functions, self._batch_size):
-            batch = functions[i : i + self._batch_size]
-
-            # Report progress before processing batch to keep connection alive
-            progress_start = i
-            if progress_callback:
-                await progress_callback(f"Enriching functions: {progress_start}/{total_functions}")
-
-            tasks = []
-
-            for func in batch:
-                # Check cache first
-                cached = await gm.get_cached_enrichment(func["content_hash"])
-                if cached:
-                    await gm.set_enrichment(func["qname"], cached, "function")
-                    await gm.create_semantic_edges(func["qname"], cached)
-                    enriched_count += 1
-                    continue
-
-                # Build context from graph
-                context = await self._build_function_context(gm, func)
-
-                # Reconstruct entity dict from graph properties
-                entity = {
-                    "source": func["source"],
-                    "qualified_name": func["qname"],
-                    "content_hash": func["content_hash"],
-                    "docstring": func.get("docstring", ""),
-                    "is_async": func.get("is_async", False),
-                }
-
-                # Fetch decorators from graph
-                decorators = await gm._run(
-                    "MATCH (f:Function {qualified_name: $qname})-[:DECORATED_BY]->(d) RETURN d.name AS name",
-                    {"qname": func["qname"]},
-                )
-                entity["decorators"] = [{"name": d["name"]} for d in decorators]
-
-                # Fetch parameters from graph
-                params = await gm._run(
-                    """
-                    MATCH (f:Function {qualified_name: $qname})-[:HAS_PARAMETER]->(p:Parameter)
-                    RETURN p.name AS name, p.type_annotation AS type_annotation,
-                           p.default_value AS default_value, p.kind AS kind,
-                           p.position AS position
-                    ORDER BY p.position
-                    """,
-                    {"qname": func["qname"]},
+        progress_done = 0
+        next_page = asyncio.create_task(self._fetch_class_page(gm, ""))
+        try:
+            while True:
+                batch, bundles = await next_page
+                if not batch:
+                    break
+                # Prefetch the next page while this one is checked and queued
+                next_page = asyncio.create_task(
+                    self._fetch_class_page(gm, batch[-1]["qname"])
                 )
-                entity["parameters"] = params
-
-                tasks.append(self._enrich_and_store(gm, entity, "function", context))
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for r in results:
-                if isinstance(r, Exception):
-                    logger.error(f"Enrichment task failed: {r}")
-                else:
-                    enriched_count += 1
-
-            progress_done = min(i + self._batch_size, total_functions)
-            logger.info(
-                "Enrichment progress: %d/%d functions done",
-                progress_done,
-                total_functions,
-            )
-            if progress_callback:
-                await progress_callback(f"Enriching functions: {progress_done}/{total_functions}")
 
-
-        # ─── Classes ─────────────────────────────────────────────
-        classes = await gm._run(
+                for cls in batch:
+                    cached = await self.get_cached_enrichment(gm, cls["content_hash"])
+                    if cached:
+                        await self._queue_write(gm, cls["qname"], "class", cached)
+                        stats["enriched"] += 1
+                        continue
+
+                    bundle = bundles.get(cls["qname"], {})
+
+                    # Build rich context for class
+                    entity = ClassView(
+                        source=cls["source"],
+                        qualified_name=cls["qname"],
+                        content_hash=cls["content_hash"],
+                        docstring=cls.get("docstring", ""),
+                        bases=bundle.get("bases", []),
+                        methods=[{"name": name} for name in bundle.get("methods", [])],
+                        class_attributes=bundle.get("class_attributes", []),
+                        decorators=[{"name": name} for name in bundle.get("decorators", [])],
+                    )
+
+                    await dispatch((entity, "class", {}))
+
+                progress_done += len(batch)
+                logger.info(
+                    "Enrichment progress: %d/%d classes queued",
+                    progress_done,
+                    total_classes,
+                )
+                if progress_callback:
+                    await progress_callback(f"Enriching classes: {progress_done}/{total_classes}")
+        finally:
+            next_page.cancel()
+
+    async def _fetch_class_page(self, gm, after: str) -> tuple[list[dict], dict[str, dict]]:
+        """Fetch the next keyset page of unenriched classes and their context bundles."""
+        batch = await gm._run(
             """
             MATCH (c:Class)
-            WHERE c.enrichment_hash IS NULL OR c.enrichment_hash <> c.content_hash
+            WHERE (c.enrichment_hash IS NULL OR c.enrichment_hash <> c.content_hash)
+              AND c.qualified_name > $after
             RETURN c.qualified_name AS qname, c.source AS source,
                    c.content_hash AS content_hash, c.docstring AS docstring
-            """
+            ORDER BY c.qualified_name
+            LIMIT $limit
+            """,
+            {"after": after, "limit": self._batch_size},
         )
-        total_classes = len(classes)
-        logger.info("Enrichment: %d classes to process", total_classes)
-        if progress_callback:
-            await progress_callback(f"Starting class enrichment: {total_classes} classes to process")
+        if not batch:
+            return [], {}
+        # Fetch bases, methods, attributes and decorators for the whole batch
+        bundles = await self._fetch_class_bundle(gm, [cls["qname"] for cls in batch])
+        return batch, bundles
+
+    async def _run_batch_job(
+        self, gm, items: list[tuple], stats: dict, progress_callback=None,
+    ) -> list[tuple]:
+        """
+        Enrich items through the OpenAI Batch API and store the results.
 
-        for i in range(0, total_classes, self._batch_size):
-            batch = classes[i : i + self._batch_size]
-            tasks = []
-
-            for cls in batch:
-                cached = await gm.get_cached_enrichment(cls["content_hash"])
-                if cached:
-                    await gm.set_enrichment(cls["qname"], cached, "class")
-                    await gm.create_semantic_edges(cls["qname"], cached)
-                    enriched_count += 1
-                    continue
-
-                # Build rich context for class
-                entity = {
-                    "source": cls["source"],
-                    "qualified_name": cls["qname"],
-                    "content_hash": cls["content_hash"],
-                    "docstring": cls.get("docstring", ""),
-                }
-
-                # Fetch bases
-                bases = await gm._run(
-                    "MATCH (c:Class {qualified_name: $qname})-[:INHERITS_FROM]->(b) RETURN b.name AS name",
-                    {"qname": cls["qname"]},
-                )
-                entity["bases"] = [b["name"] for b in bases]
+        Polls until the batch job reaches a terminal state.  Returns the
+        items that got no usable result so the caller can fall back to
+        the real-time path.
+        """
+        # The JSON schema is identical for every request of a type
+        response_formats = {
+            entity_type: {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": schema.__name__,
+                    "schema": schema.model_json_schema(),
+                },
+            }
+            for entity_type, schema in (
+                ("function", FunctionEnrichment), ("class", ClassEnrichment),
+            )
+        }
+        lines = []
+        for i, (entity, entity_type, context) in enumerate(items):
+            lines.append(orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self._model_name,
+                    "messages": [
+                        {"role": "system", "content": ENRICHMENT_SYSTEM_PROMPT},
+                        {"role": "user", "content": build_enrichment_prompt(entity, entity_type, context)},
+                    ],
+                    "response_format": response_formats[entity_type],
+                },
+            }))
+
+        try:
+            input_file = await self._openai_client.files.create(
+                file=("enrichment_batch.jsonl", b"\n".join(lines)),
+                purpose="batch",
+            )
+            batch = await self._openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            logger.info("Submitted enrichment batch %s with %d requests", batch.id, len(items))
 
-                # Fetch methods (names only for prompt context)
-                methods = await gm._run(
-                    "MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function) RETURN m.name AS name",
-                    {"qname": cls["qname"]},
+            while batch.status not in _BATCH_TERMINAL_STATUSES:
+                if progress_callback:
+                    counts = batch.request_counts
+                    done = counts.completed + counts.failed if counts else 0
+                    await progress_callback(f"Enrichment batch {batch.status}: {done}/{len(items)}")
+                await asyncio.sleep(self._batch_poll_interval)
+                batch = await self._openai_client.batches.retrieve(batch.id)
+
+            if batch.status != "completed" or not batch.output_file_id:
+                logger.warning(
+                    "Enrichment batch %s ended with status %s, falling back to real-time calls",
+                    batch.id, batch.status,
                 )
-                entity["methods"] = [{"name": m["name"]} for m in methods]
-
-                # Fetch class attributes
-                class_attrs = await gm._run(
-                    """
-                    MATCH (c:Class {qualified_name: $qname})-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
-                    RETURN a.name AS name, a.type_annotation AS type_annotation,
-                           a.default_value AS default_value
-                    """,
-                    {"qname": cls["qname"]},
+                return items
+
+            output = await self._openai_client.files.content(batch.output_file_id)
+        except Exception as e:
+            logger.error(f"Enrichment batch job failed, falling back to real-time calls: {e}")
+            return items
+
+        stored: set[int] = set()
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            i = int(record["custom_id"])
+            entity, entity_type, _ = items[i]
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            schema = FunctionEnrichment if entity_type == "function" else ClassEnrichment
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                enrichment = schema.model_validate_json(content).model_dump()
+                stored_count = await self._store_enrichment(gm, entity, entity_type, enrichment)
+            except Exception as e:
+                logger.warning(
+                    f"Unusable batch result for {entity.get('qualified_name', '?')}: {e}"
                 )
-                entity["class_attributes"] = class_attrs
+                continue
+            stats["enriched"] += stored_count
+            stored.add(i)
 
-                # Fetch decorators
-                decorators = await gm._run(
-                    "MATCH (c:Class {qualified_name: $qname})-[:DECORATED_BY]->(d) RETURN d.name AS name",
-                    {"qname": cls["qname"]},
-                )
-                entity["decorators"] = [{"name": d["name"]} for d in decorators]
-
-                tasks.append(self._enrich_and_store(gm, entity, "class", {}))
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for r in results:
-                if isinstance(r, Exception):
-                    logger.error(f"Enrichment task failed: {r}")
-                else:
-                    enriched_count += 1
-
-            progress_done = min(i + self._batch_size, total_classes)
-            logger.info(
-                "Enrichment progress: %d/%d classes done",
-                progress_done,
-                total_classes,
-            )
-            if progress_callback:
-                await progress_callback(f"Enriching classes: {progress_done}/{total_classes}")
+        logger.info("Enrichment batch %s stored %d/%d results", batch.id, len(stored), len(items))
+        return [item for i, item in enumerate(items) if i not in stored]
+
+    # ─── Local enrichment cache ──────────────────────────────
 
-        logger.info(
-            "Enrichment complete: %d total entities enriched", enriched_count
+    async def _load_known_hashes(self, gm) -> None:
+        """Preload the set of content hashes present in the Neo4j cache."""
+        rows = gm._stream("MATCH (c:EnrichmentCache) RETURN c.content_hash AS hash")
+        self._known_hashes = {_hash_key(row["hash"]) async for row in rows if row["hash"]}
+        logger.info("Enrichment cache holds %d known content hashes", len(self._known_hashes))
+
+    async def get_cached_enrichment(self, gm, content_hash: str) -> dict | None:
+        """
+        Look up a cached enrichment, consulting memory before Neo4j.
+
+        Hashes missing from the preloaded known-hash set are treated as
+        misses without a database round-trip.
+        """
+        if not content_hash:
+            return None
+        cached = self._local_cache.get(content_hash)
+        if cached is not None:
+            self._local_cache.move_to_end(content_hash)
+            return cached
+        if self._known_hashes is not None and _hash_key(content_hash) not in self._known_hashes:
+            return None
+
+        cached = await gm.get_cached_enrichment(content_hash)
+        if cached:
+            self.remember_enrichment(content_hash, cached)
+        return cached
+
+    def remember_enrichment(self, content_hash: str, enrichment: dict) -> None:
+        """Add an enrichment to the local cache, evicting the least recently used."""
+        self._local_cache[content_hash] = enrichment
+        self._local_cache.move_to_end(content_hash)
+        if len(self._local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+            self._local_cache.popitem(last=False)
+        if self._known_hashes is not None:
+            self._known_hashes.add(_hash_key(content_hash))
+
+    @staticmethod
+    async def _count_unenriched(gm, label: str) -> int:
+        """Count Function or Class nodes whose enrichment is missing or stale."""
+        row = await gm._run_single(
+            f"""
+            MATCH (n:{label})
+            WHERE n.enrichment_hash IS NULL OR n.enrichment_hash <> n.content_hash
+            RETURN count(n) AS total
+            """
         )
-        return enriched_count
+        return row["total"] if row else 0
 
-    async def _build_function_context(self, gm, func: dict) -> dict:
-        """Build context dict for a function from the graph."""
-        context: dict[str, Any] = {}
+    async def _fetch_function_bundle(
+        self, gm, qnames: list[str], include_parents: bool = False,
+    ) -> dict[str, dict]:
+        """
+        Fetch prompt context for a batch of functions in one query.
 
-        # Callers
-        callers = await gm._run(
-            "MATCH (c:Function)-[:CALLS]->(f:Function {qualified_name: $qname}) RETURN c.name AS name LIMIT 10",
-            {"qname": func["qname"]},
+        Returns a dict keyed by qualified name with decorators, parameters
+        (ordered by position), and up to 10 callers/callees.  The containing
+        class or function is normally already on the seed row; pass
+        ``include_parents`` to fetch it here as well.
+        """
+        if not qnames:
+            return {}
+
+        parent_columns = """,
+                   head([(c:Class)-[:CONTAINS]->(f) | c.qualified_name]) AS parent_class,
+                   head([(p:Function)-[:CONTAINS]->(f) | p.qualified_name]) AS parent_function
+            """ if include_parents else ""
+        rows = await gm._run(
+            """
+            UNWIND $qnames AS qn
+            MATCH (f:Function {qualified_name: qn})
+            RETURN qn AS qname,
+                   [(f)-[:DECORATED_BY]->(d) | d.name] AS decorators,
+                   [(f)-[:HAS_PARAMETER]->(p:Parameter) |
+                       p {.name, .type_annotation, .default_value, .kind, .position}
+                   ] AS parameters,
+                   [(c:Function)-[:CALLS]->(f) | c.name][..10] AS callers,
+                   [(f)-[:CALLS]->(c:Function) | c.name][..10] AS callees
+            """ + parent_columns,
+            {"qnames": qnames},
         )
-        if callers:
-            context["callers"] = [c["name"] for c in callers]
+        for row in rows:
+            # Pattern comprehensions don't preserve parameter order
+            row["parameters"].sort(key=lambda p: p.get("position") or 0)
+        return {row["qname"]: row for row in rows}
+
+    async def _fetch_class_bundle(self, gm, qnames: list[str]) -> dict[str, dict]:
+        """
+        Fetch prompt context for a batch of classes in one query.
 
-        # Callees
-        callees = await gm._run(
-            "MATCH (f:Function {qualified_name: $qname})-[:CALLS]->(c:Function) RETURN c.name AS name LIMIT 10",
-            {"qname": func["qname"]},
+        Returns a dict keyed by qualified name with base names, method names,
+        class attributes, and decorator names.
+        """
+        if not qnames:
+            return {}
+
+        rows = await gm._run(
+            """
+            UNWIND $qnames AS qn
+            MATCH (c:Class {qualified_name: qn})
+            RETURN qn AS qname,
+                   [(c)-[:INHERITS_FROM]->(b) | b.name] AS bases,
+                   [(c)-[:CONTAINS]->(m:Function) | m.name] AS methods,
+                   [(c)-[:HAS_ATTRIBUTE]->(a:ClassAttribute) |
+                       a {.name, .type_annotation, .default_value}
+                   ] AS class_attributes,
+                   [(c)-[:DECORATED_BY]->(d) | d.name] AS decorators
+            """,
+            {"qnames": qnames},
         )
-        if callees:
-            context["callees"] = [c["name"] for c in callees]
+        return {row["qname"]: row for row in rows}
+
+    @staticmethod
+    def _function_context_from_bundle(func: dict, bundle: dict) -> dict:
+        """
+        Build the prompt context dict for a function.
+
+        Callers/callees come from the fetched bundle; parent class/function
+        come from the seed row (``func``).
+        """
+        context: dict[str, Any] = {}
+
+        if bundle.get("callers"):
+            context["callers"] = bundle["callers"]
+        if bundle.get("callees"):
+            context["callees"] = bundle["callees"]
 
         # Parent class (for methods)
-        if func.get("is_method"):
-            parent = await gm._run_single(
-                "MATCH (c:Class)-[:CONTAINS]->(f:Function {qualified_name: $qname}) RETURN c.qualified_name AS qname, c.name AS name",
-                {"qname": func["qname"]},
-            )
-            if parent:
-                context["parent_class"] = parent["qname"]
+        if func.get("is_method") and func.get("parent_class"):
+            context["parent_class"] = func["parent_class"]
 
         # Parent function (for nested functions)
-        if func.get("is_nested"):
-            parent_fn = await gm._run_single(
-                "MATCH (p:Function)-[:CONTAINS]->(f:Function {qualified_name: $qname}) RETURN p.qualified_name AS qname",
-                {"qname": func["qname"]},
-            )
-            if parent_fn:
-                context["parent_function"] = parent_fn["qname"]
+        if func.get("is_nested") and func.get("parent_function"):
+            context["parent_function"] = func["parent_function"]
 
         return context
 
+    async def _build_function_context(self, gm, func: dict) -> dict:
+        """Build context dict for a single function from the graph."""
+        bundles = await self._fetch_function_bundle(gm, [func["qname"]], include_parents=True)
+        bundle = bundles.get(func["qname"], {})
+        return self._function_context_from_bundle({**bundle, **func}, bundle)
+
     async def _enrich_and_store(
         self, gm, entity: dict, entity_type: str, context: dict
-    ) -> None:
+    ) -> int:
         """Enrich an entity and store results in graph + cache."""
         enrichment = await self.enrich_entity(entity, entity_type, context)
-        qname = entity["qualified_name"]
-
-        # Delete old semantic edges before creating new ones
-        await gm.delete_semantic_edges(qname)
+        return await self._store_enrichment(gm, entity, entity_type, enrichment)
 
-        # Store enrichment on node (entity_type-aware)
-        await gm.set_enrichment(qname, enrichment, entity_type)
-
-        # Create semantic edges
-        await gm.create_semantic_edges(qname, enrichment)
+    async def _store_enrichment(
+        self, gm, entity: dict, entity_type: str, enrichment: dict
+    ) -> int:
+        """
+        Queue a fresh enrichment result for the graph and the enrichment cache.
 
-        # Cache for future use
+        The result is also applied to any same-hash duplicates that were held
+        back while it was in flight.  Returns the number of entities written.
+        """
         content_hash = entity.get("content_hash", "")
         if content_hash:
-            await gm.cache_enrichment(content_hash, enrichment)
+            self.remember_enrichment(content_hash, enrichment)
+        await self._queue_write(
+            gm, entity["qualified_name"], entity_type, enrichment, content_hash,
+        )
+        duplicates = self._inflight.pop(content_hash, []) if content_hash else []
+        for qname, duplicate_type in duplicates:
+            await self._queue_write(gm, qname, duplicate_type, enrichment)
+        return 1 + len(duplicates)
+
+    # ─── Buffered graph writes ───────────────────────────────
+
+    async def _queue_write(
+        self,
+        gm,
+        qname: str,
+        entity_type: str,
+        enrichment: dict,
+        content_hash: str = "",
+    ) -> None:
+        """
+        Buffer an enrichment write, flushing once ``batch_size`` are pending.
+
+        ``content_hash`` is empty for cache hits, which need no cache write.
+        """
+        self._pending_writes.append((qname, entity_type, enrichment, content_hash))
+        if len(self._pending_writes) >= self._batch_size:
+            await self._flush_writes(gm)
+
+    async def _flush_writes(self, gm) -> None:
+        """Write all buffered enrichments with one bulk node/edge write and one cache write."""
+        async with self._write_lock:
+            pending, self._pending_writes = self._pending_writes, []
+            if not pending:
+                return
+            # The node/edge write and the cache write touch disjoint nodes,
+            # so they run concurrently on separate pooled connections
+            results = await asyncio.gather(
+                gm.set_enrichments_bulk([
+                    {"qname": qname, "entity_type": entity_type, "enrichment": enrichment}
+                    for qname, entity_type, enrichment, _ in pending
+                ]),
+                gm.cache_enrichments_bulk([
+                    {"content_hash": content_hash, "enrichment": enrichment}
+                    for _, _, enrichment, content_hash in pending
+                    if content_hash
+                ]),
+                return_exceptions=True,
+            )
+            node_result, cache_result = results
+            if isinstance(node_result, Exception):
+                self._failed_writes += len(pending)
+                logger.error(f"Failed to write {len(pending)} enrichments: {node_result}")
+            if isinstance(cache_result, Exception):
+                # Nodes are stored; only cache reuse for these hashes is lost
+                logger.error(f"Failed to cache {len(pending)} enrichments: {cache_result}")
 
     async def _call_structured(
         self, prompt: str, entity_type: str,
     ) -> FunctionEnrichment | ClassEnrichment:
         """Invoke the LLM with structured output bound to a Pydantic schema."""
-        messages = [
-            SystemMessage(content=ENRICHMENT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = [_SYSTEM_MSG, HumanMessage(content=prompt)]
         chain = self._function_chain if entity_type == "function" else self._class_chain
-        return await chain.ainvoke(messages)
+        estimated_tokens = _SYSTEM_PROMPT_TOKENS + len(prompt) // 4
+        await self._tpm_sem.acquire(estimated_tokens)
+        async with self._llm_semaphore:
+            return await self._rpm_sem.transact(chain.ainvoke(messages), credits=1)
 
     async def close(self) -> None:
         """No-op kept for interface compatibility."""
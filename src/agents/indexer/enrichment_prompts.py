@@ -4,6 +4,33 @@ Enrichment Prompts
 System prompt and prompt builder for LLM-based code entity enrichment.
 """
 
+import ast
+import textwrap
+from collections import OrderedDict, defaultdict
+
+# Upper bound on memoized prompts held by build_enrichment_prompt
+PROMPT_CACHE_MAX_ENTRIES = 4096
+
+# Sources longer than this are cut to a head + tail window in the prompt
+MAX_SOURCE_CHARS = 6000
+SOURCE_HEAD_CHARS = 4000
+SOURCE_TAIL_CHARS = 2000
+SOURCE_ELISION = "\n\n# ... [truncated] ...\n\n"
+
+# Enrichment prompt layout; optional sections are filled by
+# _render_enrichment_prompt and default to ""
+PROMPT_TEMPLATE = (
+    "Analyze this Python {entity_type}:\n\n"
+    "```python\n{source}\n```\n"
+    "{async_line}{docstring_line}{decorator_line}{param_line}{bases_line}"
+    "{attrs_line}{methods_line}{nested_line}{parent_class_line}"
+    "{parent_function_line}{calls_line}{callers_line}"
+)
+_ASYNC_LINE = "\nThis is an async function.\n"
+
+# prompt cache key -> prompt, most recently used last
+_prompt_cache: OrderedDict[tuple, str] = OrderedDict()
+
 ENRICHMENT_SYSTEM_PROMPT = """\
 You are a code analysis expert. Given a Python code entity (function or class) \
 with its context, produce a structured analysis.
@@ -24,99 +51,195 @@ or transforms a request object that flows downstream.
 """
 
 
+def _prompt_cache_key(entity: dict, entity_type: str, context: dict) -> tuple | None:
+    """
+    Key a prompt by everything it is built from.
+
+    Everything taken from the entity itself (source, docstring, decorators,
+    parameters, bases, methods, calls) is determined by its source, so the
+    content hash stands in for it; the graph context is keyed separately.
+    Entities without a content hash are not cached.
+    """
+    content_hash = entity.get("content_hash")
+    if not content_hash:
+        return None
+    return (
+        entity_type,
+        content_hash,
+        context.get("parent_class"),
+        context.get("parent_function"),
+        tuple(context.get("callers", ())),
+        tuple(context.get("callees", ())),
+    )
+
+
 def build_enrichment_prompt(entity: dict, entity_type: str, context: dict) -> str:
     """
     Build the prompt for enriching a single entity.
 
     Includes all available structural context so the LLM can make
-    informed semantic judgments.
+    informed semantic judgments.  Prompts are memoized by content hash
+    and context, so retries and repeated entities skip the rebuild.
+    """
+    key = _prompt_cache_key(entity, entity_type, context)
+    if key is not None:
+        prompt = _prompt_cache.get(key)
+        if prompt is not None:
+            _prompt_cache.move_to_end(key)
+            return prompt
+
+    prompt = _render_enrichment_prompt(entity, entity_type, context)
+
+    if key is not None:
+        _prompt_cache[key] = prompt
+        if len(_prompt_cache) > PROMPT_CACHE_MAX_ENTRIES:
+            _prompt_cache.popitem(last=False)
+    return prompt
+
+
+def _fit_source(source: str, entity_type: str) -> str:
     """
-    parts = [f"Analyze this Python {entity_type}:\n"]
+    Bound the source embedded in the prompt to ~MAX_SOURCE_CHARS.
 
-    # Source code (always present — includes decorators since parser fix)
-    parts.append(f"```python\n{entity.get('source', '')}\n```\n")
+    Oversized classes first have their method bodies collapsed to
+    signatures (the methods are enriched on their own); anything still
+    too long keeps its head and tail around an elision marker.
+    """
+    if len(source) <= MAX_SOURCE_CHARS:
+        return source
+    if entity_type == "class":
+        source = _strip_method_bodies(source)
+        if len(source) <= MAX_SOURCE_CHARS:
+            return source
+    return source[:SOURCE_HEAD_CHARS] + SOURCE_ELISION + source[-SOURCE_TAIL_CHARS:]
+
+
+def _strip_method_bodies(source: str) -> str:
+    """Replace each method body in a class source with ``...``, keeping docstrings."""
+    try:
+        tree = ast.parse(textwrap.dedent(source))
+    except SyntaxError:
+        return source
+    if not tree.body or not isinstance(tree.body[0], ast.ClassDef):
+        return source
+
+    lines = source.splitlines()
+    for node in reversed(tree.body[0].body):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        first = node.body[0]
+        if first.lineno == node.lineno:
+            continue  # one-line def
+        start = first.lineno - 1
+        if ast.get_docstring(node) is not None:
+            if len(node.body) == 1:
+                continue
+            start = first.end_lineno
+        first_line = lines[first.lineno - 1]
+        indent = first_line[: len(first_line) - len(first_line.lstrip())]
+        lines[start:node.end_lineno] = [f"{indent}..."]
+    return "\n".join(lines)
+
+
+def _fmt_decorator(d: dict) -> str:
+    args = d.get("arguments")
+    return f"{d['name']}({args})" if args else d["name"]
+
+
+def _fmt_annotated(item: dict) -> str:
+    """Format ``name: type = default`` for a parameter or class attribute."""
+    s = item["name"]
+    if item.get("type_annotation"):
+        s = f"{s}: {item['type_annotation']}"
+    if item.get("default_value"):
+        s = f"{s} = {item['default_value']}"
+    return s
+
+
+def _fmt_param(p: dict) -> str:
+    kind = p.get("kind", "")
+    if kind and kind != "positional_or_keyword":
+        return f"{_fmt_annotated(p)}  [{kind}]"
+    return _fmt_annotated(p)
+
+
+def _fmt_call(c) -> str:
+    # calls may be list of strings or list of dicts
+    if isinstance(c, dict):
+        return c.get("callee", c.get("name", ""))
+    return str(c)
+
+
+def _render_enrichment_prompt(entity: dict, entity_type: str, context: dict) -> str:
+    """Render the enrichment prompt from entity fields and graph context."""
+    # Absent sections format as "" via the defaultdict; each present one
+    # carries its own leading blank line
+    fields = defaultdict(
+        str,
+        entity_type=entity_type,
+        # Source code (always present — includes decorators since parser fix)
+        source=_fit_source(entity.get("source", ""), entity_type),
+    )
 
-    # Async flag
     if entity.get("is_async"):
-        parts.append("This is an async function.\n")
+        fields["async_line"] = _ASYNC_LINE
 
     # Docstring (may already be in source, but highlight it)
-    if entity.get("docstring"):
-        parts.append(f"Docstring: {entity['docstring']}\n")
-
-    # Decorators
-    if entity.get("decorators"):
-        dec_strs = []
-        for d in entity["decorators"]:
-            s = d["name"]
-            if d.get("arguments"):
-                s += f"({d['arguments']})"
-            dec_strs.append(s)
-        parts.append(f"Decorators: {', '.join(dec_strs)}\n")
+    docstring = entity.get("docstring")
+    if docstring:
+        fields["docstring_line"] = f"\nDocstring: {docstring}\n"
+
+    decorators = entity.get("decorators")
+    if decorators:
+        fields["decorator_line"] = f"\nDecorators: {', '.join(map(_fmt_decorator, decorators))}\n"
 
     # Parameters with types (for functions)
-    if entity.get("parameters"):
-        param_strs = []
-        for p in entity["parameters"]:
-            s = p["name"]
-            if p.get("type_annotation"):
-                s += f": {p['type_annotation']}"
-            if p.get("default_value"):
-                s += f" = {p['default_value']}"
-            kind = p.get("kind", "")
-            if kind and kind not in ("positional_or_keyword",):
-                s += f"  [{kind}]"
-            param_strs.append(s)
-        parts.append(f"Parameters: {', '.join(param_strs)}\n")
+    parameters = entity.get("parameters")
+    if parameters:
+        fields["param_line"] = f"\nParameters: {', '.join(map(_fmt_param, parameters))}\n"
 
     # Base classes (for classes)
-    if entity.get("bases"):
-        parts.append(f"Inherits from: {', '.join(entity['bases'])}\n")
-
-    # Class attributes (for classes)
-    if entity.get("class_attributes"):
-        attr_strs = []
-        for attr in entity["class_attributes"][:20]:  # cap at 20 for prompt size
-            s = attr["name"]
-            if attr.get("type_annotation"):
-                s += f": {attr['type_annotation']}"
-            if attr.get("default_value"):
-                s += f" = {attr['default_value']}"
-            attr_strs.append(s)
-        parts.append(f"Class attributes: {', '.join(attr_strs)}\n")
+    bases = entity.get("bases")
+    if bases:
+        fields["bases_line"] = f"\nInherits from: {', '.join(bases)}\n"
+
+    # Class attributes (for classes), capped at 20 for prompt size
+    class_attributes = entity.get("class_attributes")
+    if class_attributes:
+        fields["attrs_line"] = (
+            f"\nClass attributes: {', '.join(map(_fmt_annotated, class_attributes[:20]))}\n"
+        )
 
     # Methods list (for classes — names only, source is too large)
-    if entity.get("methods"):
-        method_names = [m["name"] for m in entity["methods"]]
-        parts.append(f"Methods ({len(method_names)}): {', '.join(method_names)}\n")
+    methods = entity.get("methods")
+    if methods:
+        fields["methods_line"] = (
+            f"\nMethods ({len(methods)}): {', '.join(m['name'] for m in methods)}\n"
+        )
 
     # Nested functions (names only)
-    if entity.get("nested_functions"):
-        nested_names = [n["name"] for n in entity["nested_functions"]]
-        parts.append(f"Nested functions: {', '.join(nested_names)}\n")
+    nested = entity.get("nested_functions")
+    if nested:
+        fields["nested_line"] = f"\nNested functions: {', '.join(n['name'] for n in nested)}\n"
 
     # Context: parent class (for methods)
     if context.get("parent_class"):
-        parts.append(f"This is a method of class: {context['parent_class']}\n")
+        fields["parent_class_line"] = f"\nThis is a method of class: {context['parent_class']}\n"
 
     # Context: parent function (for nested functions)
     if context.get("parent_function"):
-        parts.append(f"This is a nested function inside: {context['parent_function']}\n")
+        fields["parent_function_line"] = (
+            f"\nThis is a nested function inside: {context['parent_function']}\n"
+        )
 
     # Calls made by this entity
     calls = entity.get("calls") or context.get("callees", [])
     if calls:
-        # calls may be list of strings or list of dicts
-        call_names = []
-        for c in calls[:15]:
-            if isinstance(c, dict):
-                call_names.append(c.get("callee", c.get("name", "")))
-            else:
-                call_names.append(str(c))
-        parts.append(f"Calls: {', '.join(call_names)}\n")
+        fields["calls_line"] = f"\nCalls: {', '.join(map(_fmt_call, calls[:15]))}\n"
 
     # Context: callers (who calls this entity)
-    if context.get("callers"):
-        parts.append(f"Called by: {', '.join(context['callers'][:10])}\n")
+    callers = context.get("callers")
+    if callers:
+        fields["callers_line"] = f"\nCalled by: {', '.join(callers[:10])}\n"
 
-    return "\n".join(parts)
+    return PROMPT_TEMPLATE.format_map(fields)
@@ -5,12 +5,31 @@ Core Neo4j connection management, query execution helpers,
 schema creation, and graph clearing.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator
 
 from src.shared.database import Neo4jHandler
 
 logger = logging.getLogger("indexer-agent.graph_manager")
 
+# Nodes deleted per transaction by clear_all
+CLEAR_BATCH_ROWS = 10_000
+
+_VECTOR_INDEX = """CREATE VECTOR INDEX {name} IF NOT EXISTS
+   FOR (n:{label}) ON (n.embedding)
+   OPTIONS {{indexConfig: {{
+     `vector.dimensions`: 3072,
+     `vector.similarity_function`: 'cosine'{extra}
+   }}}}"""
+_VECTOR_QUANTIZATION = """,
+     `vector.quantization.enabled`: true"""
+
+# Transaction opened by GraphManagerBase.transaction() for the current task
+_current_tx: ContextVar = ContextVar("graph_manager_tx", default=None)
+
 
 class GraphManagerBase:
     """
@@ -20,8 +39,18 @@ class GraphManagerBase:
     schema bootstrapping, and full graph clearing.
     """
 
-    def __init__(self, handler: Neo4jHandler):
+    def __init__(self, handler: Neo4jHandler, write_concurrency: int = 16):
         self._handler = handler
+        # Bounds _write_many so independent writes share the driver's
+        # connection pool without exhausting it
+        pool_size = getattr(handler, "max_connection_pool_size", write_concurrency)
+        self._write_sem = asyncio.Semaphore(min(write_concurrency, pool_size))
+        # Last written (content_hash, lineno_start, lineno_end) per File path
+        # or entity qualified_name; create_* writes are skipped on a match
+        self._hash_cache: dict[str, tuple] = {}
+        # Stats name -> (expires_at, value); see StatsOperationsMixin._cached_stat
+        self._stats_cache: dict[str, tuple[float, Any]] = {}
+        self._stats_locks: dict[str, asyncio.Lock] = {}
 
     async def connect(self) -> None:
         """Ensure the underlying handler is connected."""
@@ -32,18 +61,167 @@ class GraphManagerBase:
         """Close the underlying handler connection."""
         await self._handler.close()
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        Group the graph operations in this block into one transaction.
+
+        Every ``_run`` / ``_write`` issued by the current task inside the
+        block goes through a single session and commits once on exit (or
+        rolls back on error).  Nested blocks join the outer transaction.
+        Keep LLM calls and other slow work outside the block.
+        """
+        if _current_tx.get() is not None:
+            yield
+            return
+        async with self._handler.transaction() as tx:
+            token = _current_tx.set(tx)
+            try:
+                yield
+            finally:
+                _current_tx.reset(token)
+
     async def _run(self, query: str, params: dict | None = None) -> list[dict]:
         """Execute a Cypher query and return results."""
+        tx = _current_tx.get()
+        if tx is not None:
+            result = await tx.run(query, params or {})
+            return [record.data() async for record in result]
         return await self._handler.run(query, params)
 
+    async def _stream(self, query: str, params: dict | None = None) -> AsyncIterator[dict]:
+        """Execute a Cypher query and yield results without building a list."""
+        tx = _current_tx.get()
+        if tx is not None:
+            result = await tx.run(query, params or {})
+            async for record in result:
+                yield record.data()
+            return
+        async for row in self._handler.stream(query, params):
+            yield row
+
     async def _run_single(self, query: str, params: dict | None = None) -> dict | None:
         """Execute a Cypher query and return first result or None."""
+        if _current_tx.get() is not None:
+            results = await self._run(query, params)
+            return results[0] if results else None
         return await self._handler.run_single(query, params)
 
+    async def _run_read(self, query: str, params: dict | None = None) -> list[dict]:
+        """Execute a read-only query, routed to a reader when clustered."""
+        if _current_tx.get() is not None:
+            # Inside a transaction, read its own uncommitted writes
+            return await self._run(query, params)
+        return await self._handler.run_read(query, params)
+
+    async def _run_read_single(self, query: str, params: dict | None = None) -> dict | None:
+        """Execute a read-only query and return first result or None."""
+        results = await self._run_read(query, params)
+        return results[0] if results else None
+
     async def _write(self, query: str, params: dict | None = None) -> None:
         """Execute a write transaction."""
+        tx = _current_tx.get()
+        if tx is not None:
+            result = await tx.run(query, params or {})
+            await result.consume()
+            return
         await self._handler.write(query, params)
 
+    async def _run_autocommit(self, query: str, params: dict | None = None) -> list[dict]:
+        """Execute a ``CALL { } IN TRANSACTIONS`` query in an auto-commit transaction."""
+        return await self._handler.run_autocommit(query, params)
+
+    async def _write_many(self, statements: list[tuple[str, dict | None]]) -> None:
+        """Execute independent ``(query, params)`` writes concurrently."""
+        if _current_tx.get() is not None:
+            # A transaction runs one query at a time
+            for query, params in statements:
+                await self._write(query, params)
+            return
+
+        async def _bounded(query: str, params: dict | None) -> None:
+            async with self._write_sem:
+                await self._write(query, params)
+
+        await asyncio.gather(*(_bounded(query, params) for query, params in statements))
+
+    async def _write_tx(self, statements: list[tuple[str, dict | None]]) -> None:
+        """Execute several ``(query, params)`` writes in a single transaction."""
+        await self._handler.write_in_transaction(statements)
+
+    # ─── Hash Cache ────────────────────────────────────────
+
+    async def prime_hash_cache(self) -> int:
+        """
+        Load the stored fingerprint of every File, Class and Function node.
+
+        Call before re-indexing into an existing graph so unchanged nodes
+        are not rewritten.  Returns the number of cached entries.
+        """
+        rows = self._stream(
+            """
+            MATCH (f:File)
+            WHERE f.content_hash IS NOT NULL
+            RETURN f.path AS key, f.content_hash AS hash, null AS start, null AS end
+            UNION ALL
+            MATCH (c:Class)
+            WHERE c.content_hash IS NOT NULL
+            RETURN c.qualified_name AS key, c.content_hash AS hash,
+                   c.lineno_start AS start, c.lineno_end AS end
+            UNION ALL
+            MATCH (fn:Function)
+            WHERE fn.content_hash IS NOT NULL
+            RETURN fn.qualified_name AS key, fn.content_hash AS hash,
+                   fn.lineno_start AS start, fn.lineno_end AS end
+            """
+        )
+        self._hash_cache = {
+            row["key"]: (row["hash"], row["start"], row["end"]) async for row in rows
+        }
+        logger.info("Primed hash cache with %d entries", len(self._hash_cache))
+        return len(self._hash_cache)
+
+    def _hash_unchanged(self, key: str, fingerprint: tuple) -> bool:
+        """Return True if ``key`` was last written with ``fingerprint``."""
+        return self._hash_cache.get(key) == fingerprint
+
+    def _forget_hashes(self, qname_prefix: str) -> None:
+        """Drop cached fingerprints for ``qname_prefix`` and everything under it."""
+        nested = qname_prefix + "."
+        for key in [k for k in self._hash_cache if k == qname_prefix or k.startswith(nested)]:
+            del self._hash_cache[key]
+
+    # ─── Plan Warm-up ──────────────────────────────────────
+
+    async def warm_query_plans(self) -> int:
+        """
+        EXPLAIN every hot query so the server has planned it before first use.
+
+        Mixins list their queries in a ``_warmup_queries`` class attribute.
+        EXPLAIN plans without executing; failures are logged and skipped.
+        Call after ensure_schema so plans see the indexes.  Returns the
+        number of queries planned.
+        """
+        queries = list(dict.fromkeys(
+            query
+            for cls in type(self).__mro__
+            for query in vars(cls).get("_warmup_queries", ())
+        ))
+
+        async def _explain(query: str) -> bool:
+            async with self._write_sem:
+                try:
+                    await self._run("EXPLAIN " + query)
+                    return True
+                except Exception as e:
+                    logger.debug("Plan warm-up skipped a query: %s", e)
+                    return False
+
+        planned = sum(await asyncio.gather(*(_explain(q) for q in queries)))
+        logger.info("Warmed %d/%d query plans", planned, len(queries))
+        return planned
+
     # ─── Schema ────────────────────────────────────────────
 
     async def ensure_schema(self) -> None:
@@ -61,42 +239,71 @@ class GraphManagerBase:
 
         indexes = [
             "CREATE INDEX func_name IF NOT EXISTS FOR (f:Function) ON (f.name)",
+            # Call resolution seeks callees by name, then narrows by qualified_name
+            "CREATE RANGE INDEX func_name_qname IF NOT EXISTS FOR (f:Function) ON (f.name, f.qualified_name)",
             "CREATE INDEX class_name IF NOT EXISTS FOR (c:Class) ON (c.name)",
+            # Placeholder bases created for not-yet-indexed parents
+            "CREATE INDEX class_unresolved IF NOT EXISTS FOR (c:Class) ON (c._unresolved)",
             "CREATE INDEX decorator_name IF NOT EXISTS FOR (d:Decorator) ON (d.name)",
             "CREATE INDEX class_attr_name IF NOT EXISTS FOR (a:ClassAttribute) ON (a.name)",
+            # Enrichment seed queries filter on enrichment_hash vs content_hash
+            "CREATE INDEX func_enrichment IF NOT EXISTS FOR (f:Function) ON (f.enrichment_hash, f.content_hash)",
+            "CREATE INDEX class_enrichment IF NOT EXISTS FOR (c:Class) ON (c.enrichment_hash, c.content_hash)",
         ]
 
-        # Vector indexes for hybrid search (requires Neo4j 5.11+)
+        # Vector indexes for hybrid search (requires Neo4j 5.11+).  The index
+        # keeps an int8-quantized copy of each vector (Neo4j 5.23+), cutting
+        # its memory footprint about 4x; older servers get a plain index.
         vector_indexes = [
-            """CREATE VECTOR INDEX func_embedding IF NOT EXISTS
-               FOR (n:Function) ON (n.embedding)
-               OPTIONS {indexConfig: {
-                 `vector.dimensions`: 3072,
-                 `vector.similarity_function`: 'cosine'
-               }}""",
-            """CREATE VECTOR INDEX class_embedding IF NOT EXISTS
-               FOR (n:Class) ON (n.embedding)
-               OPTIONS {indexConfig: {
-                 `vector.dimensions`: 3072,
-                 `vector.similarity_function`: 'cosine'
-               }}""",
+            (
+                _VECTOR_INDEX.format(name=name, label=label, extra=_VECTOR_QUANTIZATION),
+                _VECTOR_INDEX.format(name=name, label=label, extra=""),
+            )
+            for name, label in (("func_embedding", "Function"), ("class_embedding", "Class"))
         ]
 
-        for stmt in constraints + indexes:
-            try:
-                await self._write(stmt)
-            except Exception as e:
-                logger.debug(f"Schema statement skipped: {e}")
+        # One transaction per group; if the group fails (e.g. an equivalent
+        # index already exists under another name) fall back to running each
+        # statement on its own so the rest still get created.
+        try:
+            await self._write_tx([(stmt, None) for stmt in constraints + indexes])
+        except Exception as e:
+            logger.debug(f"Batched schema creation failed, retrying per statement: {e}")
+            for stmt in constraints + indexes:
+                try:
+                    await self._write(stmt)
+                except Exception as e:
+                    logger.debug(f"Schema statement skipped: {e}")
 
-        for stmt in vector_indexes:
-            try:
-                await self._write(stmt)
-            except Exception as e:
-                logger.warning(f"Vector index creation skipped (may need Neo4j 5.11+): {e}")
+        try:
+            await self._write_tx([(quantized, None) for quantized, _ in vector_indexes])
+        except Exception:
+            for quantized, plain in vector_indexes:
+                try:
+                    await self._write(quantized)
+                    continue
+                except Exception as e:
+                    logger.debug(f"Quantized vector index unavailable, using plain index: {e}")
+                try:
+                    await self._write(plain)
+                except Exception as e:
+                    logger.warning(f"Vector index creation skipped (may need Neo4j 5.11+): {e}")
 
         logger.info("Neo4j schema ensured")
 
     async def clear_all(self) -> None:
         """Delete all nodes and relationships. Used for full re-index."""
-        await self._write("MATCH (n) DETACH DELETE n")
+        # Batched so the server never holds the whole graph in one transaction
+        await self._run_autocommit(
+            """
+            MATCH (n)
+            CALL {
+                WITH n
+                DETACH DELETE n
+            } IN TRANSACTIONS OF $batch ROWS
+            """,
+            {"batch": CLEAR_BATCH_ROWS},
+        )
+        self._hash_cache.clear()
+        self._stats_cache.clear()
         logger.warning("Cleared entire graph")
@@ -7,14 +7,61 @@ Decorator edges, Import edges, and cross-file relationship resolution.
 
 import logging
 
+import orjson
+
 from src.agents.indexer.models import path_to_module
 
 logger = logging.getLogger("indexer-agent.graph_manager")
 
+_IMPORT_EDGE_QUERY = """
+MERGE (src:Module {qualified_name: $src_mod})
+MERGE (tgt:Module {qualified_name: $tgt_mod})
+MERGE (src)-[r:IMPORTS]->(tgt)
+SET r.names = $names,
+    r.aliases = $aliases,
+    r.is_relative = $is_relative,
+    r.is_type_checking = $is_type_checking,
+    r.is_conditional = $is_conditional,
+    r.condition = $condition,
+    r.is_try_except = $is_try_except,
+    r.is_fallback = $is_fallback
+"""
+
+# Callers per transaction when resolving CALLS edges across the whole graph
+RESOLVE_BATCH_ROWS = 1000
+
+# One fixed query string per decorated label: the label stays in the MATCH
+# (unique-constraint index seek) and the server caches one plan per label
+_DECORATOR_EDGES_QUERIES = {
+    label: f"""
+    MATCH (e:{label} {{qualified_name: $qname}})
+    UNWIND $decorators AS dec
+    MERGE (d:Decorator {{name: dec.name}})
+    ON CREATE SET d.arguments = dec.arguments
+    MERGE (e)-[:DECORATED_BY]->(d)
+    """
+    for label in ("Function", "Class")
+}
+
+_DELETE_DECORATOR_EDGES_QUERIES = {
+    label: f"""
+    MATCH (e:{label} {{qualified_name: $qname}})-[r:DECORATED_BY]->()
+    DELETE r
+    """
+    for label in _DECORATOR_EDGES_QUERIES
+}
+
 
 class EdgeOperationsMixin:
     """Mixin providing edge CRUD and relationship resolution for the graph manager."""
 
+    # Planned at startup by GraphManagerBase.warm_query_plans
+    _warmup_queries = (
+        _IMPORT_EDGE_QUERY,
+        *_DECORATOR_EDGES_QUERIES.values(),
+        *_DELETE_DECORATOR_EDGES_QUERIES.values(),
+    )
+
     # ─── Decorator Edges ───────────────────────────────────
 
     async def create_decorator_edge(
@@ -24,29 +71,41 @@ class EdgeOperationsMixin:
         entity_label: str = "Function",
     ) -> None:
         """Create a Decorator node and DECORATED_BY edge."""
+        await self.create_decorator_edges_bulk(entity_qname, [decorator], entity_label)
+
+    async def create_decorator_edges_bulk(
+        self,
+        entity_qname: str,
+        decorators: list[dict],
+        entity_label: str = "Function",
+    ) -> None:
+        """Create Decorator nodes and DECORATED_BY edges for all decorators in one write."""
+        if not decorators:
+            return
+        query = _DECORATOR_EDGES_QUERIES.get(entity_label)
+        if query is None:
+            raise ValueError(f"Unsupported decorated entity label: {entity_label}")
         await self._write(
-            f"""
-            MATCH (e:{entity_label} {{qualified_name: $qname}})
-            MERGE (d:Decorator {{name: $dec_name}})
-            ON CREATE SET d.arguments = $dec_args
-            MERGE (e)-[:DECORATED_BY]->(d)
-            """,
+            query,
             {
                 "qname": entity_qname,
-                "dec_name": decorator["name"],
-                "dec_args": decorator.get("arguments"),
+                "decorators": [
+                    {"name": dec["name"], "arguments": dec.get("arguments")}
+                    for dec in decorators
+                ],
             },
         )
 
-    async def delete_decorator_edges(self, entity_qname: str) -> None:
+    async def delete_decorator_edges(
+        self,
+        entity_qname: str,
+        entity_label: str = "Function",
+    ) -> None:
         """Delete all DECORATED_BY edges from an entity."""
-        await self._write(
-            """
-            MATCH (e {qualified_name: $qname})-[r:DECORATED_BY]->()
-            DELETE r
-            """,
-            {"qname": entity_qname},
-        )
+        query = _DELETE_DECORATOR_EDGES_QUERIES.get(entity_label)
+        if query is None:
+            raise ValueError(f"Unsupported decorated entity label: {entity_label}")
+        await self._write(query, {"qname": entity_qname})
 
     # ─── Import Edges ──────────────────────────────────────
 
@@ -59,45 +118,17 @@ class EdgeOperationsMixin:
         - is_conditional: stores condition expression
         - is_try_except / is_fallback: marks optional dependencies
         """
-        source_module = imp.get("source_module", "")
-        target_module = imp["module"]
+        params = _import_edge_params(imp)
+        if params is not None:
+            await self._write(_IMPORT_EDGE_QUERY, params)
 
-        if not target_module:
-            return
-
-        # Store all import flags on the edge
-        is_type_checking = imp.get("is_type_checking", False)
-        is_conditional = imp.get("is_conditional", False)
-        is_try_except = imp.get("is_try_except", False)
-        is_fallback = imp.get("is_fallback", False)
-
-        await self._write(
-            """
-            MERGE (src:Module {qualified_name: $src_mod})
-            MERGE (tgt:Module {qualified_name: $tgt_mod})
-            MERGE (src)-[r:IMPORTS]->(tgt)
-            SET r.names = $names,
-                r.aliases = $aliases,
-                r.is_relative = $is_relative,
-                r.is_type_checking = $is_type_checking,
-                r.is_conditional = $is_conditional,
-                r.condition = $condition,
-                r.is_try_except = $is_try_except,
-                r.is_fallback = $is_fallback
-            """,
-            {
-                "src_mod": source_module,
-                "tgt_mod": target_module,
-                "names": imp.get("names", []),
-                "aliases": str(imp.get("aliases", {})),
-                "is_relative": imp.get("is_relative", False),
-                "is_type_checking": is_type_checking,
-                "is_conditional": is_conditional,
-                "condition": imp.get("condition"),
-                "is_try_except": is_try_except,
-                "is_fallback": is_fallback,
-            },
-        )
+    async def create_import_edges(self, file_path: str, imports: list[dict]) -> None:
+        """Create all import edges of a file as concurrent writes."""
+        await self._write_many([
+            (_IMPORT_EDGE_QUERY, params)
+            for params in map(_import_edge_params, imports)
+            if params is not None
+        ])
 
     async def delete_imports_for_file(self, file_path: str) -> None:
         """Delete all import edges originating from a file's module."""
@@ -125,65 +156,95 @@ class EdgeOperationsMixin:
         """
         edge_count = 0
 
+        # Each pass runs per caller inside CALL { } IN TRANSACTIONS, so large
+        # graphs commit in chunks instead of one huge transaction.  Callees
+        # are looked up by name first (func_name index seek) and then
+        # filtered by file/import scope.  `_calls` is left as the parser
+        # wrote it; names the caller already has a CALLS edge for are
+        # skipped, so later passes and re-runs only fan out over unresolved
+        # names while edges lost to a deleted callee are re-derived.
+
         # Pass 1: Same-file call resolution (strongest signal)
-        result = await self._run(
+        result = await self._run_autocommit(
             """
             MATCH (caller:Function)
             WHERE caller._calls IS NOT NULL AND size(caller._calls) > 0
-            MATCH (f:File)-[:CONTAINS*1..3]->(caller)
-            WITH caller, f
-            UNWIND caller._calls AS callee_name
-            MATCH (f)-[:CONTAINS*1..3]->(callee:Function {name: callee_name})
-            WHERE caller <> callee
-            MERGE (caller)-[:CALLS]->(callee)
-            RETURN count(*) as created
-            """
+            CALL {
+                WITH caller
+                MATCH (f:File)-[:CONTAINS*1..3]->(caller)
+                UNWIND caller._calls AS callee_name
+                WITH DISTINCT caller, f, callee_name
+                WHERE NOT (caller)-[:CALLS]->(:Function {name: callee_name})
+                MATCH (callee:Function {name: callee_name})
+                USING INDEX callee:Function(name)
+                WHERE caller <> callee AND (f)-[:CONTAINS*1..3]->(callee)
+                MERGE (caller)-[:CALLS]->(callee)
+                RETURN count(*) AS created
+            } IN TRANSACTIONS OF $batch ROWS
+            RETURN sum(created) AS created
+            """,
+            {"batch": RESOLVE_BATCH_ROWS},
         )
         if result:
-            edge_count += result[0].get("created", 0)
+            edge_count += result[0].get("created") or 0
 
         # Pass 2: Cross-file via import relationships
-        result = await self._run(
+        result = await self._run_autocommit(
             """
             MATCH (caller:Function)
             WHERE caller._calls IS NOT NULL AND size(caller._calls) > 0
-            MATCH (f1:File)-[:CONTAINS*1..3]->(caller)
-            MATCH (f1)-[:DEFINES_MODULE]->(src:Module)-[:IMPORTS]->(tgt:Module)<-[:DEFINES_MODULE]-(f2:File)
-            WITH caller, f2
-            UNWIND caller._calls AS callee_name
-            MATCH (f2)-[:CONTAINS*1..3]->(callee:Function {name: callee_name})
-            WHERE caller <> callee AND NOT (caller)-[:CALLS]->(callee)
-            MERGE (caller)-[:CALLS]->(callee)
-            RETURN count(*) as created
-            """
+            CALL {
+                WITH caller
+                MATCH (f1:File)-[:CONTAINS*1..3]->(caller)
+                MATCH (f1)-[:DEFINES_MODULE]->(src:Module)-[:IMPORTS]->(tgt:Module)<-[:DEFINES_MODULE]-(f2:File)
+                UNWIND caller._calls AS callee_name
+                WITH DISTINCT caller, f2, callee_name
+                WHERE NOT (caller)-[:CALLS]->(:Function {name: callee_name})
+                MATCH (callee:Function {name: callee_name})
+                USING INDEX callee:Function(name)
+                WHERE caller <> callee AND (f2)-[:CONTAINS*1..3]->(callee)
+                MERGE (caller)-[:CALLS]->(callee)
+                RETURN count(*) AS created
+            } IN TRANSACTIONS OF $batch ROWS
+            RETURN sum(created) AS created
+            """,
+            {"batch": RESOLVE_BATCH_ROWS},
         )
         if result:
-            edge_count += result[0].get("created", 0)
+            edge_count += result[0].get("created") or 0
 
         # Pass 3: Globally unique name match (skip ambiguous names)
-        result = await self._run(
+        result = await self._run_autocommit(
             """
             MATCH (caller:Function)
             WHERE caller._calls IS NOT NULL AND size(caller._calls) > 0
-            UNWIND caller._calls AS callee_name
-            WITH caller, callee_name
-            WHERE NOT (caller)-[:CALLS]->(:Function {name: callee_name})
-            MATCH (callee:Function {name: callee_name})
-            WHERE caller <> callee
-            WITH caller, callee_name, collect(DISTINCT callee) AS candidates
-            WHERE size(candidates) = 1
-            WITH caller, candidates[0] AS callee
-            MERGE (caller)-[:CALLS]->(callee)
-            RETURN count(*) as created
-            """
+            CALL {
+                WITH caller
+                UNWIND caller._calls AS callee_name
+                WITH DISTINCT caller, callee_name
+                WHERE NOT (caller)-[:CALLS]->(:Function {name: callee_name})
+                MATCH (callee:Function {name: callee_name})
+                USING INDEX callee:Function(name)
+                WHERE caller <> callee
+                WITH caller, callee_name, collect(DISTINCT callee) AS candidates
+                WHERE size(candidates) = 1
+                WITH caller, callee_name, candidates[0] AS callee
+                MERGE (caller)-[:CALLS]->(callee)
+                RETURN count(*) AS created
+            } IN TRANSACTIONS OF $batch ROWS
+            RETURN sum(created) AS created
+            """,
+            {"batch": RESOLVE_BATCH_ROWS},
         )
         if result:
-            edge_count += result[0].get("created", 0)
+            edge_count += result[0].get("created") or 0
 
         # Resolve unresolved base classes
         result = await self._run(
             """
-            MATCH (c:Class)-[:INHERITS_FROM]->(base:Class {_unresolved: true})
+            MATCH (base:Class {_unresolved: true})
+            USING INDEX base:Class(_unresolved)
+            MATCH (c:Class)-[:INHERITS_FROM]->(base)
             MATCH (resolved:Class {name: base.name})
             WHERE resolved._unresolved IS NULL
             WITH c, base, resolved
@@ -202,57 +263,79 @@ class EdgeOperationsMixin:
 
     async def resolve_calls_for_function(self, qualified_name: str, calls: list[str]) -> None:
         """Resolve CALLS edges for a specific function using same-file, import, and unique-name strategies."""
-        await self._write(
-            "MATCH (f:Function {qualified_name: $qname})-[r:CALLS]->() DELETE r",
-            {"qname": qualified_name},
-        )
-
-        if not calls:
-            return
-
-        # Same-file matches
+        # One round trip: drop the old edges, then run the three strategies
+        # as consecutive subqueries so later ones see earlier MERGEs.
         await self._write(
             """
             MATCH (caller:Function {qualified_name: $qname})
-            MATCH (f:File)-[:CONTAINS*1..3]->(caller)
-            WITH caller, f, $calls AS call_list
-            UNWIND call_list AS callee_name
-            MATCH (f)-[:CONTAINS*1..3]->(callee:Function {name: callee_name})
-            WHERE caller <> callee
-            MERGE (caller)-[:CALLS]->(callee)
+            OPTIONAL MATCH (caller)-[r:CALLS]->()
+            DELETE r
+            WITH DISTINCT caller
+            OPTIONAL MATCH (f1:File)-[:CONTAINS*1..3]->(caller)
+            WITH caller, f1
+            // Same-file matches
+            CALL {
+                WITH caller, f1
+                UNWIND $calls AS callee_name
+                WITH DISTINCT caller, f1, callee_name
+                MATCH (callee:Function {name: callee_name})
+                USING INDEX callee:Function(name)
+                WHERE caller <> callee AND (f1)-[:CONTAINS*1..3]->(callee)
+                MERGE (caller)-[:CALLS]->(callee)
+            }
+            // Import-based cross-file matches
+            CALL {
+                WITH caller, f1
+                MATCH (f1)-[:DEFINES_MODULE]->(:Module)-[:IMPORTS]->(:Module)<-[:DEFINES_MODULE]-(f2:File)
+                UNWIND $calls AS callee_name
+                WITH DISTINCT caller, f2, callee_name
+                MATCH (callee:Function {name: callee_name})
+                USING INDEX callee:Function(name)
+                WHERE caller <> callee
+                  AND (f2)-[:CONTAINS*1..3]->(callee)
+                  AND NOT (caller)-[:CALLS]->(callee)
+                MERGE (caller)-[:CALLS]->(callee)
+            }
+            // Unique global name matches for remaining unresolved calls
+            CALL {
+                WITH caller
+                UNWIND $calls AS callee_name
+                WITH DISTINCT caller, callee_name
+                WHERE NOT (caller)-[:CALLS]->(:Function {name: callee_name})
+                MATCH (callee:Function {name: callee_name})
+                USING INDEX callee:Function(name)
+                WHERE caller <> callee
+                WITH caller, callee_name, collect(DISTINCT callee) AS candidates
+                WHERE size(candidates) = 1
+                WITH caller, candidates[0] AS callee
+                MERGE (caller)-[:CALLS]->(callee)
+            }
+            // Keep the full call list so resolve_all_relationships can
+            // re-derive edges later lost to a deleted callee
+            WITH DISTINCT caller
+            SET caller._calls = $calls
             """,
-            {"qname": qualified_name, "calls": calls},
+            {"qname": qualified_name, "calls": calls or []},
         )
 
-        # Import-based cross-file matches
-        await self._write(
-            """
-            MATCH (caller:Function {qualified_name: $qname})
-            MATCH (f1:File)-[:CONTAINS*1..3]->(caller)
-            MATCH (f1)-[:DEFINES_MODULE]->(src:Module)-[:IMPORTS]->(tgt:Module)<-[:DEFINES_MODULE]-(f2:File)
-            WITH caller, f2, $calls AS call_list
-            UNWIND call_list AS callee_name
-            MATCH (f2)-[:CONTAINS*1..3]->(callee:Function {name: callee_name})
-            WHERE caller <> callee AND NOT (caller)-[:CALLS]->(callee)
-            MERGE (caller)-[:CALLS]->(callee)
-            """,
-            {"qname": qualified_name, "calls": calls},
-        )
 
-        # Unique global name matches for remaining unresolved calls
-        await self._write(
-            """
-            MATCH (caller:Function {qualified_name: $qname})
-            WITH caller, $calls AS call_list
-            UNWIND call_list AS callee_name
-            WITH caller, callee_name
-            WHERE NOT (caller)-[:CALLS]->(:Function {name: callee_name})
-            MATCH (callee:Function {name: callee_name})
-            WHERE caller <> callee
-            WITH caller, callee_name, collect(DISTINCT callee) AS candidates
-            WHERE size(candidates) = 1
-            WITH caller, candidates[0] AS callee
-            MERGE (caller)-[:CALLS]->(callee)
-            """,
-            {"qname": qualified_name, "calls": calls},
-        )
+def _import_edge_params(imp: dict) -> dict | None:
+    """Build the _IMPORT_EDGE_QUERY parameters for a parsed import, or None to skip it."""
+    target_module = imp["module"]
+    if not target_module:
+        return None
+
+    # Store all import flags on the edge
+    return {
+        "src_mod": imp.get("source_module", ""),
+        "tgt_mod": target_module,
+        "names": imp.get("names", []),
+        # JSON like parameters_explained, so readers can parse it back
+        "aliases": orjson.dumps(imp.get("aliases") or {}).decode(),
+        "is_relative": imp.get("is_relative", False),
+        "is_type_checking": imp.get("is_type_checking", False),
+        "is_conditional": imp.get("is_conditional", False),
+        "condition": imp.get("condition"),
+        "is_try_except": imp.get("is_try_except", False),
+        "is_fallback": imp.get("is_fallback", False),
+    }
@@ -6,9 +6,33 @@ across Function and Class nodes.
 """
 
 import logging
+import os
 
 logger = logging.getLogger("indexer-agent.graph_manager")
 
+# Upper bound on rows per embedding write.  Each row carries a full vector
+# (3072 floats for text-embedding-3-large, ~28 KB on the wire), so 200 rows
+# keep a transaction around 5-6 MB, well inside memory-capped tx pools
+EMBED_BATCH_ROWS = int(os.getenv("NEO4J_EMBED_BATCH_SIZE", "200"))
+
+# Both labels are matched through their qualified_name constraints; an
+# unlabelled MATCH would scan every node once per row.  The procedure stores
+# the vector as a float32 array (half the size of a list of doubles) after
+# checking it against the vector index dimensions.
+_SET_EMBEDDINGS_QUERY = """
+UNWIND $rows AS row
+CALL {
+    WITH row
+    MATCH (n:Function {qualified_name: row.qname})
+    RETURN n
+    UNION
+    WITH row
+    MATCH (n:Class {qualified_name: row.qname})
+    RETURN n
+}
+CALL db.create.setNodeVectorProperty(n, 'embedding', row.embedding)
+"""
+
 
 def _build_embedding_text(node: dict) -> str:
     """Build a text representation of a graph node for vector embedding.
@@ -44,17 +68,23 @@ def _build_embedding_text(node: dict) -> str:
 class EmbeddingOperationsMixin:
     """Mixin providing vector embedding management for the graph manager."""
 
+    _warmup_queries = (_SET_EMBEDDINGS_QUERY,)
+
     # ─── Embeddings ────────────────────────────────────────
 
     async def set_embedding(self, qualified_name: str, embedding: list[float]) -> None:
         """Store vector embedding on a node."""
-        await self._write(
-            """
-            MATCH (n {qualified_name: $qname})
-            SET n.embedding = $embedding
-            """,
-            {"qname": qualified_name, "embedding": embedding},
-        )
+        await self.set_embeddings_bulk([{"qname": qualified_name, "embedding": embedding}])
+
+    async def set_embeddings_bulk(self, items: list[dict]) -> None:
+        """
+        Store many vector embeddings with one UNWIND write per chunk.
+
+        Args:
+            items: ``{"qname": ..., "embedding": [...]}`` dicts.
+        """
+        for i in range(0, len(items), EMBED_BATCH_ROWS):
+            await self._write(_SET_EMBEDDINGS_QUERY, {"rows": items[i : i + EMBED_BATCH_ROWS]})
 
     async def create_all_embeddings(self, embeddings_model, batch_size: int = 50) -> int:
         """
@@ -106,15 +136,15 @@ class EmbeddingOperationsMixin:
                 logger.error("Embedding batch %d failed: %s", i // batch_size, e)
                 continue
 
-            for qname, vector in zip(qnames, vectors):
-                await self.set_embedding(qname, vector)
-                embedded_count += 1
+            # Persist each API batch straight away: nothing paid for sits in
+            # memory waiting on a later write
+            await self.set_embeddings_bulk([
+                {"qname": qname, "embedding": vector}
+                for qname, vector in zip(qnames, vectors)
+            ])
+            embedded_count += len(vectors)
 
-            logger.info(
-                "Embedded %d/%d nodes",
-                min(i + batch_size, len(nodes)),
-                len(nodes),
-            )
+            logger.info("Embedded %d/%d nodes", embedded_count, len(nodes))
 
         logger.info("Embedding complete: %d nodes", embedded_count)
         return embedded_count
@@ -5,15 +5,106 @@ Storage of LLM enrichment data, semantic edges (design patterns,
 domain concepts, collaborators, data flow), and enrichment caching.
 """
 
-import json as _json
+import hashlib
 import logging
 
+import orjson
+
 logger = logging.getLogger("indexer-agent.graph_manager")
 
+SEMANTIC_EDGE_TYPES = [
+    "IMPLEMENTS_PATTERN", "RELATES_TO_CONCEPT", "COLLABORATES_WITH", "DATA_FLOWS_TO",
+]
+
+
+
+def _match_entity(qname: str) -> str:
+    """
+    Cypher binding ``n`` to the Function or Class named ``qname``.
+
+    Each branch seeks its label's qualified_name constraint; an unlabelled
+    ``MATCH (n {qualified_name: ...})`` scans every node in the graph.
+    """
+    imports = "WITH row " if qname.startswith("row.") else ""
+    return f"""CALL {{
+    {imports}MATCH (n:Function {{qualified_name: {qname}}}) RETURN n
+    UNION
+    {imports}MATCH (n:Class {{qualified_name: {qname}}}) RETURN n
+}}
+"""
+
+
+_MATCH_BY_QNAME = _match_entity("$qname")
+_MATCH_BY_ROW_QNAME = _match_entity("row.qname")
+
+_SET_ENRICHMENT_COMMON = _MATCH_BY_QNAME + """
+SET n.purpose = $purpose,
+    n.summary = $summary,
+    n.design_patterns = $patterns,
+    n.complexity = $complexity,
+    n.domain_concepts = $concepts,
+    n.enriched_at = datetime(),
+    n.enrichment_hash = n.content_hash
+"""
+
+# Labelled per entity type so the MATCH is an index seek and the
+# type-specific fields are written in the same statement
+_SET_ENRICHMENT_QUERIES = {
+    "function": """
+MATCH (n:Function {qualified_name: $qname})
+SET n.purpose = $purpose,
+    n.summary = $summary,
+    n.design_patterns = $patterns,
+    n.complexity = $complexity,
+    n.domain_concepts = $concepts,
+    n.enriched_at = datetime(),
+    n.enrichment_hash = n.content_hash,
+    n.side_effects = $side_effects,
+    n.parameters_explained = $params_explained
+""",
+    "class": """
+MATCH (n:Class {qualified_name: $qname})
+SET n.purpose = $purpose,
+    n.summary = $summary,
+    n.design_patterns = $patterns,
+    n.complexity = $complexity,
+    n.domain_concepts = $concepts,
+    n.enriched_at = datetime(),
+    n.enrichment_hash = n.content_hash,
+    n.role = $role,
+    n.key_methods = $key_methods
+""",
+}
+
+
+def _semantic_hash(enrichment: dict) -> str:
+    """
+    Fingerprint the enrichment fields that produce semantic edges.
+
+    List order is ignored, so a re-enrichment that yields the same
+    patterns/concepts/collaborators/data flow leaves the edges untouched.
+    """
+    key = [
+        sorted(enrichment.get(field, []))
+        for field in ("design_patterns", "domain_concepts", "collaborators", "data_flows_to")
+    ]
+    return hashlib.blake2b(orjson.dumps(key), digest_size=8).hexdigest()
+
+
+def _params_explained_json(enrichment: dict) -> str:
+    """Serialize parameters_explained as a JSON object of name -> explanation."""
+    params = enrichment.get("parameters_explained", [])
+    if isinstance(params, list):
+        params = {p["name"]: p["explanation"] for p in params}
+    return orjson.dumps(params).decode()
+
 
 class EnrichmentOperationsMixin:
     """Mixin providing enrichment storage and caching for the graph manager."""
 
+    # Planned at startup by GraphManagerBase.warm_query_plans
+    _warmup_queries = tuple(_SET_ENRICHMENT_QUERIES.values())
+
     # ─── Enrichment ────────────────────────────────────────
 
     async def set_enrichment(
@@ -27,18 +118,10 @@ class EnrichmentOperationsMixin:
         - function: side_effects, parameters_explained
         - class: role, key_methods
         """
-        # Common fields
+        # One write: common and type-specific fields share a statement
+        query = _SET_ENRICHMENT_QUERIES.get(entity_type, _SET_ENRICHMENT_COMMON)
         await self._write(
-            """
-            MATCH (n {qualified_name: $qname})
-            SET n.purpose = $purpose,
-                n.summary = $summary,
-                n.design_patterns = $patterns,
-                n.complexity = $complexity,
-                n.domain_concepts = $concepts,
-                n.enriched_at = datetime(),
-                n.enrichment_hash = n.content_hash
-            """,
+            query,
             {
                 "qname": qualified_name,
                 "purpose": enrichment.get("purpose", ""),
@@ -46,114 +129,170 @@ class EnrichmentOperationsMixin:
                 "patterns": enrichment.get("design_patterns", []),
                 "complexity": enrichment.get("complexity", "unknown"),
                 "concepts": enrichment.get("domain_concepts", []),
+                "side_effects": enrichment.get("side_effects", []),
+                "params_explained": _params_explained_json(enrichment),
+                "role": enrichment.get("role", ""),
+                "key_methods": enrichment.get("key_methods", []),
             },
         )
 
-        # Entity-type-specific fields
-        if entity_type == "function":
-            await self._write(
-                """
-                MATCH (n:Function {qualified_name: $qname})
-                SET n.side_effects = $side_effects,
-                    n.parameters_explained = $params_explained
-                """,
-                {
-                    "qname": qualified_name,
-                    "side_effects": enrichment.get("side_effects", []),
-                    "params_explained": _json.dumps(
-                        {
-                            p["name"]: p["explanation"]
-                            for p in enrichment.get("parameters_explained", [])
-                        }
-                        if isinstance(enrichment.get("parameters_explained"), list)
-                        else enrichment.get("parameters_explained", {})
-                    ),
-                },
+    async def create_semantic_edges(self, qualified_name: str, enrichment: dict) -> None:
+        """
+        Create semantic edges based on LLM enrichment output.
+
+        One write: patterns and concepts are MERGEd with FOREACH, and
+        collaborators / data-flow targets are UNWOUND in subqueries.
+        """
+        await self._write(
+            _MATCH_BY_QNAME + """
+            FOREACH (pattern IN $patterns |
+                MERGE (p:DesignPattern {name: pattern})
+                MERGE (n)-[:IMPLEMENTS_PATTERN]->(p)
             )
-        elif entity_type == "class":
-            await self._write(
-                """
-                MATCH (n:Class {qualified_name: $qname})
-                SET n.role = $role,
-                    n.key_methods = $key_methods
-                """,
-                {
-                    "qname": qualified_name,
-                    "role": enrichment.get("role", ""),
-                    "key_methods": enrichment.get("key_methods", []),
-                },
+            FOREACH (concept IN $concepts |
+                MERGE (c:DomainConcept {name: concept})
+                MERGE (n)-[:RELATES_TO_CONCEPT]->(c)
             )
+            WITH n
+            // Collaborators (class-level)
+            CALL {
+                WITH n
+                UNWIND $collaborators AS collab_name
+                MATCH (c:Class {name: collab_name})
+                WHERE n <> c
+                MERGE (n)-[:COLLABORATES_WITH]->(c)
+            }
+            // Data flow edges (from Paper 3 — data-flow awareness)
+            CALL {
+                WITH n
+                UNWIND $data_flows_to AS target_name
+                MATCH (t)
+                WHERE (t:Function OR t:Class) AND t.name = target_name AND n <> t
+                MERGE (n)-[:DATA_FLOWS_TO]->(t)
+            }
+            """,
+            {
+                "qname": qualified_name,
+                "patterns": enrichment.get("design_patterns", []),
+                "concepts": enrichment.get("domain_concepts", []),
+                "collaborators": enrichment.get("collaborators", []),
+                "data_flows_to": enrichment.get("data_flows_to", []),
+            },
+        )
 
-    async def create_semantic_edges(self, qualified_name: str, enrichment: dict) -> None:
-        """Create semantic edges based on LLM enrichment output."""
-        # Design pattern nodes
-        for pattern in enrichment.get("design_patterns", []):
-            await self._write(
-                """
-                MATCH (n {qualified_name: $qname})
-                MERGE (p:DesignPattern {name: $pattern})
+    async def set_enrichments_bulk(self, rows: list[dict]) -> None:
+        """
+        Replace enrichment properties and semantic edges for many nodes at once.
+
+        Each row is ``{"qname", "entity_type", "enrichment"}``.  Equivalent to
+        delete_semantic_edges + set_enrichment + create_semantic_edges per
+        row, in a single UNWIND write.  Edges are only rebuilt for nodes whose
+        stored ``semantic_hash`` differs from the new enrichment's.
+        """
+        if not rows:
+            return
+
+        params = []
+        for row in rows:
+            enrichment = row["enrichment"]
+            params.append({
+                "qname": row["qname"],
+                "entity_type": row["entity_type"],
+                "purpose": enrichment.get("purpose", ""),
+                "summary": enrichment.get("summary", ""),
+                "patterns": enrichment.get("design_patterns", []),
+                "complexity": enrichment.get("complexity", "unknown"),
+                "concepts": enrichment.get("domain_concepts", []),
+                "side_effects": enrichment.get("side_effects", []),
+                "params_explained": _params_explained_json(enrichment),
+                "role": enrichment.get("role", ""),
+                "key_methods": enrichment.get("key_methods", []),
+                "collaborators": enrichment.get("collaborators", []),
+                "data_flows_to": enrichment.get("data_flows_to", []),
+                "semantic_hash": _semantic_hash(enrichment),
+            })
+
+        await self._write(
+            """
+            UNWIND $rows AS row
+            """ + _MATCH_BY_ROW_QNAME + """
+            WITH n, row, coalesce(n.semantic_hash, '') <> row.semantic_hash AS edges_changed
+            CALL {
+                WITH n, edges_changed
+                WITH n WHERE edges_changed
+                MATCH (n)-[r]->()
+                WHERE type(r) IN $edge_types
+                DELETE r
+            }
+            SET n.purpose = row.purpose,
+                n.summary = row.summary,
+                n.design_patterns = row.patterns,
+                n.complexity = row.complexity,
+                n.domain_concepts = row.concepts,
+                n.enriched_at = datetime(),
+                n.enrichment_hash = n.content_hash,
+                n.semantic_hash = row.semantic_hash
+            FOREACH (_ IN CASE WHEN row.entity_type = 'function' AND n:Function THEN [1] ELSE [] END |
+                SET n.side_effects = row.side_effects,
+                    n.parameters_explained = row.params_explained
+            )
+            FOREACH (_ IN CASE WHEN row.entity_type = 'class' AND n:Class THEN [1] ELSE [] END |
+                SET n.role = row.role,
+                    n.key_methods = row.key_methods
+            )
+            FOREACH (pattern IN CASE WHEN edges_changed THEN row.patterns ELSE [] END |
+                MERGE (p:DesignPattern {name: pattern})
                 MERGE (n)-[:IMPLEMENTS_PATTERN]->(p)
-                """,
-                {"qname": qualified_name, "pattern": pattern},
             )
-
-        # Domain concept nodes
-        for concept in enrichment.get("domain_concepts", []):
-            await self._write(
-                """
-                MATCH (n {qualified_name: $qname})
-                MERGE (c:DomainConcept {name: $concept})
+            FOREACH (concept IN CASE WHEN edges_changed THEN row.concepts ELSE [] END |
+                MERGE (c:DomainConcept {name: concept})
                 MERGE (n)-[:RELATES_TO_CONCEPT]->(c)
-                """,
-                {"qname": qualified_name, "concept": concept},
             )
-
-        # Collaborators (class-level)
-        for collab in enrichment.get("collaborators", []):
-            await self._write(
-                """
-                MATCH (n {qualified_name: $qname})
-                MATCH (c:Class {name: $collab_name})
+            WITH n, row, edges_changed
+            CALL {
+                WITH n, row, edges_changed
+                WITH n, row WHERE edges_changed
+                UNWIND row.collaborators AS collab_name
+                MATCH (c:Class {name: collab_name})
                 WHERE n <> c
                 MERGE (n)-[:COLLABORATES_WITH]->(c)
-                """,
-                {"qname": qualified_name, "collab_name": collab},
-            )
-
-        # Data flow edges (from Paper 3 — data-flow awareness)
-        for target in enrichment.get("data_flows_to", []):
-            await self._write(
-                """
-                MATCH (n {qualified_name: $qname})
+            }
+            CALL {
+                WITH n, row, edges_changed
+                WITH n, row WHERE edges_changed
+                UNWIND row.data_flows_to AS target_name
                 MATCH (t)
-                WHERE (t:Function OR t:Class) AND t.name = $target_name AND n <> t
+                WHERE (t:Function OR t:Class) AND t.name = target_name AND n <> t
                 MERGE (n)-[:DATA_FLOWS_TO]->(t)
-                """,
-                {"qname": qualified_name, "target_name": target},
-            )
+            }
+            """,
+            {"rows": params, "edge_types": SEMANTIC_EDGE_TYPES},
+        )
 
     async def delete_semantic_edges(self, qualified_name: str) -> None:
         """Delete all semantic edges for a node before re-enrichment."""
+        # Clearing semantic_hash makes the next bulk write rebuild the edges
         await self._write(
-            """
-            MATCH (n {qualified_name: $qname})-[r]->()
-            WHERE type(r) IN ['IMPLEMENTS_PATTERN', 'RELATES_TO_CONCEPT',
-                              'COLLABORATES_WITH', 'DATA_FLOWS_TO']
+            _MATCH_BY_QNAME + """
+            REMOVE n.semantic_hash
+            WITH n
+            MATCH (n)-[r]->()
+            WHERE type(r) IN $edge_types
             DELETE r
             """,
-            {"qname": qualified_name},
+            {"qname": qualified_name, "edge_types": SEMANTIC_EDGE_TYPES},
         )
 
     # ─── Enrichment Cache ──────────────────────────────────
 
     async def get_cached_enrichment(self, content_hash: str) -> dict | None:
         """Look up enrichment from cache by content hash."""
-        result = await self._run_single(
+        result = await self._run_read_single(
             "MATCH (c:EnrichmentCache {content_hash: $hash}) RETURN c.enrichment_json as data",
             {"hash": content_hash},
         )
         if result and result.get("data"):
-            return _json.loads(result["data"])
+            return orjson.loads(result["data"])
         return None
 
     async def cache_enrichment(self, content_hash: str, enrichment: dict) -> None:
@@ -164,5 +303,24 @@ class EnrichmentOperationsMixin:
             SET c.enrichment_json = $data,
                 c.cached_at = datetime()
             """,
-            {"hash": content_hash, "data": _json.dumps(enrichment)},
+            {"hash": content_hash, "data": orjson.dumps(enrichment).decode()},
+        )
+
+    async def cache_enrichments_bulk(self, rows: list[dict]) -> None:
+        """Store many ``{"content_hash", "enrichment"}`` rows in the cache at once."""
+        if not rows:
+            return
+        await self._write(
+            """
+            UNWIND $rows AS row
+            MERGE (c:EnrichmentCache {content_hash: row.hash})
+            SET c.enrichment_json = row.data,
+                c.cached_at = datetime()
+            """,
+            {
+                "rows": [
+                    {"hash": row["content_hash"], "data": orjson.dumps(row["enrichment"]).decode()}
+                    for row in rows
+                ],
+            },
         )
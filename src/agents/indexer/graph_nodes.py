@@ -11,113 +11,330 @@ from src.agents.indexer.models import path_to_module
 
 logger = logging.getLogger("indexer-agent.graph_manager")
 
+# ─── Queries ───────────────────────────────────────────────
+# Hoisted so each statement is a single shared string (one server plan each)
+
+# Shared tail of the create_functions_bulk queries: `parent` and `row` are
+# bound by each variant's MATCH/UNWIND prefix.  Source-derived properties
+# are only rewritten when content_hash changed.
+_BULK_FUNCTION_BODY = """
+    MERGE (fn:Function {qualified_name: row.qname})
+    ON CREATE SET fn.name = row.name,
+                  fn.is_method = row.is_method,
+                  fn.is_nested = row.is_nested
+    SET fn.lineno_start = row.start,
+        fn.lineno_end = row.end
+    FOREACH (_ IN CASE WHEN fn.content_hash = row.hash THEN [] ELSE [1] END |
+        SET fn.source = row.source,
+            fn.content_hash = row.hash,
+            fn.is_async = row.is_async,
+            fn.docstring = row.docstring,
+            fn.return_annotation = row.return_ann,
+            fn._calls = row.calls
+    )
+    MERGE (parent)-[:CONTAINS]->(fn)
+    FOREACH (dec IN row.decorators |
+        MERGE (d:Decorator {name: dec.name})
+        ON CREATE SET d.arguments = dec.arguments
+        MERGE (fn)-[:DECORATED_BY]->(d)
+    )
+    FOREACH (param IN row.params |
+        CREATE (p:Parameter {
+            name: param.name,
+            type_annotation: param.type_ann,
+            default_value: param.default_val,
+            position: param.position,
+            kind: param.kind
+        })
+        CREATE (fn)-[:HAS_PARAMETER]->(p)
+    )
+"""
+
+
+_CREATE_FILE_QUERY = """
+    MERGE (f:File {path: $path})
+    ON CREATE SET f.name = $name,
+                  f.module_name = $module
+    SET f.content_hash = $hash,
+        f.indexed_at = datetime()
+    WITH f
+    MERGE (m:Module {qualified_name: $module})
+    MERGE (f)-[:DEFINES_MODULE]->(m)
+"""
+
+_DELETE_FILE_SUBGRAPH_QUERY = """
+    MATCH (f:File {path: $path})
+    OPTIONAL MATCH (f)-[:CONTAINS]->(entity)
+    OPTIONAL MATCH (entity)-[:CONTAINS]->(child)
+    WITH f, count(DISTINCT entity) AS entities, count(DISTINCT child) AS children
+    OPTIONAL MATCH (f)-[:CONTAINS*1..]->(x)
+    OPTIONAL MATCH (x)-[:HAS_PARAMETER|HAS_ATTRIBUTE]->(y)
+    WITH f, entities, children, collect(DISTINCT x) + collect(DISTINCT y) AS doomed
+    FOREACH (n IN doomed | DETACH DELETE n)
+    DETACH DELETE f
+    RETURN entities, children
+"""
+
+_CREATE_CLASS_QUERY = """
+    MATCH (f:File {path: $file_path})
+    MERGE (c:Class {qualified_name: $qname})
+    ON CREATE SET c.name = $name
+    SET c.lineno_start = $start,
+        c.lineno_end = $end
+    FOREACH (_ IN CASE WHEN c.content_hash = $hash THEN [] ELSE [1] END |
+        SET c.source = $source,
+            c.content_hash = $hash,
+            c.docstring = $docstring
+    )
+    MERGE (f)-[:CONTAINS]->(c)
+    FOREACH (dec IN $decorators |
+        MERGE (d:Decorator {name: dec.name})
+        ON CREATE SET d.arguments = dec.arguments
+        MERGE (c)-[:DECORATED_BY]->(d)
+    )
+    FOREACH (base_name IN $bases |
+        MERGE (base:Class {name: base_name})
+        ON CREATE SET base.qualified_name = base_name,
+                      base._unresolved = true
+        MERGE (c)-[:INHERITS_FROM]->(base)
+    )
+"""
+
+_UPDATE_CLASS_QUERY = """
+    MATCH (c:Class {qualified_name: $qname})
+    SET c.source = $source,
+        c.content_hash = $hash,
+        c.lineno_start = $start,
+        c.lineno_end = $end,
+        c.docstring = $docstring
+"""
+
+_DELETE_CLASS_NESTED_FUNCTIONS_QUERY = """
+    MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function)-[:CONTAINS]->(nested:Function)
+    OPTIONAL MATCH (nested)-[:HAS_PARAMETER]->(p:Parameter)
+    DETACH DELETE p, nested
+"""
+
+_DELETE_CLASS_METHOD_PARAMETERS_QUERY = """
+    MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function)-[:HAS_PARAMETER]->(p)
+    DETACH DELETE p
+"""
+
+_DELETE_CLASS_METHODS_QUERY = """
+    MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function)
+    DETACH DELETE m
+"""
+
+_DELETE_CLASS_ATTRIBUTES_QUERY = """
+    MATCH (c:Class {qualified_name: $qname})-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
+    DETACH DELETE a
+"""
+
+_DELETE_CLASS_QUERY = "MATCH (c:Class {qualified_name: $qname}) DETACH DELETE c"
+
+_CREATE_CLASS_ATTRIBUTE_QUERY = """
+    MATCH (c:Class {qualified_name: $class_qname})
+    CREATE (a:ClassAttribute {
+        name: $name,
+        type_annotation: $type_ann,
+        default_value: $default_val,
+        lineno: $lineno
+    })
+    CREATE (c)-[:HAS_ATTRIBUTE]->(a)
+"""
+
+_CREATE_CLASS_ATTRIBUTES_BULK_QUERY = """
+    MATCH (c:Class {qualified_name: $class_qname})
+    UNWIND $attrs AS attr
+    CREATE (a:ClassAttribute {
+        name: attr.name,
+        type_annotation: attr.type_ann,
+        default_value: attr.default_val,
+        lineno: attr.lineno
+    })
+    CREATE (c)-[:HAS_ATTRIBUTE]->(a)
+"""
+
+_CREATE_NESTED_FUNCTION_QUERY = """
+    MATCH (parent:Function {qualified_name: $parent_qname})
+    MERGE (fn:Function {qualified_name: $qname})
+    ON CREATE SET fn.name = $name,
+                  fn.is_method = false,
+                  fn.is_nested = true
+    SET fn.lineno_start = $start,
+        fn.lineno_end = $end
+    FOREACH (_ IN CASE WHEN fn.content_hash = $hash THEN [] ELSE [1] END |
+        SET fn.source = $source,
+            fn.content_hash = $hash,
+            fn.is_async = $is_async,
+            fn.docstring = $docstring,
+            fn.return_annotation = $return_ann,
+            fn._calls = $calls
+    )
+    MERGE (parent)-[:CONTAINS]->(fn)
+"""
+
+_CREATE_METHOD_QUERY = """
+    MATCH (f:File {path: $file_path})-[:CONTAINS]->(c:Class {name: $class_name})
+    USING INDEX f:File(path)
+    MERGE (fn:Function {qualified_name: $qname})
+    ON CREATE SET fn.name = $name,
+                  fn.is_method = true,
+                  fn.is_nested = false
+    SET fn.lineno_start = $start,
+        fn.lineno_end = $end
+    FOREACH (_ IN CASE WHEN fn.content_hash = $hash THEN [] ELSE [1] END |
+        SET fn.source = $source,
+            fn.content_hash = $hash,
+            fn.is_async = $is_async,
+            fn.docstring = $docstring,
+            fn.return_annotation = $return_ann,
+            fn._calls = $calls
+    )
+    MERGE (c)-[:CONTAINS]->(fn)
+"""
+
+_CREATE_TOP_LEVEL_FUNCTION_QUERY = """
+    MATCH (f:File {path: $file_path})
+    MERGE (fn:Function {qualified_name: $qname})
+    ON CREATE SET fn.name = $name,
+                  fn.is_method = false,
+                  fn.is_nested = $is_nested
+    SET fn.lineno_start = $start,
+        fn.lineno_end = $end
+    FOREACH (_ IN CASE WHEN fn.content_hash = $hash THEN [] ELSE [1] END |
+        SET fn.source = $source,
+            fn.content_hash = $hash,
+            fn.is_async = $is_async,
+            fn.docstring = $docstring,
+            fn.return_annotation = $return_ann,
+            fn._calls = $calls
+    )
+    MERGE (f)-[:CONTAINS]->(fn)
+"""
+
+_BULK_TOP_LEVEL_FUNCTIONS_QUERY = """
+    MATCH (parent:File {path: $file_path})
+    UNWIND $rows AS row
+""" + _BULK_FUNCTION_BODY
+
+_BULK_METHODS_QUERY = """
+    MATCH (f:File {path: $file_path})
+    USING INDEX f:File(path)
+    UNWIND $rows AS row
+    MATCH (f)-[:CONTAINS]->(parent:Class {name: row.parent})
+""" + _BULK_FUNCTION_BODY
+
+_BULK_NESTED_FUNCTIONS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (parent:Function {qualified_name: row.parent})
+""" + _BULK_FUNCTION_BODY
+
+_UPDATE_FUNCTION_QUERY = """
+    MATCH (fn:Function {qualified_name: $qname})
+    SET fn.source = $source,
+        fn.content_hash = $hash,
+        fn.lineno_start = $start,
+        fn.lineno_end = $end,
+        fn.is_async = $is_async,
+        fn.is_nested = $is_nested,
+        fn.docstring = $docstring,
+        fn.return_annotation = $return_ann,
+        fn._calls = $calls
+"""
+
+_DELETE_NESTED_FUNCTION_PARAMETERS_QUERY = """
+    MATCH (fn:Function {qualified_name: $qname})-[:CONTAINS]->(nested:Function)-[:HAS_PARAMETER]->(p)
+    DETACH DELETE p
+"""
+
+_DELETE_NESTED_FUNCTIONS_QUERY = """
+    MATCH (fn:Function {qualified_name: $qname})-[:CONTAINS]->(nested:Function)
+    DETACH DELETE nested
+"""
+
+_DELETE_PARAMETERS_QUERY = """
+    MATCH (fn:Function {qualified_name: $qname})-[:HAS_PARAMETER]->(p)
+    DETACH DELETE p
+"""
+
+_DELETE_FUNCTION_QUERY = "MATCH (fn:Function {qualified_name: $qname}) DETACH DELETE fn"
+
+_CREATE_PARAMETER_QUERY = """
+    MATCH (fn:Function {qualified_name: $func_qname})
+    CREATE (p:Parameter {
+        name: $name,
+        type_annotation: $type_ann,
+        default_value: $default_val,
+        position: $position,
+        kind: $kind
+    })
+    CREATE (fn)-[:HAS_PARAMETER]->(p)
+"""
+
+_CREATE_PARAMETERS_BULK_QUERY = """
+    MATCH (fn:Function {qualified_name: $func_qname})
+    UNWIND $params AS param
+    CREATE (p:Parameter {
+        name: param.name,
+        type_annotation: param.type_ann,
+        default_value: param.default_val,
+        position: param.position,
+        kind: param.kind
+    })
+    CREATE (fn)-[:HAS_PARAMETER]->(p)
+"""
+
 
 class NodeOperationsMixin:
     """Mixin providing node CRUD operations for the graph manager."""
 
+    # Planned at startup by GraphManagerBase.warm_query_plans
+    _warmup_queries = (
+        _CREATE_FILE_QUERY,
+        _DELETE_FILE_SUBGRAPH_QUERY,
+        _CREATE_CLASS_QUERY,
+        _CREATE_CLASS_ATTRIBUTES_BULK_QUERY,
+        _BULK_TOP_LEVEL_FUNCTIONS_QUERY,
+        _BULK_METHODS_QUERY,
+        _BULK_NESTED_FUNCTIONS_QUERY,
+        _CREATE_PARAMETERS_BULK_QUERY,
+    )
+
     # ─── File Nodes ────────────────────────────────────────
 
-    async def create_file_node(self, file_path: str, content_hash: str) -> None:
-        """Create or update a File node."""
+    async def create_file_node(self, file_path: str, content_hash: str) -> bool:
+        """Create or update a File node. Returns False if it was already up to date."""
+        fingerprint = (content_hash, None, None)
+        if self._hash_unchanged(file_path, fingerprint):
+            return False
         module_name = path_to_module(file_path)
 
         await self._write(
-            """
-            MERGE (f:File {path: $path})
-            SET f.name = $name,
-                f.content_hash = $hash,
-                f.module_name = $module,
-                f.indexed_at = datetime()
-            WITH f
-            MERGE (m:Module {qualified_name: $module})
-            MERGE (f)-[:DEFINES_MODULE]->(m)
-            """,
+            _CREATE_FILE_QUERY,
             {
                 "path": file_path,
-                "name": file_path.replace("\\", "/").split("/")[-1],
+                "name": file_path.replace("\\", "/").rpartition("/")[2],
                 "hash": content_hash,
                 "module": module_name,
             },
         )
+        self._hash_cache[file_path] = fingerprint
+        return True
 
     async def delete_file_subgraph(self, file_path: str) -> dict:
         """
         Delete a file and everything it contains.
         Returns counts of deleted entities.
-        """
-        # Count before deletion
-        counts = await self._run_single(
-            """
-            MATCH (f:File {path: $path})
-            OPTIONAL MATCH (f)-[:CONTAINS]->(entity)
-            OPTIONAL MATCH (entity)-[:CONTAINS]->(child)
-            RETURN count(DISTINCT entity) as entities, count(DISTINCT child) as children
-            """,
-            {"path": file_path},
-        )
-
-        # Delete nested functions inside methods inside classes (3 levels deep)
-        await self._write(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(c)-[:CONTAINS]->(m:Function)-[:CONTAINS]->(nested:Function)
-            OPTIONAL MATCH (nested)-[:HAS_PARAMETER]->(p:Parameter)
-            DETACH DELETE p, nested
-            """,
-            {"path": file_path},
-        )
-
-        # Delete class attributes
-        await self._write(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(c:Class)-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
-            DETACH DELETE a
-            """,
-            {"path": file_path},
-        )
-
-        # Delete parameters of methods/functions
-        await self._write(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(entity)-[:CONTAINS]->(m:Function)-[:HAS_PARAMETER]->(p:Parameter)
-            DETACH DELETE p
-            """,
-            {"path": file_path},
-        )
-        await self._write(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(fn:Function)-[:HAS_PARAMETER]->(p:Parameter)
-            DETACH DELETE p
-            """,
-            {"path": file_path},
-        )
 
-        # Delete children of entities (methods of classes, nested functions)
-        await self._write(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(entity)-[:CONTAINS]->(child)
-            DETACH DELETE child
-            """,
-            {"path": file_path},
-        )
-
-        # Delete direct children of file
-        await self._write(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(entity)
-            DETACH DELETE entity
-            """,
-            {"path": file_path},
-        )
-
-        # Delete the file node itself
-        await self._write(
-            """
-            MATCH (f:File {path: $path})
-            OPTIONAL MATCH (f)-[:DEFINES_MODULE]->(m:Module)
-            DETACH DELETE f
-            """,
-            {"path": file_path},
-        )
+        One query: counts are taken first, then everything reachable through
+        CONTAINS (classes, methods, nested functions at any depth) plus their
+        parameters and class attributes is detached and deleted with the file.
+        The file's Module node is kept.
+        """
+        counts = await self._run_single(_DELETE_FILE_SUBGRAPH_QUERY, {"path": file_path})
+        self._hash_cache.pop(file_path, None)
+        self._forget_hashes(path_to_module(file_path))
 
         return {
             "deleted_entities": counts["entities"] if counts else 0,
@@ -126,20 +343,20 @@ class NodeOperationsMixin:
 
     # ─── Class Nodes ───────────────────────────────────────
 
-    async def create_class_node(self, file_path: str, cls: dict) -> None:
-        """Create a Class node and link it to its File."""
+    async def create_class_node(self, file_path: str, cls: dict) -> bool:
+        """
+        Create a Class node, link it to its File, and add decorator/inheritance edges.
+
+        Returns False without writing if the class is already stored with the
+        same content hash and line span.
+        """
+        qname = cls["qualified_name"]
+        fingerprint = (cls["content_hash"], cls["lineno_start"], cls["lineno_end"])
+        if self._hash_unchanged(qname, fingerprint):
+            return False
+
         await self._write(
-            """
-            MATCH (f:File {path: $file_path})
-            MERGE (c:Class {qualified_name: $qname})
-            SET c.name = $name,
-                c.source = $source,
-                c.content_hash = $hash,
-                c.lineno_start = $start,
-                c.lineno_end = $end,
-                c.docstring = $docstring
-            MERGE (f)-[:CONTAINS]->(c)
-            """,
+            _CREATE_CLASS_QUERY,
             {
                 "file_path": file_path,
                 "qname": cls["qualified_name"],
@@ -149,37 +366,21 @@ class NodeOperationsMixin:
                 "start": cls["lineno_start"],
                 "end": cls["lineno_end"],
                 "docstring": cls.get("docstring", ""),
+                "decorators": [
+                    {"name": dec["name"], "arguments": dec.get("arguments")}
+                    for dec in cls.get("decorators", [])
+                ],
+                "bases": cls.get("bases", []),
             },
         )
-
-        # Decorators
-        for dec in cls.get("decorators", []):
-            await self.create_decorator_edge(cls["qualified_name"], dec, "Class")
-
-        # Inheritance
-        for base in cls.get("bases", []):
-            await self._write(
-                """
-                MATCH (c:Class {qualified_name: $qname})
-                MERGE (base:Class {name: $base_name})
-                ON CREATE SET base.qualified_name = $base_name,
-                             base._unresolved = true
-                MERGE (c)-[:INHERITS_FROM]->(base)
-                """,
-                {"qname": cls["qualified_name"], "base_name": base},
-            )
+        self._hash_cache[qname] = fingerprint
+        return True
 
     async def update_class_node(self, cls: dict) -> None:
         """Update an existing Class node's properties in place."""
+        self._hash_cache.pop(cls["qualified_name"], None)
         await self._write(
-            """
-            MATCH (c:Class {qualified_name: $qname})
-            SET c.source = $source,
-                c.content_hash = $hash,
-                c.lineno_start = $start,
-                c.lineno_end = $end,
-                c.docstring = $docstring
-            """,
+            _UPDATE_CLASS_QUERY,
             {
                 "qname": cls["qualified_name"],
                 "source": cls["source"],
@@ -192,44 +393,17 @@ class NodeOperationsMixin:
 
     async def delete_class_node(self, qualified_name: str) -> None:
         """Delete a class, all its methods, nested functions, class attributes, and parameters."""
+        self._forget_hashes(qualified_name)
         # Delete nested functions inside methods (and their parameters)
-        await self._write(
-            """
-            MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function)-[:CONTAINS]->(nested:Function)
-            OPTIONAL MATCH (nested)-[:HAS_PARAMETER]->(p:Parameter)
-            DETACH DELETE p, nested
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_CLASS_NESTED_FUNCTIONS_QUERY, {"qname": qualified_name})
         # Delete methods' parameters
-        await self._write(
-            """
-            MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function)-[:HAS_PARAMETER]->(p)
-            DETACH DELETE p
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_CLASS_METHOD_PARAMETERS_QUERY, {"qname": qualified_name})
         # Delete methods
-        await self._write(
-            """
-            MATCH (c:Class {qualified_name: $qname})-[:CONTAINS]->(m:Function)
-            DETACH DELETE m
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_CLASS_METHODS_QUERY, {"qname": qualified_name})
         # Delete class attributes
-        await self._write(
-            """
-            MATCH (c:Class {qualified_name: $qname})-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
-            DETACH DELETE a
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_CLASS_ATTRIBUTES_QUERY, {"qname": qualified_name})
         # Delete class
-        await self._write(
-            "MATCH (c:Class {qualified_name: $qname}) DETACH DELETE c",
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_CLASS_QUERY, {"qname": qualified_name})
 
     # ─── Class Attribute Nodes ─────────────────────────────
 
@@ -243,16 +417,7 @@ class NodeOperationsMixin:
         and plain class-level assignments (AnnAssign / Assign).
         """
         await self._write(
-            """
-            MATCH (c:Class {qualified_name: $class_qname})
-            CREATE (a:ClassAttribute {
-                name: $name,
-                type_annotation: $type_ann,
-                default_value: $default_val,
-                lineno: $lineno
-            })
-            CREATE (c)-[:HAS_ATTRIBUTE]->(a)
-            """,
+            _CREATE_CLASS_ATTRIBUTE_QUERY,
             {
                 "class_qname": class_qname,
                 "name": attr["name"],
@@ -262,16 +427,32 @@ class NodeOperationsMixin:
             },
         )
 
-    async def delete_class_attributes(self, class_qname: str) -> None:
-        """Delete all ClassAttribute nodes for a class."""
+    async def create_class_attributes_bulk(
+        self, class_qname: str, attrs: list[dict]
+    ) -> None:
+        """Create all ClassAttribute nodes for a class in one write."""
+        if not attrs:
+            return
         await self._write(
-            """
-            MATCH (c:Class {qualified_name: $qname})-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
-            DETACH DELETE a
-            """,
-            {"qname": class_qname},
+            _CREATE_CLASS_ATTRIBUTES_BULK_QUERY,
+            {
+                "class_qname": class_qname,
+                "attrs": [
+                    {
+                        "name": attr["name"],
+                        "type_ann": attr.get("type_annotation"),
+                        "default_val": attr.get("default_value"),
+                        "lineno": attr.get("lineno"),
+                    }
+                    for attr in attrs
+                ],
+            },
         )
 
+    async def delete_class_attributes(self, class_qname: str) -> None:
+        """Delete all ClassAttribute nodes for a class."""
+        await self._write(_DELETE_CLASS_ATTRIBUTES_QUERY, {"qname": class_qname})
+
     # ─── Function Nodes ────────────────────────────────────
 
     async def create_function_node(
@@ -280,7 +461,7 @@ class NodeOperationsMixin:
         func: dict,
         parent_class: str | None = None,
         parent_function: str | None = None,
-    ) -> None:
+    ) -> bool:
         """
         Create a Function node and link it to its parent.
 
@@ -288,29 +469,22 @@ class NodeOperationsMixin:
         - File (top-level function)
         - Class (method)
         - Function (nested function)
+
+        Returns False without writing if the function is already stored with
+        the same content hash and line span.
         """
+        qname = func["qualified_name"]
+        fingerprint = (func["content_hash"], func["lineno_start"], func["lineno_end"])
+        if self._hash_unchanged(qname, fingerprint):
+            return False
+
         calls = func.get("calls", [])
         is_nested = func.get("is_nested", False)
 
         if parent_function:
             # Nested function — link to parent function
             await self._write(
-                """
-                MATCH (parent:Function {qualified_name: $parent_qname})
-                MERGE (fn:Function {qualified_name: $qname})
-                SET fn.name = $name,
-                    fn.source = $source,
-                    fn.content_hash = $hash,
-                    fn.lineno_start = $start,
-                    fn.lineno_end = $end,
-                    fn.is_async = $is_async,
-                    fn.is_method = false,
-                    fn.is_nested = true,
-                    fn.docstring = $docstring,
-                    fn.return_annotation = $return_ann,
-                    fn._calls = $calls
-                MERGE (parent)-[:CONTAINS]->(fn)
-                """,
+                _CREATE_NESTED_FUNCTION_QUERY,
                 {
                     "parent_qname": parent_function,
                     "qname": func["qualified_name"],
@@ -328,22 +502,7 @@ class NodeOperationsMixin:
         elif parent_class:
             # Method — link to class
             await self._write(
-                """
-                MATCH (f:File {path: $file_path})-[:CONTAINS]->(c:Class {name: $class_name})
-                MERGE (fn:Function {qualified_name: $qname})
-                SET fn.name = $name,
-                    fn.source = $source,
-                    fn.content_hash = $hash,
-                    fn.lineno_start = $start,
-                    fn.lineno_end = $end,
-                    fn.is_async = $is_async,
-                    fn.is_method = true,
-                    fn.is_nested = false,
-                    fn.docstring = $docstring,
-                    fn.return_annotation = $return_ann,
-                    fn._calls = $calls
-                MERGE (c)-[:CONTAINS]->(fn)
-                """,
+                _CREATE_METHOD_QUERY,
                 {
                     "file_path": file_path,
                     "class_name": parent_class,
@@ -362,22 +521,7 @@ class NodeOperationsMixin:
         else:
             # Top-level function — link to file
             await self._write(
-                """
-                MATCH (f:File {path: $file_path})
-                MERGE (fn:Function {qualified_name: $qname})
-                SET fn.name = $name,
-                    fn.source = $source,
-                    fn.content_hash = $hash,
-                    fn.lineno_start = $start,
-                    fn.lineno_end = $end,
-                    fn.is_async = $is_async,
-                    fn.is_method = false,
-                    fn.is_nested = $is_nested,
-                    fn.docstring = $docstring,
-                    fn.return_annotation = $return_ann,
-                    fn._calls = $calls
-                MERGE (f)-[:CONTAINS]->(fn)
-                """,
+                _CREATE_TOP_LEVEL_FUNCTION_QUERY,
                 {
                     "file_path": file_path,
                     "qname": func["qualified_name"],
@@ -393,23 +537,94 @@ class NodeOperationsMixin:
                     "calls": calls,
                 },
             )
+        self._hash_cache[qname] = fingerprint
+        return True
+
+    async def create_functions_bulk(
+        self,
+        file_path: str,
+        functions: list[dict],
+        methods_by_class: dict[str, list[dict]] | None = None,
+    ) -> int:
+        """
+        Create every function of a file, with decorators and parameters.
+
+        Args:
+            file_path: File the functions belong to.
+            functions: Top-level functions.
+            methods_by_class: Methods keyed by the (simple) name of their class.
+
+        Nested functions are collected from ``nested_functions`` recursively.
+        Issues one write for top-level functions, one for methods, and one
+        per nesting depth, instead of several writes per function.  Functions
+        whose fingerprint is already in the hash cache are not rewritten.
+        Returns the number of Function nodes in the file (including nested).
+        """
+        methods_by_class = methods_by_class or {}
+        top_rows = [_function_row(func, None, is_method=False) for func in functions]
+        method_rows = [
+            _function_row(method, class_name, is_method=True)
+            for class_name, methods in methods_by_class.items()
+            for method in methods
+        ]
+
+        # Nested functions grouped by depth so each parent exists before its children
+        all_methods = [method for methods in methods_by_class.values() for method in methods]
+        nested_levels: list[list[dict]] = []
+        level = [
+            (nested, func["qualified_name"])
+            for func in functions + all_methods
+            for nested in func.get("nested_functions", [])
+        ]
+        while level:
+            nested_levels.append([
+                _function_row(nested, parent_qname, is_method=False, is_nested=True)
+                for nested, parent_qname in level
+            ])
+            level = [
+                (child, nested["qualified_name"])
+                for nested, _ in level
+                for child in nested.get("nested_functions", [])
+            ]
+
+        total = len(top_rows) + len(method_rows) + sum(len(rows) for rows in nested_levels)
+        top_rows = self._changed_rows(top_rows)
+        method_rows = self._changed_rows(method_rows)
+        nested_levels = [self._changed_rows(rows) for rows in nested_levels]
+
+        if top_rows:
+            await self._write(
+                _BULK_TOP_LEVEL_FUNCTIONS_QUERY,
+                {"file_path": file_path, "rows": top_rows},
+            )
+        if method_rows:
+            await self._write(
+                _BULK_METHODS_QUERY,
+                {"file_path": file_path, "rows": method_rows},
+            )
+        for rows in nested_levels:
+            if not rows:
+                continue
+            await self._write(_BULK_NESTED_FUNCTIONS_QUERY, {"rows": rows})
+
+        for rows in (top_rows, method_rows, *nested_levels):
+            for row in rows:
+                self._hash_cache[row["qname"]] = (row["hash"], row["start"], row["end"])
+        return total
+
+    def _changed_rows(self, rows: list[dict]) -> list[dict]:
+        """Drop bulk function rows whose fingerprint is already cached."""
+        return [
+            row for row in rows
+            if not self._hash_unchanged(row["qname"], (row["hash"], row["start"], row["end"]))
+        ]
 
     async def update_function_node(self, func: dict) -> None:
         """Update an existing Function node's properties in place."""
+        self._hash_cache.pop(func["qualified_name"], None)
         calls = func.get("calls", [])
         await self._write(
-            """
-            MATCH (fn:Function {qualified_name: $qname})
-            SET fn.source = $source,
-                fn.content_hash = $hash,
-                fn.lineno_start = $start,
-                fn.lineno_end = $end,
-                fn.is_async = $is_async,
-                fn.is_nested = $is_nested,
-                fn.docstring = $docstring,
-                fn.return_annotation = $return_ann,
-                fn._calls = $calls
-            """,
+            _UPDATE_FUNCTION_QUERY,
             {
                 "qname": func["qualified_name"],
                 "source": func["source"],
@@ -426,35 +641,15 @@ class NodeOperationsMixin:
 
     async def delete_function_node(self, qualified_name: str) -> None:
         """Delete a function, its nested functions, and parameters."""
+        self._forget_hashes(qualified_name)
         # Delete nested functions' parameters first
-        await self._write(
-            """
-            MATCH (fn:Function {qualified_name: $qname})-[:CONTAINS]->(nested:Function)-[:HAS_PARAMETER]->(p)
-            DETACH DELETE p
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_NESTED_FUNCTION_PARAMETERS_QUERY, {"qname": qualified_name})
         # Delete nested functions
-        await self._write(
-            """
-            MATCH (fn:Function {qualified_name: $qname})-[:CONTAINS]->(nested:Function)
-            DETACH DELETE nested
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_NESTED_FUNCTIONS_QUERY, {"qname": qualified_name})
         # Delete parameters
-        await self._write(
-            """
-            MATCH (fn:Function {qualified_name: $qname})-[:HAS_PARAMETER]->(p)
-            DETACH DELETE p
-            """,
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_PARAMETERS_QUERY, {"qname": qualified_name})
         # Delete function itself
-        await self._write(
-            "MATCH (fn:Function {qualified_name: $qname}) DETACH DELETE fn",
-            {"qname": qualified_name},
-        )
+        await self._write(_DELETE_FUNCTION_QUERY, {"qname": qualified_name})
 
     # ─── Parameter Nodes ───────────────────────────────────
 
@@ -463,17 +658,7 @@ class NodeOperationsMixin:
     ) -> None:
         """Create a Parameter node linked to its Function."""
         await self._write(
-            """
-            MATCH (fn:Function {qualified_name: $func_qname})
-            CREATE (p:Parameter {
-                name: $name,
-                type_annotation: $type_ann,
-                default_value: $default_val,
-                position: $position,
-                kind: $kind
-            })
-            CREATE (fn)-[:HAS_PARAMETER]->(p)
-            """,
+            _CREATE_PARAMETER_QUERY,
             {
                 "func_qname": function_qname,
                 "name": param["name"],
@@ -484,12 +669,67 @@ class NodeOperationsMixin:
             },
         )
 
-    async def delete_parameters(self, function_qname: str) -> None:
-        """Delete all parameter nodes for a function."""
+    async def create_parameters_bulk(
+        self, function_qname: str, params: list[dict]
+    ) -> None:
+        """Create all Parameter nodes for a function in one write."""
+        if not params:
+            return
         await self._write(
-            """
-            MATCH (fn:Function {qualified_name: $qname})-[:HAS_PARAMETER]->(p)
-            DETACH DELETE p
-            """,
-            {"qname": function_qname},
+            _CREATE_PARAMETERS_BULK_QUERY,
+            {
+                "func_qname": function_qname,
+                "params": [
+                    {
+                        "name": param["name"],
+                        "type_ann": param.get("type_annotation"),
+                        "default_val": param.get("default_value"),
+                        "position": param.get("position", 0),
+                        "kind": param.get("kind", "positional_or_keyword"),
+                    }
+                    for param in params
+                ],
+            },
         )
+
+    async def delete_parameters(self, function_qname: str) -> None:
+        """Delete all parameter nodes for a function."""
+        await self._write(_DELETE_PARAMETERS_QUERY, {"qname": function_qname})
+
+
+def _function_row(
+    func: dict,
+    parent: str | None,
+    is_method: bool,
+    is_nested: bool | None = None,
+) -> dict:
+    """Flatten a parsed function into a create_functions_bulk UNWIND row."""
+    return {
+        "parent": parent,
+        "qname": func["qualified_name"],
+        "name": func["name"],
+        "source": func["source"],
+        "hash": func["content_hash"],
+        "start": func["lineno_start"],
+        "end": func["lineno_end"],
+        "is_async": func.get("is_async", False),
+        "is_method": is_method,
+        "is_nested": func.get("is_nested", False) if is_nested is None else is_nested,
+        "docstring": func.get("docstring", ""),
+        "return_ann": func.get("return_annotation"),
+        "calls": func.get("calls", []),
+        "decorators": [
+            {"name": dec["name"], "arguments": dec.get("arguments")}
+            for dec in func.get("decorators", [])
+        ],
+        "params": [
+            {
+                "name": param["name"],
+                "type_ann": param.get("type_annotation"),
+                "default_val": param.get("default_value"),
+                "position": param.get("position", 0),
+                "kind": param.get("kind", "positional_or_keyword"),
+            }
+            for param in func.get("parameters", [])
+        ],
+    }
@@ -5,14 +5,25 @@ Read-only query methods for retrieving entity data, index state,
 node/edge counts, enrichment stats, and validation warnings.
 """
 
+import asyncio
 import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from neo4j.exceptions import ClientError
 
 logger = logging.getLogger("indexer-agent.graph_manager")
 
+# Seconds a stats result is reused; status polling collapses to one query per window
+STATS_CACHE_TTL = 5.0
+
 
 class StatsOperationsMixin:
     """Mixin providing query and statistics methods for the graph manager."""
 
+    # Cleared on the first failed apoc.meta.stats call; the scans are used after that
+    _has_apoc_meta_stats = True
+
     # ─── Query: Existing Entities for a File ───────────────
 
     async def get_file_entities(self, file_path: str) -> dict:
@@ -23,71 +34,96 @@ class StatsOperationsMixin:
         Returns classes, top-level functions, methods, nested functions,
         and class attributes so the diff is comprehensive.
         """
-        classes = await self._run(
+        # One round trip: the File is matched once and each entity kind is
+        # collected in its own subquery, so the lists never multiply
+        row = await self._run_read_single(
             """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(c:Class)
-            RETURN c.name as name, c.qualified_name as qualified_name,
-                   c.content_hash as content_hash, labels(c) as labels
+            MATCH (f:File {path: $path})
+            CALL {
+                WITH f
+                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)
+                RETURN collect(c {.name, .qualified_name, .content_hash,
+                                  labels: labels(c)}) AS classes
+            }
+            // Top-level functions (directly under file)
+            CALL {
+                WITH f
+                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
+                RETURN collect(fn {.name, .qualified_name, .content_hash,
+                                   .is_method, .is_nested}) AS functions
+            }
+            // Methods inside classes
+            CALL {
+                WITH f
+                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)-[:CONTAINS]->(m:Function)
+                RETURN collect(m {.name, .qualified_name, .content_hash,
+                                  class_name: c.name}) AS methods
+            }
+            // Nested functions (inside methods or top-level functions), as
+            // two fixed-depth expands rather than a variable-length one
+            CALL {
+                WITH f
+                CALL {
+                    WITH f
+                    MATCH (f)-[:CONTAINS]->()-[:CONTAINS]->(n:Function {is_nested: true})
+                    RETURN n
+                    UNION
+                    WITH f
+                    MATCH (f)-[:CONTAINS]->()-[:CONTAINS]->()-[:CONTAINS]->(n:Function {is_nested: true})
+                    RETURN n
+                }
+                RETURN collect(n {.name, .qualified_name, .content_hash}) AS nested_functions
+            }
+            // Class attributes
+            CALL {
+                WITH f
+                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
+                RETURN collect(a {.name, class_qname: c.qualified_name, .type_annotation,
+                                  .default_value, .lineno}) AS class_attributes
+            }
+            RETURN classes, functions, methods, nested_functions, class_attributes
             """,
             {"path": file_path},
-        )
+        ) or {}
 
-        # Top-level functions (directly under file)
-        functions = await self._run(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(fn:Function)
-            RETURN fn.name as name, fn.qualified_name as qualified_name,
-                   fn.content_hash as content_hash, fn.is_method as is_method,
-                   fn.is_nested as is_nested
-            """,
-            {"path": file_path},
-        )
-
-        # Methods inside classes
-        methods = await self._run(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(c:Class)-[:CONTAINS]->(m:Function)
-            RETURN m.name as name, m.qualified_name as qualified_name,
-                   m.content_hash as content_hash, c.name as class_name
-            """,
-            {"path": file_path},
-        )
+        return {
+            "classes": {c["qualified_name"]: c for c in row.get("classes", [])},
+            "functions": {f["qualified_name"]: f for f in row.get("functions", [])},
+            "methods": {m["qualified_name"]: m for m in row.get("methods", [])},
+            "nested_functions": {
+                n["qualified_name"]: n for n in row.get("nested_functions", [])
+            },
+            "class_attributes": row.get("class_attributes", []),
+        }
 
-        # Nested functions (inside methods or top-level functions)
-        nested_functions = await self._run(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->()-[:CONTAINS*1..2]->(n:Function {is_nested: true})
-            RETURN n.name as name, n.qualified_name as qualified_name,
-                   n.content_hash as content_hash
-            """,
-            {"path": file_path},
-        )
+    # ─── Stats Cache ───────────────────────────────────────
 
-        # Class attributes
-        class_attributes = await self._run(
-            """
-            MATCH (f:File {path: $path})-[:CONTAINS]->(c:Class)-[:HAS_ATTRIBUTE]->(a:ClassAttribute)
-            RETURN a.name as name, c.qualified_name as class_qname,
-                   a.type_annotation as type_annotation,
-                   a.default_value as default_value,
-                   a.lineno as lineno
-            """,
-            {"path": file_path},
-        )
+    async def _cached_stat(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return ``fetch()``'s result, reusing it for ``STATS_CACHE_TTL`` seconds.
 
-        return {
-            "classes": {c["qualified_name"]: c for c in classes},
-            "functions": {f["qualified_name"]: f for f in functions},
-            "methods": {m["qualified_name"]: m for m in methods},
-            "nested_functions": {n["qualified_name"]: n for n in nested_functions},
-            "class_attributes": class_attributes,
-        }
+        Concurrent callers for the same key wait on one query rather than
+        each issuing their own.
+        """
+        entry = self._stats_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        async with self._stats_locks.setdefault(key, asyncio.Lock()):
+            entry = self._stats_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            value = await fetch()
+            self._stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL, value)
+            return value
 
     # ─── Index State ───────────────────────────────────────
 
     async def get_index_state(self) -> dict | None:
         """Get the current index state."""
-        return await self._run_single("MATCH (s:IndexState) RETURN s { .* } as state")
+        return await self._cached_stat(
+            "index_state",
+            lambda: self._run_read_single("MATCH (s:IndexState) RETURN s { .* } as state"),
+        )
 
     async def update_index_state(self, **kwargs) -> None:
         """Update the index state metadata node."""
@@ -96,12 +132,40 @@ class StatsOperationsMixin:
             f"MERGE (s:IndexState) SET {props}, s.updated_at = datetime()",
             kwargs,
         )
+        # A state change marks the end of an indexing phase; counts may have moved too
+        self._stats_cache.clear()
 
     # ─── Statistics ────────────────────────────────────────
 
+    async def _meta_stats(self) -> dict | None:
+        """
+        Label and relationship-type counts from ``apoc.meta.stats``.
+
+        Read from the count store rather than by scanning the graph.
+        Returns None when APOC is not installed.
+        """
+        if not self._has_apoc_meta_stats:
+            return None
+        try:
+            return await self._run_read_single(
+                "CALL apoc.meta.stats() YIELD labels, relTypesCount "
+                "RETURN labels, relTypesCount"
+            )
+        except ClientError as e:
+            logger.info("apoc.meta.stats unavailable, counting by scan: %s", e.message)
+            self._has_apoc_meta_stats = False
+            return None
+
     async def get_node_counts(self) -> dict:
         """Get counts of each node type."""
-        result = await self._run_single(
+        return await self._cached_stat("node_counts", self._fetch_node_counts)
+
+    async def _fetch_node_counts(self) -> dict:
+        stats = await self._meta_stats()
+        if stats is not None:
+            return {label: n for label, n in (stats["labels"] or {}).items() if n}
+
+        result = await self._run_read_single(
             """
             MATCH (n)
             WITH labels(n)[0] as label, count(n) as cnt
@@ -114,7 +178,14 @@ class StatsOperationsMixin:
 
     async def get_edge_counts(self) -> dict:
         """Get counts of each relationship type."""
-        result = await self._run_single(
+        return await self._cached_stat("edge_counts", self._fetch_edge_counts)
+
+    async def _fetch_edge_counts(self) -> dict:
+        stats = await self._meta_stats()
+        if stats is not None:
+            return {rel: n for rel, n in (stats["relTypesCount"] or {}).items() if n}
+
+        result = await self._run_read_single(
             """
             MATCH ()-[r]->()
             WITH type(r) as rel_type, count(r) as cnt
@@ -127,7 +198,10 @@ class StatsOperationsMixin:
 
     async def get_enrichment_stats(self) -> dict:
         """Get enrichment coverage stats."""
-        result = await self._run_single(
+        return await self._cached_stat("enrichment_stats", self._fetch_enrichment_stats)
+
+    async def _fetch_enrichment_stats(self) -> dict:
+        result = await self._run_read_single(
             """
             MATCH (f:Function)
             WITH count(f) as total,
@@ -142,26 +216,26 @@ class StatsOperationsMixin:
         """Run validation checks and return warnings."""
         warnings = []
 
-        # Orphan nodes
-        orphans = await self._run(
-            """
-            MATCH (n)
-            WHERE (n:Function OR n:Class) AND NOT ()-[:CONTAINS]->(n)
-            RETURN n.qualified_name as qname
-            LIMIT 20
-            """
+        # Independent reads: orphan nodes and stale enrichment
+        orphans, stale = await asyncio.gather(
+            self._run_read(
+                """
+                MATCH (n)
+                WHERE (n:Function OR n:Class) AND NOT ()-[:CONTAINS]->(n)
+                RETURN n.qualified_name as qname
+                LIMIT 20
+                """
+            ),
+            self._run_read(
+                """
+                MATCH (n:Function)
+                WHERE n.enrichment_hash IS NOT NULL AND n.enrichment_hash <> n.content_hash
+                RETURN count(n) as count
+                """
+            ),
         )
         if orphans:
             warnings.append(f"Found {len(orphans)} orphan nodes: {[o['qname'] for o in orphans]}")
-
-        # Stale enrichment
-        stale = await self._run(
-            """
-            MATCH (n:Function)
-            WHERE n.enrichment_hash IS NOT NULL AND n.enrichment_hash <> n.content_hash
-            RETURN count(n) as count
-            """
-        )
         if stale and stale[0]["count"] > 0:
             warnings.append(f"{stale[0]['count']} nodes have stale enrichment")
 
@@ -122,18 +122,17 @@ async def _update_modified_function(
 
     qname = func["qualified_name"]
 
-    # Update node properties
-    await gm.update_function_node(func)
+    async with gm.transaction():
+        # Update node properties
+        await gm.update_function_node(func)
 
-    # Rebuild decorators
-    await gm.delete_decorator_edges(qname)
-    for dec in func.get("decorators", []):
-        await gm.create_decorator_edge(qname, dec, "Function")
+        # Rebuild decorators
+        await gm.delete_decorator_edges(qname, "Function")
+        await gm.create_decorator_edges_bulk(qname, func.get("decorators", []), "Function")
 
-    # Rebuild parameters (CREATE-based, must delete first)
-    await gm.delete_parameters(qname)
-    for param in func.get("parameters", []):
-        await gm.create_parameter_node(qname, param)
+        # Rebuild parameters (CREATE-based, must delete first)
+        await gm.delete_parameters(qname)
+        await gm.create_parameters_bulk(qname, func.get("parameters", []))
 
     changed_functions.append(func)
 
@@ -154,14 +153,13 @@ async def _update_modified_function(
         changed_functions.append(nested)
 
     for nested in nested_diff.modified:
-        await gm.update_function_node(nested)
         nq = nested["qualified_name"]
-        await gm.delete_decorator_edges(nq)
-        for dec in nested.get("decorators", []):
-            await gm.create_decorator_edge(nq, dec, "Function")
-        await gm.delete_parameters(nq)
-        for param in nested.get("parameters", []):
-            await gm.create_parameter_node(nq, param)
+        async with gm.transaction():
+            await gm.update_function_node(nested)
+            await gm.delete_decorator_edges(nq, "Function")
+            await gm.create_decorator_edges_bulk(nq, nested.get("decorators", []), "Function")
+            await gm.delete_parameters(nq)
+            await gm.create_parameters_bulk(nq, nested.get("parameters", []))
         changed_functions.append(nested)
 
 
@@ -180,21 +178,20 @@ async def _update_modified_class(
 
     qname = cls["qualified_name"]
 
-    # Update class properties
-    await gm.update_class_node(cls)
+    async with gm.transaction():
+        # Update class properties
+        await gm.update_class_node(cls)
 
-    # Rebuild decorators
-    await gm.delete_decorator_edges(qname)
-    for dec in cls.get("decorators", []):
-        await gm.create_decorator_edge(qname, dec, "Class")
+        # Rebuild decorators
+        await gm.delete_decorator_edges(qname, "Class")
+        await gm.create_decorator_edges_bulk(qname, cls.get("decorators", []), "Class")
 
-    # Rebuild inheritance edges
-    await _rebuild_inheritance(gm, cls)
+        # Rebuild inheritance edges
+        await _rebuild_inheritance(gm, cls)
 
-    # Rebuild class attributes (CREATE-based)
-    await gm.delete_class_attributes(qname)
-    for attr in cls.get("class_attributes", []):
-        await gm.create_class_attribute_node(qname, attr)
+        # Rebuild class attributes (CREATE-based)
+        await gm.delete_class_attributes(qname)
+        await gm.create_class_attributes_bulk(qname, cls.get("class_attributes", []))
 
     # Sub-diff methods within this class
     class_methods_existing = {
@@ -243,13 +240,14 @@ async def _enrich_entity_incremental(
     qname = entity["qualified_name"]
     content_hash = entity.get("content_hash", "")
 
-    # Check cache by content hash
+    # Check cache by content hash (the enricher's in-memory cache, then Neo4j)
     if content_hash:
-        cached = await gm.get_cached_enrichment(content_hash)
+        cached = await enricher.get_cached_enrichment(gm, content_hash)
         if cached:
-            await gm.delete_semantic_edges(qname)
-            await gm.set_enrichment(qname, cached, entity_type)
-            await gm.create_semantic_edges(qname, cached)
+            async with gm.transaction():
+                await gm.delete_semantic_edges(qname)
+                await gm.set_enrichment(qname, cached, entity_type)
+                await gm.create_semantic_edges(qname, cached)
             return "cached"
 
     # Cache miss — make LLM call
@@ -264,13 +262,17 @@ async def _enrich_entity_incremental(
 
     enrichment = await enricher.enrich_entity(entity, entity_type, context)
 
-    await gm.delete_semantic_edges(qname)
-    await gm.set_enrichment(qname, enrichment, entity_type)
-    await gm.create_semantic_edges(qname, enrichment)
+    # Replace edges, properties and the cache entry in one transaction
+    async with gm.transaction():
+        await gm.delete_semantic_edges(qname)
+        await gm.set_enrichment(qname, enrichment, entity_type)
+        await gm.create_semantic_edges(qname, enrichment)
 
-    if content_hash:
-        await gm.cache_enrichment(content_hash, enrichment)
+        if content_hash:
+            await gm.cache_enrichment(content_hash, enrichment)
 
+    if content_hash:
+        enricher.remember_enrichment(content_hash, enrichment)
     return "computed"
 
 
@@ -340,9 +342,10 @@ async def incremental_update_file(
     # 2.2 Additions
     for cls in class_diff.added:
         logger.info("Adding class: %s", cls["qualified_name"])
-        await gm.create_class_node(file_path, cls)
-        for attr in cls.get("class_attributes", []):
-            await gm.create_class_attribute_node(cls["qualified_name"], attr)
+        if await gm.create_class_node(file_path, cls):
+            await gm.create_class_attributes_bulk(
+                cls["qualified_name"], cls.get("class_attributes", [])
+            )
         for method in cls.get("methods", []):
             await _store_function(gm, file_path, method, parent_class=cls["name"])
             all_changed_functions.append(method)
@@ -383,8 +386,7 @@ async def incremental_update_file(
 
     # 3.1 Always rebuild imports (changes affect call resolution globally)
     await gm.delete_imports_for_file(file_path)
-    for imp in parsed["imports"]:
-        await gm.create_import_edge(file_path, imp)
+    await gm.create_import_edges(file_path, parsed["imports"])
     stats["imports_rebuilt"] = len(parsed["imports"])
 
     # 3.2 Re-resolve calls for added + modified functions
@@ -6,6 +6,7 @@ Used by the AST parser, graph manager, and other indexer components.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 
 @dataclass
@@ -73,6 +74,52 @@ class ParsedClass:
     methods: list[dict] = field(default_factory=list)
 
 
+# ─── Enrichment Views ──────────────────────────────────────
+
+
+class _EntityViewAccess:
+    """Read-only dict-style access so views can stand in for entity dicts."""
+
+    __slots__ = ()
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+@dataclass(slots=True)
+class FunctionView(_EntityViewAccess):
+    """A function reconstructed from graph properties for enrichment."""
+
+    source: str
+    qualified_name: str
+    content_hash: str
+    docstring: str | None
+    is_async: bool
+    decorators: list[dict]
+    parameters: list[dict]
+
+
+@dataclass(slots=True)
+class ClassView(_EntityViewAccess):
+    """A class reconstructed from graph properties for enrichment."""
+
+    source: str
+    qualified_name: str
+    content_hash: str
+    docstring: str | None
+    bases: list[str]
+    methods: list[dict]
+    class_attributes: list[dict]
+    decorators: list[dict]
+
+
+@lru_cache(maxsize=65536)
 def path_to_module(file_path: str) -> str:
     """
     Convert a file path to a Python module name.
@@ -80,6 +127,7 @@ def path_to_module(file_path: str) -> str:
          'fastapi\\__init__.py' -> 'fastapi'
 
     Handles both forward slashes and backslashes (Windows).
+    Memoized: the parser and graph writes convert the same paths repeatedly.
     """
     path = file_path.replace(".py", "")
     path = path.replace("/__init__", "").replace("\\__init__", "")
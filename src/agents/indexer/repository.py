@@ -102,32 +102,49 @@ class RepositoryManager:
         Find all Python files in the repository.
         Returns paths relative to the repo root.
         """
-        python_files = []
-
-        for root, dirs, files in os.walk(repo_path):
-            dirs[:] = [
-                d for d in dirs
-                if d not in SKIP_DIRS and not d.endswith(".egg-info")
-            ]
-
-            for filename in files:
-                if not filename.endswith(".py"):
-                    continue
-                if filename in SKIP_FILES:
-                    continue
-
-                full_path = Path(root) / filename
-                rel_path = str(full_path.relative_to(repo_path)).replace("\\", "/")
-                python_files.append(rel_path)
+        # The walk is blocking filesystem work; keep it off the event loop
+        python_files = await asyncio.to_thread(self._discover_sync, repo_path)
+        logger.info("Discovered %d Python files", len(python_files))
+        return python_files
 
+    @staticmethod
+    def _discover_sync(repo_path: Path) -> list[str]:
+        """Blocking body of discover_python_files()."""
+        # Iterative scandir walk: DirEntry type checks come from the directory
+        # listing itself, so no per-entry stat() or Path objects are needed
+        root = str(repo_path)
+        prefix_len = len(os.path.join(root, ""))
+        python_files = []
+        stack = [root]
+
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir():
+                        # Like os.walk, symlinked directories aren't followed
+                        if (
+                            name not in SKIP_DIRS
+                            and not name.endswith(".egg-info")
+                            and not entry.is_symlink()
+                        ):
+                            stack.append(entry.path)
+                    elif name.endswith(".py") and name not in SKIP_FILES:
+                        python_files.append(entry.path[prefix_len:])
+
+        if os.sep != "/":
+            python_files = [p.replace(os.sep, "/") for p in python_files]
         python_files.sort()
-        logger.info("Discovered %d Python files", len(python_files))
         return python_files
 
     async def read_file(self, repo_path: Path, file_path: str) -> str:
         """Read file contents from the cloned repo."""
         full_path = repo_path / file_path
-        return full_path.read_text(encoding="utf-8", errors="replace")
+        return await asyncio.to_thread(full_path.read_text, encoding="utf-8", errors="replace")
 
     async def read_file_from_working_dir(self, file_path: str) -> str:
         """
@@ -24,6 +24,7 @@ from datetime import datetime, timezone
 from mcp.server.fastmcp import FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 
+from src.shared.config import get_settings
 from src.shared.database import Neo4jHandler
 from src.shared.llms import get_openai_embeddings
 from src.shared.logging import setup_logging
@@ -108,6 +109,7 @@ _settings: "IndexerSettings | None" = None
 _handler: Neo4jHandler | None = None
 _gm: Neo4jGraphManager | None = None
 _parser: PythonASTParser | None = None
+_enricher: LLMEnricher | None = None
 
 
 def _get_settings() -> "IndexerSettings":
@@ -116,21 +118,50 @@ def _get_settings() -> "IndexerSettings":
     if _settings is None:
         logger.info("Initializing IndexerSettings from environment...")
         from src.agents.indexer.config import IndexerSettings
-        _settings = IndexerSettings()
+        _settings = get_settings(IndexerSettings)
         logger.info("IndexerSettings initialized")
     return _settings
 
 
+def _get_enricher() -> LLMEnricher:
+    """
+    Lazy-initialise the enricher shared by all indexing jobs.
+
+    Full-index and index_file jobs use this one instance, so its
+    in-memory enrichment cache and its RPM/TPM limits cover all the
+    traffic this process sends to the LLM.
+    """
+    global _enricher
+    if _enricher is None:
+        settings = _get_settings()
+        _enricher = LLMEnricher(
+            batch_size=settings.enrichment_batch_size,
+            use_batch_api=settings.enrichment_use_batch_api,
+            rpm=settings.enrichment_rpm,
+            tpm=settings.enrichment_tpm,
+        )
+    return _enricher
+
+
 async def _get_graph_manager() -> Neo4jGraphManager:
     """Lazy-initialise the Neo4j handler and graph manager on first use."""
     global _handler, _gm
     if _gm is None:
         logger.info("Initializing Neo4jGraphManager (first use)...")
-        _handler = Neo4jHandler()
+        # Pool size and acquisition timeout come from the NEO4J_* settings
+        _handler = Neo4jHandler(fetch_size=1000)
+        workers = _get_settings().enrichment_batch_size
+        if _handler.max_connection_pool_size < workers:
+            logger.warning(
+                "Neo4j pool size %d is below enrichment_batch_size %d; "
+                "enrichment workers will queue for connections",
+                _handler.max_connection_pool_size, workers,
+            )
         await _handler.connect()
         logger.info("Neo4jHandler connected")
         _gm = Neo4jGraphManager(_handler)
         await _gm.ensure_schema()
+        await _gm.warm_query_plans()
         logger.info("Neo4jGraphManager initialized and schema ensured")
     return _gm
 
@@ -164,17 +195,18 @@ async def _store_function(
     """
     count = 1
 
-    await gm.create_function_node(
+    written = await gm.create_function_node(
         file_path, func,
         parent_class=parent_class,
         parent_function=parent_function,
     )
 
-    for dec in func.get("decorators", []):
-        await gm.create_decorator_edge(func["qualified_name"], dec, "Function")
-
-    for param in func.get("parameters", []):
-        await gm.create_parameter_node(func["qualified_name"], param)
+    # An unchanged node already has its decorators and parameters
+    if written:
+        await gm.create_decorator_edges_bulk(
+            func["qualified_name"], func.get("decorators", []), "Function"
+        )
+        await gm.create_parameters_bulk(func["qualified_name"], func.get("parameters", []))
 
     for nested in func.get("nested_functions", []):
         count += await _store_function(
@@ -205,25 +237,25 @@ async def _store_file(
     await gm.create_file_node(file_path, parsed["file_hash"])
 
     class_count = 0
-    func_count = 0
 
     for cls in parsed["classes"]:
-        await gm.create_class_node(file_path, cls)
+        written = await gm.create_class_node(file_path, cls)
         class_count += 1
 
-        for attr in cls.get("class_attributes", []):
-            await gm.create_class_attribute_node(cls["qualified_name"], attr)
-
-        for method in cls.get("methods", []):
-            func_count += await _store_function(
-                gm, file_path, method, parent_class=cls["name"],
+        if written:
+            await gm.create_class_attributes_bulk(
+                cls["qualified_name"], cls.get("class_attributes", [])
             )
 
-    for func in parsed["functions"]:
-        func_count += await _store_function(gm, file_path, func)
+    # All functions, methods and nested functions of the file in a few writes
+    methods_by_class: dict[str, list[dict]] = {}
+    for cls in parsed["classes"]:
+        methods_by_class.setdefault(cls["name"], []).extend(cls.get("methods", []))
+    func_count = await gm.create_functions_bulk(
+        file_path, parsed["functions"], methods_by_class,
+    )
 
-    for imp in parsed["imports"]:
-        await gm.create_import_edge(file_path, imp)
+    await gm.create_import_edges(file_path, parsed["imports"])
 
     return {
         "classes": class_count,
@@ -256,6 +288,9 @@ async def _run_index_repository_job(
             logger.info("Clearing existing graph for full re-index...")
             await gm.clear_all()
             await asyncio.sleep(10)
+        else:
+            # Re-indexing into the existing graph: skip nodes that are unchanged
+            await gm.prime_hash_cache()
 
         # Steps 1-3: Clone, discover, parse
         with RepositoryManager() as repo_mgr:
@@ -325,7 +360,7 @@ async def _run_index_repository_job(
         if not skip_enrichment:
             job.progress = "Running LLM enrichment..."
             logger.info("Starting LLM enrichment...")
-            enricher = LLMEnricher()
+            enricher = _get_enricher()
 
             async def update_enrichment_progress(message: str):
                 job.progress = message
@@ -423,7 +458,7 @@ async def _run_index_file_job(
             return
 
         job.progress = f"Running incremental update for {file_path}..."
-        enricher = LLMEnricher() if not skip_enrichment else None
+        enricher = _get_enricher() if not skip_enrichment else None
         stats = await incremental_update_file(
             gm, enricher, file_path, parsed,
             skip_enrichment=skip_enrichment,
@@ -24,6 +24,7 @@ from langgraph.checkpoint.memory import MemorySaver
 
 from src.agents.orchestrator.config import OrchestratorSettings
 from src.agents.response_formatter.format import ResponseFormatter
+from src.shared.config import get_settings
 from src.shared.llms.models import get_openai_model
 from src.shared.logging import setup_logging
 
@@ -129,7 +130,7 @@ class OrchestratorAgent:
             settings: Optional settings override.  Falls back to env vars.
         """
         logger.info("Creating OrchestratorAgent...")
-        settings = settings or OrchestratorSettings()
+        settings = settings or get_settings(OrchestratorSettings)
         logger.info("Using orchestrator model: %s", settings.orchestrator_model)
 
         # Connect to the Orchestrator MCP server over stdio
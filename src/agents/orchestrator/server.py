@@ -18,6 +18,7 @@ from src.agents.orchestrator.context_manager import ContextManager
 from src.agents.orchestrator.query_analyzer import QueryAnalyzer
 from src.agents.orchestrator.router import AgentRouter
 from src.agents.orchestrator.synthesizer import ResponseSynthesizer
+from src.shared.config import get_settings
 from src.shared.logging import setup_logging
 from src.shared.observability import (
     init_langfuse,
@@ -67,7 +68,7 @@ def _get_settings() -> OrchestratorSettings:
     global _settings
     if _settings is None:
         logger.info("Initializing OrchestratorSettings from environment...")
-        _settings = OrchestratorSettings()
+        _settings = get_settings(OrchestratorSettings)
         logger.info("OrchestratorSettings initialized")
     return _settings
 
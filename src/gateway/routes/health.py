@@ -2,17 +2,36 @@
 Health routes — GET /api/health and GET /api/graph/statistics.
 """
 
+import asyncio
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from src.agents.indexer.agent import IndexerAgent
 from src.shared.logging import setup_logging
 
 logger = setup_logging("gateway.routes.health", level="INFO")
 
 router = APIRouter()
 
+# Process-wide indexer agent (lazy initialization)
+_indexer_agent: IndexerAgent | None = None
+_indexer_agent_lock = asyncio.Lock()
+
+
+async def _get_indexer_agent() -> IndexerAgent:
+    """Create the IndexerAgent once and reuse it for the process lifetime."""
+    global _indexer_agent
+
+    if _indexer_agent is None:
+        async with _indexer_agent_lock:
+            if _indexer_agent is None:
+                logger.info("Initializing IndexerAgent (first use)")
+                _indexer_agent = await IndexerAgent.create()
+
+    return _indexer_agent
+
 
 class GraphStatistics(BaseModel):
     """Response model for GET /api/graph/statistics."""
@@ -36,6 +55,32 @@ class GraphStatistics(BaseModel):
     )
 
 
+# Placeholder statistics, built once and shared by every request
+_MOCK_GRAPH_STATISTICS = GraphStatistics(
+    node_counts={
+        "Module": 0,
+        "Class": 0,
+        "Function": 0,
+        "Method": 0,
+        "Parameter": 0,
+        "Decorator": 0,
+    },
+    edge_counts={
+        "CONTAINS": 0,
+        "IMPORTS": 0,
+        "CALLS": 0,
+        "INHERITS_FROM": 0,
+        "DECORATED_BY": 0,
+        "HAS_PARAMETER": 0,
+    },
+    total_nodes=0,
+    total_edges=0,
+    enrichment_coverage=0.0,
+    embedding_coverage=0.0,
+    last_indexed=None,
+)
+
+
 # ─── GET /api/graph/statistics ──────────────────────────────
 
 
@@ -56,10 +101,7 @@ async def get_graph_statistics() -> GraphStatistics:
     logger.info("Fetching graph statistics")
 
     try:
-        # Get indexer client to query graph stats
-        from src.agents.indexer.agent import IndexerAgent
-
-        indexer = await IndexerAgent.create()
+        indexer = await _get_indexer_agent()
 
         # Use the get_index_status tool to fetch graph statistics
         result = await indexer.invoke(
@@ -72,29 +114,7 @@ async def get_graph_statistics() -> GraphStatistics:
 
         logger.warning("Using mock graph statistics - implement proper stats query")
 
-        return GraphStatistics(
-            node_counts={
-                "Module": 0,
-                "Class": 0,
-                "Function": 0,
-                "Method": 0,
-                "Parameter": 0,
-                "Decorator": 0,
-            },
-            edge_counts={
-                "CONTAINS": 0,
-                "IMPORTS": 0,
-                "CALLS": 0,
-                "INHERITS_FROM": 0,
-                "DECORATED_BY": 0,
-                "HAS_PARAMETER": 0,
-            },
-            total_nodes=0,
-            total_edges=0,
-            enrichment_coverage=0.0,
-            embedding_coverage=0.0,
-            last_indexed=None,
-        )
+        return _MOCK_GRAPH_STATISTICS
 
     except Exception as e:
         logger.exception(f"Error fetching graph statistics: {e}")
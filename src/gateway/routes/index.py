@@ -2,8 +2,12 @@
 Index routes — POST /api/index and GET /api/index/status/{job_id}.
 """
 
+import asyncio
 import json
 import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
@@ -20,6 +24,10 @@ router = APIRouter()
 # Global indexer client (lazy initialization)
 _indexer_client: MultiServerMCPClient | None = None
 
+# Indexer tools keyed by name (lazy initialization, static for the client lifetime)
+_indexer_tools_by_name: dict[str, Any] | None = None
+_indexer_tools_lock = asyncio.Lock()
+
 
 async def _get_indexer_client() -> MultiServerMCPClient:
     """Lazy initialization of the Indexer MCP client."""
@@ -38,13 +46,26 @@ async def _get_indexer_client() -> MultiServerMCPClient:
     return _indexer_client
 
 
+async def _get_indexer_tools() -> dict[str, Any]:
+    """Fetch the Indexer tool set once and index it by tool name."""
+    global _indexer_tools_by_name
+
+    if _indexer_tools_by_name is None:
+        async with _indexer_tools_lock:
+            if _indexer_tools_by_name is None:
+                client = await _get_indexer_client()
+                tools = await client.get_tools()
+                _indexer_tools_by_name = {t.name: t for t in tools}
+                logger.info(f"Loaded {len(_indexer_tools_by_name)} indexer tools")
+
+    return _indexer_tools_by_name
+
+
 @observe(name="call_indexer_tool", as_type="span")
 async def _call_indexer_tool(tool_name: str, **kwargs) -> dict:
     """Call an indexer tool and return parsed JSON result."""
     try:
-        client = await _get_indexer_client()
-        tools = await client.get_tools()
-        tool = next((t for t in tools if t.name == tool_name), None)
+        tool = (await _get_indexer_tools()).get(tool_name)
 
         if not tool:
             raise HTTPException(
@@ -75,6 +96,54 @@ async def _call_indexer_tool(tool_name: str, **kwargs) -> dict:
         )
 
 
+# ─── Gateway Job Tracking ───────────────────────────────────
+
+
+@dataclass
+class GatewayIndexJob:
+    """Tracks an indexing request until the indexer has accepted it."""
+
+    job_id: str
+    status: str = "pending"           # pending -> submitted | failed
+    indexer_job_id: str | None = None
+    error: str | None = None
+
+
+# Most recent jobs kept per gateway process; older entries are evicted so
+# the map stays bounded.  State is in-process only: another gateway replica
+# (or a restart) cannot see these jobs and forwards their id to the indexer.
+MAX_TRACKED_JOBS = 1000
+
+_index_jobs: OrderedDict[str, GatewayIndexJob] = OrderedDict()
+
+
+def _track_job(job: GatewayIndexJob) -> None:
+    """Record a gateway job, evicting the oldest beyond ``MAX_TRACKED_JOBS``."""
+    _index_jobs[job.job_id] = job
+    while len(_index_jobs) > MAX_TRACKED_JOBS:
+        _index_jobs.popitem(last=False)
+
+
+async def _submit_index_job(job: GatewayIndexJob, **kwargs) -> None:
+    """Submit an indexing job to the indexer and record its job_id.
+
+    Runs as a background task after the HTTP response has been sent.
+    """
+    try:
+        result = await _call_indexer_tool("index_repository", **kwargs)
+        job.indexer_job_id = result.get("job_id")
+        job.status = "submitted"
+        logger.info(
+            f"Indexing job submitted: job_id={job.job_id}, "
+            f"indexer_job_id={job.indexer_job_id}"
+        )
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Failed to submit indexing job {job.job_id}: {detail}")
+        job.status = "failed"
+        job.error = detail
+
+
 # ─── Request/Response Models ────────────────────────────────
 
 
@@ -153,7 +222,8 @@ async def trigger_indexing(
     - Only updates changed files
     - Preserves enrichment on unchanged entities
 
-    Returns a job_id that can be used to track progress via
+    The indexer is called in a background task, so this returns
+    immediately with a job_id that can be used to track progress via
     GET /api/index/status/{job_id}.
     """
     logger.info(
@@ -172,9 +242,14 @@ async def trigger_indexing(
                        "Use full indexing for now."
             )
 
-        # Trigger full repository indexing
-        result = await _call_indexer_tool(
-            "index_repository",
+        # Queue full repository indexing; the indexer is called after
+        # the response has been sent so the request returns immediately.
+        job = GatewayIndexJob(job_id=uuid.uuid4().hex[:12])
+        _track_job(job)
+
+        background_tasks.add_task(
+            _submit_index_job,
+            job,
             repository_url=request.repository_url,
             repository_name=request.repository_name or "",
             clear_graph=request.clear_graph,
@@ -182,16 +257,12 @@ async def trigger_indexing(
             create_embeddings=request.create_embeddings,
         )
 
-        job_id = result.get("job_id", "unknown")
-        status = result.get("status", "pending")
-        message = result.get("message", "Indexing job started")
-
-        logger.info(f"Indexing job created: job_id={job_id}, status={status}")
+        logger.info(f"Indexing job queued: job_id={job.job_id}")
 
         return IndexResponse(
-            job_id=job_id,
-            status=status,
-            message=message,
+            job_id=job.job_id,
+            status=job.status,
+            message="Indexing job queued",
         )
 
     except HTTPException:
@@ -234,9 +305,21 @@ async def get_indexing_status(job_id: str) -> IndexStatusResponse:
     logger.info(f"Checking status for job_id={job_id}")
 
     try:
+        job = _index_jobs.get(job_id)
+
+        # Not yet accepted by the indexer: report the gateway-side state
+        if job is not None and job.indexer_job_id is None:
+            logger.info(f"Job {job_id} status: {job.status} (not yet submitted)")
+            return IndexStatusResponse.model_construct(
+                job_id=job_id,
+                status=job.status,
+                progress={"message": "Waiting for indexer"} if job.error is None else {},
+                error=job.error,
+            )
+
         result = await _call_indexer_tool(
             "get_index_status",
-            job_id=job_id,
+            job_id=job.indexer_job_id if job is not None else job_id,
         )
 
         status = result.get("status", "unknown")
@@ -250,7 +333,9 @@ async def get_indexing_status(job_id: str) -> IndexStatusResponse:
 
         logger.info(f"Job {job_id} status: {status}")
 
-        return IndexStatusResponse(
+        # Polled frequently by UIs: skip construction-time validation,
+        # the response_model still validates on serialization.
+        return IndexStatusResponse.model_construct(
             job_id=job_id,
             status=status,
             progress=progress,
@@ -5,6 +5,9 @@ Uses Pydantic Settings for environment-based configuration.
 Each agent extends BaseAgentSettings with its own prefix.
 """
 
+from functools import lru_cache
+from typing import TypeVar
+
 from pydantic_settings import BaseSettings
 
 
@@ -34,3 +37,17 @@ class BaseAgentSettings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"
+
+
+SettingsT = TypeVar("SettingsT", bound=BaseAgentSettings)
+
+
+@lru_cache(maxsize=None)
+def get_settings(settings_cls: type[SettingsT] = BaseAgentSettings) -> SettingsT:
+    """
+    Return the process-wide instance of a settings class.
+
+    The environment and ``.env`` are read once per class, so servers and
+    agents that need settings share one validated instance.
+    """
+    return settings_cls()
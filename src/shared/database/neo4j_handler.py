@@ -6,17 +6,40 @@ Reads credentials from environment variables and exposes an async driver
 that can be shared across the application (graph manager, enricher, etc.).
 """
 
+import asyncio
 import os
 import logging
-from typing import Any
+from importlib.util import find_spec
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from dotenv import load_dotenv
-from neo4j import AsyncGraphDatabase, AsyncDriver
+from neo4j import (
+    AsyncDriver,
+    AsyncGraphDatabase,
+    AsyncSession,
+    AsyncTransaction,
+    RoutingControl,
+)
 
 load_dotenv()
 
 logger = logging.getLogger("graphical-rag.neo4j_handler")
 
+DEFAULT_MAX_CONNECTION_POOL_SIZE = 50
+DEFAULT_CONNECTION_ACQUISITION_TIMEOUT = 60.0
+DEFAULT_MAX_CONNECTION_LIFETIME = 3600.0
+# Connections opened at connect() so the first burst of queries skips the handshake
+WARM_CONNECTIONS = 8
+
+
+def _rust_codec_available() -> bool:
+    """True when neo4j-rust-ext is installed and the driver uses its codec."""
+    try:
+        return find_spec("neo4j._rust") is not None
+    except ModuleNotFoundError:
+        return False
+
 
 class Neo4jHandler:
     """
@@ -41,11 +64,40 @@ class Neo4jHandler:
         username: str | None = None,
         password: str | None = None,
         database: str | None = None,
+        max_connection_pool_size: int | None = None,
+        connection_acquisition_timeout: float | None = None,
+        max_connection_lifetime: float | None = None,
+        **driver_config: Any,
     ):
+        """
+        Args:
+            uri, username, password, database: Connection settings; each
+                falls back to the matching ``NEO4J_*`` environment variable.
+            max_connection_pool_size: Connections the driver may open
+                (``NEO4J_MAX_CONNECTION_POOL_SIZE``, default 50).
+            connection_acquisition_timeout: Seconds to wait for a free pooled
+                connection (``NEO4J_CONNECTION_ACQUISITION_TIMEOUT``, default 60).
+            max_connection_lifetime: Seconds before a pooled connection is
+                retired (``NEO4J_MAX_CONNECTION_LIFETIME``, default 3600).
+            **driver_config: Extra driver configuration passed through to
+                ``AsyncGraphDatabase.driver`` (e.g. ``fetch_size``).
+        """
         self._uri = uri or os.getenv("NEO4J_URI")
         self._username = username or os.getenv("NEO4J_USERNAME")
         self._password = password or os.getenv("NEO4J_PASSWORD")
         self._database = database or os.getenv("NEO4J_DATABASE", "neo4j")
+        self._max_connection_pool_size = max_connection_pool_size or int(
+            os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", DEFAULT_MAX_CONNECTION_POOL_SIZE)
+        )
+        self._connection_acquisition_timeout = connection_acquisition_timeout or float(
+            os.getenv(
+                "NEO4J_CONNECTION_ACQUISITION_TIMEOUT", DEFAULT_CONNECTION_ACQUISITION_TIMEOUT
+            )
+        )
+        self._max_connection_lifetime = max_connection_lifetime or float(
+            os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", DEFAULT_MAX_CONNECTION_LIFETIME)
+        )
+        self._driver_config = {"keep_alive": True, **driver_config}
         self._driver: AsyncDriver | None = None
 
         if not self._uri:
@@ -70,16 +122,42 @@ class Neo4jHandler:
             return self
 
         self._driver = AsyncGraphDatabase.driver(
-            self._uri, auth=(self._username, self._password)
+            self._uri,
+            auth=(self._username, self._password),
+            max_connection_pool_size=self._max_connection_pool_size,
+            connection_acquisition_timeout=self._connection_acquisition_timeout,
+            max_connection_lifetime=self._max_connection_lifetime,
+            **self._driver_config,
         )
         try:
             await self._driver.verify_connectivity()
-            logger.info("Connected to Neo4j at %s (db=%s)", self._uri, self._database)
+            logger.info(
+                "Connected to Neo4j at %s (db=%s, pool_size=%d, acquisition_timeout=%.0fs)",
+                self._uri,
+                self._database,
+                self._max_connection_pool_size,
+                self._connection_acquisition_timeout,
+            )
+            if not _rust_codec_available():
+                logger.info(
+                    "neo4j-rust-ext not installed; using the pure-Python PackStream codec"
+                )
         except Exception:
             logger.error("Failed to connect to Neo4j at %s", self._uri)
             raise
+        await self._warm_pool(min(self._max_connection_pool_size, WARM_CONNECTIONS))
         return self
 
+    async def _warm_pool(self, connections: int) -> None:
+        """Open ``connections`` pooled connections with concurrent trivial queries."""
+        results = await asyncio.gather(
+            *(self.run("RETURN 1") for _ in range(connections)),
+            return_exceptions=True,
+        )
+        failed = sum(isinstance(r, Exception) for r in results)
+        if failed:
+            logger.warning("Connection pool warm-up: %d/%d queries failed", failed, connections)
+
     async def close(self) -> None:
         """Close the underlying driver."""
         if self._driver:
@@ -96,6 +174,16 @@ class Neo4jHandler:
 
     # ─── Properties ─────────────────────────────────────────
 
+    @property
+    def max_connection_pool_size(self) -> int:
+        """Maximum number of pooled connections the driver may open."""
+        return self._max_connection_pool_size
+
+    @property
+    def connection_acquisition_timeout(self) -> float:
+        """Seconds a query waits for a free pooled connection."""
+        return self._connection_acquisition_timeout
+
     @property
     def driver(self) -> AsyncDriver:
         """Return the raw async driver (for code that needs direct access).
@@ -125,6 +213,54 @@ class Neo4jHandler:
         """Return the configured Neo4j username."""
         return self._username
 
+    # ─── Sessions & Transactions ────────────────────────────
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Open a session on the configured database.
+
+        Lets a caller run several queries without paying session setup
+        per query.  Sessions share the driver's ``execute_query`` bookmark
+        manager, so reads routed through ``run_read`` observe the writes
+        committed here even when they land on a cluster follower.
+
+        Raises:
+            RuntimeError: If handler is not connected (call connect() first).
+        """
+        driver = self.driver
+        async with driver.session(
+            database=self._database,
+            bookmark_manager=driver.execute_query_bookmark_manager,
+        ) as session:
+            yield session
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncTransaction]:
+        """Open an explicit transaction, committed once when the block exits.
+
+        The transaction is rolled back if the block raises.
+
+        Usage::
+
+            async with handler.transaction() as tx:
+                await tx.run("MATCH (n {id: $id}) DETACH DELETE n", {"id": 1})
+                await tx.run("CREATE (:Marker)")
+
+        Raises:
+            RuntimeError: If handler is not connected (call connect() first).
+        """
+        async with self.session() as session:
+            tx = await session.begin_transaction()
+            try:
+                yield tx
+            except BaseException:
+                await tx.rollback()
+                raise
+            else:
+                await tx.commit()
+            finally:
+                await tx.close()
+
     # ─── Convenience Query Helpers ──────────────────────────
 
     async def run(self, query: str, params: dict[str, Any] | None = None) -> list[dict]:
@@ -141,10 +277,36 @@ class Neo4jHandler:
             RuntimeError: If handler is not connected (call connect() first).
             Exception: If query execution fails (invalid syntax, database error, etc.).
         """
-        async with self.driver.session(database=self._database) as session:
+        async with self.session() as session:
             result = await session.run(query, params or {})
             return [record.data() async for record in result]
 
+    async def stream(
+        self, query: str, params: dict[str, Any] | None = None
+    ) -> AsyncIterator[dict]:
+        """Execute a Cypher query and yield result records as dicts.
+
+        Records are pulled from the server in ``fetch_size`` batches as the
+        caller iterates, so large results are never held as one list.
+        Iterate to the end (or break out of an ``async for``) so the
+        session is released.
+
+        Args:
+            query: Cypher query string.
+            params: Optional query parameters.
+
+        Yields:
+            Result records as dictionaries.
+
+        Raises:
+            RuntimeError: If handler is not connected (call connect() first).
+            Exception: If query execution fails (invalid syntax, database error, etc.).
+        """
+        async with self.session() as session:
+            result = await session.run(query, params or {})
+            async for record in result:
+                yield record.data()
+
     async def run_single(self, query: str, params: dict[str, Any] | None = None) -> dict | None:
         """Execute a Cypher query and return the first result, or None.
 
@@ -162,6 +324,34 @@ class Neo4jHandler:
         results = await self.run(query, params)
         return results[0] if results else None
 
+    async def run_read(self, query: str, params: dict[str, Any] | None = None) -> list[dict]:
+        """Execute a read-only Cypher query routed to a reader.
+
+        In a cluster the query goes to a follower or read replica, keeping
+        the leader free for writes.  On a single instance it behaves like
+        ``run``.  Every session opened by this handler feeds the same
+        bookmark manager ``execute_query`` uses, so reads observe all
+        earlier writes made through the handler.
+
+        Args:
+            query: Cypher query string (must not write).
+            params: Optional query parameters.
+
+        Returns:
+            List of result records as dictionaries.
+
+        Raises:
+            RuntimeError: If handler is not connected (call connect() first).
+            Exception: If query execution fails (invalid syntax, database error, etc.).
+        """
+        records, _summary, _keys = await self.driver.execute_query(
+            query,
+            params or {},
+            database_=self._database,
+            routing_=RoutingControl.READ,
+        )
+        return [record.data() for record in records]
+
     async def write(self, query: str, params: dict[str, Any] | None = None) -> None:
         """Execute a write transaction (no return value).
 
@@ -173,9 +363,52 @@ class Neo4jHandler:
             RuntimeError: If handler is not connected (call connect() first).
             Exception: If write operation fails (constraint violations, syntax errors, etc.).
         """
-        async with self.driver.session(database=self._database) as session:
+        async with self.session() as session:
             await session.run(query, params or {})
 
+    async def run_autocommit(
+        self, query: str, params: dict[str, Any] | None = None
+    ) -> list[dict]:
+        """Execute a query in an implicit (auto-commit) transaction.
+
+        Required for ``CALL { ... } IN TRANSACTIONS``, which the server
+        rejects inside an explicit or managed transaction.
+
+        Args:
+            query: Cypher query string.
+            params: Optional query parameters.
+
+        Returns:
+            List of result records as dictionaries.
+
+        Raises:
+            RuntimeError: If handler is not connected (call connect() first).
+            Exception: If query execution fails (invalid syntax, database error, etc.).
+        """
+        async with self.session() as session:
+            result = await session.run(query, params or {})
+            return [record.data() async for record in result]
+
+    async def write_in_transaction(
+        self, statements: list[tuple[str, dict[str, Any] | None]]
+    ) -> None:
+        """Execute several write statements in one transaction (one commit).
+
+        Args:
+            statements: ``(query, params)`` pairs, run in order.
+
+        Raises:
+            RuntimeError: If handler is not connected (call connect() first).
+            Exception: If any statement fails; the whole transaction is rolled back.
+        """
+        async def _work(tx) -> None:
+            for query, params in statements:
+                result = await tx.run(query, params or {})
+                await result.consume()
+
+        async with self.session() as session:
+            await session.execute_write(_work)
+
     async def verify(self) -> bool:
         """Quick health-check: returns True if the database is reachable."""
         try:
@@ -4,10 +4,12 @@ from .models import (
     get_openai_embeddings,
     get_enrichment_model,
 )
+from .rate_limit import CreditSemaphore
 
 __all__ = [
     "get_openai_model",
     "get_openai_mini_model",
     "get_openai_embeddings",
     "get_enrichment_model",
+    "CreditSemaphore",
 ]
@@ -1,5 +1,6 @@
 import os
 import logging
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
@@ -12,35 +13,41 @@ logger = logging.getLogger(__name__)
 
 # ─── LLM Model Factories ─────────────────────────────────
 
+# Clients are cached per model name so every caller shares one instance
+# (and its HTTP connection pool) instead of building a new one per call.
 
-def get_openai_model(model_name: str | None = None) -> ChatOpenAI:
-    actual_model = model_name or os.getenv("DEFAULT_MODEL", "gpt-5.2-2025-12-11")
-    logger.info("Creating ChatOpenAI model: %s", actual_model)
+
+@lru_cache(maxsize=8)
+def _chat_model(model: str) -> ChatOpenAI:
+    logger.info("Creating ChatOpenAI model: %s", model)
     return ChatOpenAI(
-        model=actual_model,
+        model=model,
         api_key=os.getenv("OPENAI_API_KEY"),
     )
 
 
-def get_openai_mini_model(model_name: str | None = None) -> ChatOpenAI:
-    actual_model = model_name or os.getenv("DEFAULT_MINI_MODEL", "gpt-5-mini-2025-08-07")
-    logger.info("Creating ChatOpenAI mini model: %s", actual_model)
-    return ChatOpenAI(
-        model=actual_model,
+@lru_cache(maxsize=8)
+def _embeddings_model(model: str) -> OpenAIEmbeddings:
+    logger.info("Creating OpenAIEmbeddings model: %s", model)
+    return OpenAIEmbeddings(
+        model=model,
         api_key=os.getenv("OPENAI_API_KEY"),
     )
 
 
+def get_openai_model(model_name: str | None = None) -> ChatOpenAI:
+    return _chat_model(model_name or os.getenv("DEFAULT_MODEL", "gpt-5.2-2025-12-11"))
+
+
+def get_openai_mini_model(model_name: str | None = None) -> ChatOpenAI:
+    return _chat_model(model_name or os.getenv("DEFAULT_MINI_MODEL", "gpt-5-mini-2025-08-07"))
+
+
 def get_openai_embeddings(model_name: str | None = None) -> OpenAIEmbeddings:
-    return OpenAIEmbeddings(
-        model=model_name or os.getenv("DEFAULT_EMBEDDING_MODEL", "text-embedding-3-large"),
-        api_key=os.getenv("OPENAI_API_KEY"),
+    return _embeddings_model(
+        model_name or os.getenv("DEFAULT_EMBEDDING_MODEL", "text-embedding-3-large")
     )
 
+
 def get_enrichment_model(model_name: str | None = None) -> ChatOpenAI:
-    actual_model = model_name or os.getenv("ENRICHMENT_MODEL", "gpt-5-mini-2025-08-07")
-    logger.info("Creating enrichment model: %s", actual_model)
-    return ChatOpenAI(
-        model=actual_model,
-        api_key=os.getenv("OPENAI_API_KEY"),
-    )
\ No newline at end of file
+    return _chat_model(model_name or os.getenv("ENRICHMENT_MODEL", "gpt-5-mini-2025-08-07"))
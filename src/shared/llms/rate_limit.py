@@ -0,0 +1,73 @@
+"""
+Credit-based rate limiting for LLM provider calls.
+
+Provider limits are expressed as "N requests / tokens per minute" rather
+than "N in flight", so a plain semaphore lets concurrent callers burst
+straight into 429s.  A CreditSemaphore instead hands out credits that are
+only returned once the provider's window has elapsed.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class CreditSemaphore:
+    """
+    Semaphore whose credits are refunded ``refund_time`` seconds after use.
+
+    Example: ``CreditSemaphore(capacity=500, refund_time=60.0)`` allows at
+    most 500 credits to be spent in any 60-second window.
+    """
+
+    def __init__(self, capacity: int, refund_time: float = 60.0):
+        self._capacity = capacity
+        self._credits = capacity
+        self._refund_time = refund_time
+        self._condition = asyncio.Condition()
+
+    @property
+    def available(self) -> int:
+        """Credits that can be spent right now."""
+        return self._credits
+
+    async def acquire(self, credits: int = 1, refund_time: float | None = None) -> None:
+        """
+        Wait until ``credits`` are available and spend them.
+
+        Requests larger than the capacity are clamped to it, so a single
+        oversized call waits for a full window instead of blocking forever.
+        """
+        credits = min(credits, self._capacity)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._credits >= credits)
+            self._credits -= credits
+
+        delay = self._refund_time if refund_time is None else refund_time
+        asyncio.get_running_loop().call_later(delay, self._schedule_refund, credits)
+
+    async def transact(
+        self,
+        coro: Awaitable[Any],
+        credits: int = 1,
+        refund_time: float | None = None,
+    ) -> Any:
+        """Spend ``credits`` and then await ``coro``."""
+        try:
+            await self.acquire(credits, refund_time)
+        except BaseException:
+            # The coroutine will never run; close it to avoid a "never awaited" warning
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise
+        return await coro
+
+    def _schedule_refund(self, credits: int) -> None:
+        asyncio.ensure_future(self._refund(credits))
+
+    async def _refund(self, credits: int) -> None:
+        async with self._condition:
+            self._credits += credits
+            self._condition.notify_all()
@@ -6,13 +6,21 @@ so that requests can be traced across agent boundaries.
 """
 
 import logging
-import uuid
+import secrets
+
+# Third-party loggers that emit a record per request / Bolt message
+_QUIET_LOGGERS = ("neo4j.io", "httpx")
+
+_configured = False
 
 
 def setup_logging(agent_name: str, level: str = "INFO") -> logging.Logger:
     """
     Configure structured logging for an agent.
 
+    The root logger is configured once per process; later calls (one per
+    importing module) only return the named logger.
+
     Args:
         agent_name: Name of the agent (used as logger prefix).
         level: Log level string (e.g. 'INFO', 'DEBUG').
@@ -20,13 +28,19 @@ def setup_logging(agent_name: str, level: str = "INFO") -> logging.Logger:
     Returns:
         Configured logger instance.
     """
-    logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
-        format="%(asctime)s  %(name)-30s  %(levelname)-7s  %(message)s",
-    )
+    global _configured
+    if not _configured:
+        logging.basicConfig(
+            level=getattr(logging, level.upper(), logging.INFO),
+            format="%(asctime)s  %(name)-30s  %(levelname)-7s  %(message)s",
+            datefmt="%Y-%m-%dT%H:%M:%S",
+        )
+        for name in _QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        _configured = True
     return logging.getLogger(agent_name)
 
 
 def generate_correlation_id() -> str:
     """Generate a unique correlation ID for request tracing across agents."""
-    return uuid.uuid4().hex[:12]
+    return secrets.token_hex(6)
@@ -5,17 +5,24 @@ Provides tracing and observation for all API requests.
 Only activates when LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY are provided in .env
 """
 
+import contextvars
 import functools
+import logging
 import os
-from contextlib import asynccontextmanager
-from typing import Any, Callable, Optional
-
-from fastapi import Request, Response
-from langfuse import Langfuse, get_client, observe
-from opentelemetry import trace
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional
+from urllib.parse import parse_qsl
+
+from langfuse import Langfuse, observe
+from opentelemetry import baggage, trace
 from opentelemetry.baggage.propagation import W3CBaggagePropagator
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.shared.logging import setup_logging
 
@@ -25,6 +32,39 @@ logger = setup_logging("shared.observability", level="INFO")
 _langfuse_client: Optional[Langfuse] = None
 _langfuse_enabled: bool = False
 
+# Trace updates are handed to a daemon thread so the SDK's CPU and network
+# work stays off the request path.  Each entry carries the caller's context
+# so the update still lands on the span that was current when it was queued.
+TRACE_BATCH_SIZE = 64
+TRACE_FLUSH_INTERVAL = 5.0
+_TRACE_DRAIN_TIMEOUT = 0.5
+_TRACE_SHUTDOWN_TIMEOUT = 5.0
+_STOP = object()
+
+_trace_queue: queue.SimpleQueue = queue.SimpleQueue()
+_worker: Optional[threading.Thread] = None
+
+# Stateless, so one instance of each serves every propagation call
+_TRACE_PROP = TraceContextTextMapPropagator()
+_BAG_PROP = W3CBaggagePropagator()
+
+# Only these headers are copied into traces; cookies and auth tokens are
+# both the bulk of a typical header block and something traces shouldn't hold
+_TRACE_HDR_KEYS = frozenset({
+    "user-agent",
+    "x-user-id",
+    "x-request-id",
+    "content-type",
+    "content-length",
+    "host",
+    "referer",
+})
+
+# Size caps on traced payloads, so one oversized request or LLM response
+# can't bloat the trace queue or the ingestion backend
+_MAX_VALUE_BYTES = 2048
+_MAX_OUTPUT_CHARS = 64 * 1024
+
 
 def init_langfuse() -> Optional[Langfuse]:
     """
@@ -35,33 +75,46 @@ def init_langfuse() -> Optional[Langfuse]:
     - LANGFUSE_SECRET_KEY
     - LANGFUSE_HOST (optional, defaults to https://cloud.langfuse.com)
 
+    Safe to call repeatedly: the client is built once and reused until
+    shutdown_langfuse() discards it.
+
     Returns:
         Langfuse client if initialized, None otherwise
     """
     global _langfuse_client, _langfuse_enabled
 
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
-    host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
+    _langfuse_client = _build_langfuse()
+    _langfuse_enabled = _langfuse_client is not None
+    if _langfuse_enabled:
+        _start_trace_worker()
+    return _langfuse_client
+
+
+@functools.cache
+def _build_langfuse() -> Optional[Langfuse]:
+    """Build the Langfuse client from the environment (once)."""
+    env = os.environ
+    public_key = env.get("LANGFUSE_PUBLIC_KEY")
+    secret_key = env.get("LANGFUSE_SECRET_KEY")
+    host = env.get("LANGFUSE_HOST", "https://cloud.langfuse.com")
 
     if not public_key or not secret_key:
         logger.info("Langfuse not configured - observability disabled")
-        _langfuse_enabled = False
         return None
 
     try:
-        _langfuse_client = Langfuse(
+        # Also registered as the SDK's contextual client, so every helper
+        # below reuses this instance rather than looking it up per call
+        client = Langfuse(
             public_key=public_key,
             secret_key=secret_key,
             host=host,
         )
-        _langfuse_enabled = True
         logger.info(f"Langfuse initialized successfully - host: {host}")
-        return _langfuse_client
+        return client
 
     except Exception as e:
         logger.error(f"Failed to initialize Langfuse: {e}")
-        _langfuse_enabled = False
         return None
 
 
@@ -76,22 +129,139 @@ def get_langfuse_client() -> Optional[Langfuse]:
 
 
 def shutdown_langfuse():
-    """Flush and shutdown Langfuse client."""
-    global _langfuse_client
+    """
+    Drain queued trace updates and shut down the Langfuse client.
+
+    The final ``flush()`` can be skipped with ``LANGFUSE_ENFORCE_FLUSH=false``
+    when a fast shutdown matters more than the last few traces.
+    """
+    global _langfuse_client, _worker
+
+    if _worker is not None:
+        _trace_queue.put(_STOP)
+        _worker.join(timeout=_TRACE_SHUTDOWN_TIMEOUT)
+        if _worker.is_alive():
+            logger.warning("Langfuse trace worker did not stop in time")
+        _worker = None
 
     if _langfuse_client:
-        logger.info("Shutting down Langfuse - flushing pending traces")
+        if os.getenv("LANGFUSE_ENFORCE_FLUSH", "true").lower() in ("1", "true", "yes"):
+            logger.info("Shutting down Langfuse - flushing pending traces")
+            try:
+                _langfuse_client.flush()
+            except Exception as e:
+                logger.error(f"Error flushing Langfuse: {e}")
+        _langfuse_client = None
+
+    # Let a later init_langfuse() build a fresh client
+    _build_langfuse.cache_clear()
+
+
+# ─── Background Trace Updates ─────────────────────────
+
+
+def _start_trace_worker() -> None:
+    """Start the daemon thread that applies queued trace updates."""
+    global _worker
+
+    if _worker is not None and _worker.is_alive():
+        return
+    _worker = threading.Thread(target=_drain, name="langfuse-trace-worker", daemon=True)
+    _worker.start()
+
+
+def _enqueue_trace_update(kind: str, **kwargs: Any) -> None:
+    """
+    Queue a Langfuse client call (e.g. ``update_current_trace``).
+
+    The current context is captured with the call so the worker applies it
+    to the same span the caller was in.
+    """
+    _trace_queue.put((kind, kwargs, contextvars.copy_context()))
+
+
+def _apply_trace_update(langfuse: Langfuse, item: tuple) -> None:
+    kind, kwargs, ctx = item
+    try:
+        ctx.run(getattr(langfuse, kind), **kwargs)
+    except Exception as e:
+        logger.error(f"Failed to apply Langfuse {kind}: {e}")
+
+
+def _drain() -> None:
+    """Apply queued trace updates in batches, flushing periodically."""
+    langfuse = _langfuse_client
+    last_flush = time.monotonic()
+
+    while True:
+        batch: list = []
         try:
-            _langfuse_client.flush()
-        except Exception as e:
-            logger.error(f"Error flushing Langfuse: {e}")
-        finally:
-            _langfuse_client = None
+            batch.append(_trace_queue.get(timeout=_TRACE_DRAIN_TIMEOUT))
+            while len(batch) < TRACE_BATCH_SIZE:
+                batch.append(_trace_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        stop = False
+        for item in batch:
+            if item is _STOP:
+                stop = True
+                continue
+            _apply_trace_update(langfuse, item)
+
+        if stop:
+            return
+
+        if batch and time.monotonic() - last_flush >= TRACE_FLUSH_INTERVAL:
+            try:
+                langfuse.flush()
+            except Exception as e:
+                logger.error(f"Error flushing Langfuse: {e}")
+            last_flush = time.monotonic()
+
 
+def _trace_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """Copy the whitelisted headers in a single pass, eliding oversized values."""
+    return {
+        k: v if len(v) < _MAX_VALUE_BYTES else f"<{len(v)}B>"
+        for k, v in headers.items()
+        if k in _TRACE_HDR_KEYS
+    }
 
-class LangfuseMiddleware(BaseHTTPMiddleware):
+
+@functools.lru_cache(maxsize=256)
+def _status_tags(method: str, status: int) -> tuple[str, ...]:
+    """Trace tags for a response; a few (method, status) pairs cover most traffic."""
+    return ("http", "api", method.lower(), f"status_{status}")
+
+
+@dataclass(frozen=True)
+class _SampleConfig:
     """
-    FastAPI middleware for automatic request tracing with Langfuse.
+    Tail-sampling policy for request traces.
+
+    A request is traced when it falls in the random ``rate`` sample, fails
+    (status >= 400), runs longer than ``tail_latency_ms``, or hits one of
+    ``always_paths``.
+    """
+
+    rate: float = 1.0
+    tail_latency_ms: float = 500.0
+    always_paths: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_env(cls) -> "_SampleConfig":
+        paths = os.getenv("LANGFUSE_ALWAYS_PATHS", "")
+        return cls(
+            rate=float(os.getenv("LANGFUSE_SAMPLE_RATE", "1.0")),
+            tail_latency_ms=float(os.getenv("LANGFUSE_TAIL_LATENCY_MS", "500")),
+            always_paths=frozenset(p.strip() for p in paths.split(",") if p.strip()),
+        )
+
+
+class LangfuseMiddleware:
+    """
+    ASGI middleware for automatic request tracing with Langfuse.
 
     Traces all HTTP requests and responses, capturing:
     - Request method, path, headers, query params
@@ -99,70 +269,106 @@ class LangfuseMiddleware(BaseHTTPMiddleware):
     - Request duration
     - User information (if available)
     - Session information (if available)
-    """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Trace the HTTP request/response cycle."""
+    Healthy, fast requests are sampled at ``LANGFUSE_SAMPLE_RATE``; errors,
+    slow requests and ``LANGFUSE_ALWAYS_PATHS`` are always kept.
 
-        if not is_langfuse_enabled():
-            return await call_next(request)
-
-        # Extract request metadata
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params)
-
-        # Extract session_id if available (from query params or request body)
-        session_id = query_params.get("session_id")
+    Written as plain ASGI rather than BaseHTTPMiddleware: it never touches
+    the body, so it only needs to watch ``send`` for the response start.
+    """
 
-        # Extract user information if available
-        user_id = request.headers.get("X-User-ID")
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Resolved on the first HTTP request: the middleware stack is built
+        # before the app's lifespan runs init_langfuse()
+        self._enabled: Optional[bool] = None
+        self._sampling = _SampleConfig()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._enabled is None:
+            self._enabled = is_langfuse_enabled()
+            self._sampling = _SampleConfig.from_env()
+        if not self._enabled:
+            await self.app(scope, receive, send)
+            return
+
+        sampling = self._sampling
+        method = scope["method"]
+        # Head decision up front; errors and slow requests are kept regardless
+        sampled = scope["path"] in sampling.always_paths or random.random() < sampling.rate
+        t0 = time.perf_counter_ns()
+        response_start: Optional[Message] = None
+        elapsed_ns = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_start, elapsed_ns
+            if message["type"] == "http.response.start":
+                # Duration up to the response start, so streamed bodies
+                # don't count as slow requests
+                response_start = message
+                elapsed_ns = time.perf_counter_ns() - t0
+            await send(message)
 
-        # Start a trace for this request
         try:
-            langfuse = get_client()
-            langfuse.update_current_trace(
-                name=f"{method} {path}",
-                metadata={
-                    "method": method,
-                    "path": path,
-                    "query_params": query_params,
-                    "headers": dict(request.headers),
-                },
-                session_id=session_id,
-                user_id=user_id,
-                tags=["http", "api", method.lower()],
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # FastAPI logs the traceback again upstream; only repeat it at DEBUG
+            logger.error(
+                "Error in %s: %s", "Langfuse middleware", e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
             )
+            _enqueue_trace_update(
+                "update_current_trace",
+                **self._trace_input(scope),
+                output={"error": str(e)},
+                tags=["error", "middleware_error"],
+            )
+            raise
 
-            # Process the request
-            response = await call_next(request)
+        if response_start is None:
+            return
 
-            # Update trace with response information
-            langfuse.update_current_trace(
+        status = response_start["status"]
+        elapsed_ms = elapsed_ns / 1e6
+        if sampled or status >= 400 or elapsed_ms > sampling.tail_latency_ms:
+            # Request and response details go out as a single trace update
+            _enqueue_trace_update(
+                "update_current_trace",
+                **self._trace_input(scope),
                 output={
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
+                    "status_code": status,
+                    "headers": _trace_headers(Headers(raw=response_start.get("headers", []))),
+                    "duration_ms": round(elapsed_ms, 1),
                 },
-                tags=["http", "api", method.lower(), f"status_{response.status_code}"],
+                tags=_status_tags(method, status),
             )
 
-            return response
-
-        except Exception as e:
-            # Log error to trace
-            logger.exception(f"Error in Langfuse middleware: {e}")
-
-            if is_langfuse_enabled():
-                try:
-                    langfuse = get_client()
-                    langfuse.update_current_trace(
-                        output={"error": str(e)},
-                        tags=["error", "middleware_error"],
-                    )
-                except Exception as langfuse_error:
-                    logger.error(f"Failed to update Langfuse trace: {langfuse_error}")
-
-            raise
+    @staticmethod
+    def _trace_input(scope: Scope) -> dict[str, Any]:
+        """Build the request-side fields of a trace update."""
+        method = scope["method"]
+        path = scope["path"]
+        headers = Headers(scope=scope)
+        # Parse the raw query string directly, as Starlette's QueryParams would
+        qs = scope.get("query_string", b"")
+        query_params = dict(parse_qsl(qs.decode("latin-1"), keep_blank_values=True)) if qs else {}
+
+        return {
+            "name": f"{method} {path}",
+            "metadata": {
+                "method": method,
+                "path": path,
+                "query_params": query_params,
+                "headers": _trace_headers(headers),
+            },
+            # Extract session_id if available (from query params or request body)
+            "session_id": query_params.get("session_id"),
+            # Extract user information if available
+            "user_id": headers.get("X-User-ID"),
+        }
 
 
 def trace_function(
@@ -191,18 +397,28 @@ def trace_function(
             return func
 
         # Use Langfuse's observe decorator
-        traced_func = observe(
-            name=name or func.__name__,
-            capture_input=capture_input,
-            capture_output=capture_output,
-            as_type=as_type,
-        )(func)
-
-        return traced_func
+        observer = _make_observer(name or func.__name__, capture_input, capture_output, as_type)
+        return observer(func)
 
     return decorator
 
 
+@functools.lru_cache(maxsize=None)
+def _make_observer(
+    name: str,
+    capture_input: bool,
+    capture_output: bool,
+    as_type: str,
+) -> Callable[[Callable], Callable]:
+    """Build (once per signature) the ``observe`` decorator for trace_function."""
+    return observe(
+        name=name,
+        capture_input=capture_input,
+        capture_output=capture_output,
+        as_type=as_type,
+    )
+
+
 def trace_llm_call(
     name: str,
     model: str,
@@ -225,8 +441,11 @@ def trace_llm_call(
     if not is_langfuse_enabled():
         return
 
+    if isinstance(output_data, str) and len(output_data) > _MAX_OUTPUT_CHARS:
+        output_data = output_data[:_MAX_OUTPUT_CHARS] + "...[truncated]"
+
     try:
-        langfuse = get_client()
+        langfuse = _langfuse_client
         if langfuse:
             generation = langfuse.update_current_span(
                 name=name,
@@ -241,13 +460,50 @@ def trace_llm_call(
         logger.error(f"Failed to log LLM call to Langfuse: {e}")
 
 
-@asynccontextmanager
-async def trace_context(
+class _NoopCM:
+    """Async context manager that does nothing; shared while tracing is off."""
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NOOP_CM = _NoopCM()
+
+
+class _TraceCM:
+    """Async context manager behind trace_context() when tracing is on."""
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, **fields: Any):
+        self._fields = fields
+
+    async def __aenter__(self) -> None:
+        _enqueue_trace_update("update_current_trace", **self._fields)
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None and issubclass(exc_type, Exception):
+            logger.error(
+                "Error in %s: %s", "trace context", exc,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            _enqueue_trace_update(
+                "update_current_trace",
+                output={"error": str(exc)},
+                tags=["error", "context_error"],
+            )
+        return False
+
+
+def trace_context(
     name: str,
     session_id: Optional[str] = None,
     user_id: Optional[str] = None,
     metadata: Optional[dict] = None,
-):
+) -> _NoopCM | _TraceCM:
     """
     Context manager for creating a traced code block.
 
@@ -257,32 +513,9 @@ async def trace_context(
             result = await some_operation()
     """
     if not is_langfuse_enabled():
-        yield
-        return
+        return _NOOP_CM
 
-    try:
-        langfuse = get_client()
-        langfuse.update_current_trace(
-            name=name,
-            session_id=session_id,
-            user_id=user_id,
-            metadata=metadata,
-        )
-        yield
-    except Exception as e:
-        logger.error(f"Error in trace context: {e}")
-        if is_langfuse_enabled():
-            try:
-                langfuse = get_client()
-                langfuse.update_current_trace(
-                    output={"error": str(e)},
-                    tags=["error", "context_error"],
-                )
-            except Exception as langfuse_error:
-                logger.error(f"Failed to update Langfuse trace: {langfuse_error}")
-        raise
-    finally:
-        pass
+    return _TraceCM(name=name, session_id=session_id, user_id=user_id, metadata=metadata)
 
 
 def create_trace_score(
@@ -304,7 +537,7 @@ def create_trace_score(
         return
 
     try:
-        langfuse = get_client()
+        langfuse = _langfuse_client
         langfuse.score_current_span(
             name=name,
             value=value,
@@ -338,12 +571,21 @@ def extract_trace_context() -> dict[str, str]:
             logger.debug("No valid trace context available")
             return {}
 
-        # Inject trace context into headers dict
-        headers: dict[str, str] = {}
-        TraceContextTextMapPropagator().inject(headers)
-        W3CBaggagePropagator().inject(headers)
-
-        logger.debug(f"Extracted trace context: {headers}")
+        # The traceparent layout is fixed, so format it directly rather than
+        # going through the propagator
+        headers: dict[str, str] = {
+            "traceparent": (
+                f"00-{current_context.trace_id:032x}-{current_context.span_id:016x}"
+                f"-{current_context.trace_flags:02x}"
+            ),
+        }
+        if current_context.trace_state:
+            headers["tracestate"] = current_context.trace_state.to_header()
+        if baggage.get_all():
+            _BAG_PROP.inject(headers)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Extracted trace context: {headers}")
         return headers
 
     except Exception as e:
@@ -369,13 +611,14 @@ def restore_trace_context(trace_context: dict[str, str]) -> Any:
 
     try:
         # Extract trace context from headers
-        ctx = TraceContextTextMapPropagator().extract(carrier=trace_context)
+        ctx = _TRACE_PROP.extract(carrier=trace_context)
 
         # Also extract baggage if present
         if "baggage" in trace_context:
-            ctx = W3CBaggagePropagator().extract(carrier=trace_context, context=ctx)
+            ctx = _BAG_PROP.extract(carrier=trace_context, context=ctx)
 
-        logger.debug(f"Restored trace context from: {trace_context}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Restored trace context from: {trace_context}")
         return ctx
 
     except Exception as e:
@@ -417,26 +660,32 @@ class MCPTraceContextInterceptor:
             # Skip trace context injection if Langfuse is disabled
             return await next_handler(request)
 
+        span_context = trace.get_current_span().get_span_context()
+        if not span_context.is_valid or not span_context.trace_flags.sampled:
+            # Nothing to link to: the downstream span would be dropped anyway
+            return await next_handler(request)
+
         try:
             # Extract current trace context
             trace_context = extract_trace_context()
 
             if trace_context:
                 # Inject into request headers for HTTP/SSE transport
-                if request.headers is None:
-                    request.headers = {}
-                request.headers.update(trace_context)
+                headers = request.headers if request.headers is not None else {}
+                headers.update(trace_context)
+                request.headers = headers
 
                 # Also inject into args.mcp_meta for MCP protocol
                 # Note: FastMCP doesn't allow param names starting with _
-                if "mcp_meta" not in request.args:
-                    request.args["mcp_meta"] = {}
-                request.args["mcp_meta"]["trace_context"] = trace_context
-
-                logger.debug(
-                    f"Injected trace context into MCP call: {request.name} "
-                    f"to {request.server_name}"
-                )
+                # The dict is stored by reference, not copied: it is fresh per
+                # call and only read downstream
+                request.args.setdefault("mcp_meta", {})["trace_context"] = trace_context
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Injected trace context into MCP call: {request.name} "
+                        f"to {request.server_name}"
+                    )
 
         except Exception as e:
             # Don't fail the request if trace context injection fails
@@ -29,6 +29,7 @@ Or run directly:
 
 import asyncio
 import json
+import random
 import time
 import uuid
 from dataclasses import dataclass
@@ -54,7 +55,9 @@ HEALTH_ENDPOINT = f"{GATEWAY_URL}/api/health"
 FASTAPI_REPO_URL = "https://github.com/tiangolo/fastapi.git"
 FASTAPI_BRANCH = "master"
 
-# Polling configuration
+# Polling configuration: status polls back off exponentially (with jitter)
+# from POLL_INITIAL_SECONDS up to POLL_INTERVAL_SECONDS
+POLL_INITIAL_SECONDS = 0.25
 POLL_INTERVAL_SECONDS = 5
 MAX_WAIT_MINUTES = 30
 
@@ -65,6 +68,11 @@ MIN_FUNCTIONS = 1500
 MIN_ENRICHMENT_COVERAGE = 80.0  # percentage
 
 
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Capped exponential backoff with up to 50% jitter."""
+    return min(cap, base * (2 ** attempt)) * (1 + random.random() * 0.5)
+
+
 @dataclass
 class IndexTestResult:
     """Result of an index test operation."""
@@ -419,7 +427,6 @@ def build_session_queries(num_turns: int) -> list[Query]:
         num_complex = num_turns - num_simple - num_medium
 
     # Select queries from each difficulty
-    import random
     random.seed(42)  # Reproducible selection
 
     selected_simple = random.sample(SIMPLE_QUERIES * 10, min(num_simple, len(SIMPLE_QUERIES) * 10))
@@ -615,7 +622,7 @@ class IntegrationTestRunner:
             print(f"Polling job status: {job_id}")
             print(f"Endpoint: {status_url}")
             print(f"Max wait time: {MAX_WAIT_MINUTES} minutes")
-            print(f"Poll interval: {POLL_INTERVAL_SECONDS} seconds")
+            print(f"Poll interval: {POLL_INITIAL_SECONDS}s backing off to {POLL_INTERVAL_SECONDS}s")
             print(f"{'='*80}\n")
 
         poll_count = 0
@@ -686,8 +693,10 @@ class IntegrationTestRunner:
                         print(f"  Endpoint: {status_url}")
                     return False, None, elapsed
 
-                # Still running, wait before next poll
-                time.sleep(POLL_INTERVAL_SECONDS)
+                # Still running, back off before the next poll without
+                # sleeping past the overall deadline
+                delay = _backoff_delay(poll_count - 1, POLL_INITIAL_SECONDS, POLL_INTERVAL_SECONDS)
+                time.sleep(max(0.0, min(delay, max_wait_seconds - (time.time() - start_time))))
 
             except httpx.TimeoutException as e:
                 if verbose:
@@ -0,0 +1,355 @@
+"""
+Integration tests for the indexer's graph-manager Cypher against a real Neo4j.
+
+The unit tests in tests/test_indexer/test_graph_manager.py only check the
+Cypher text.  These tests run the rewritten queries on the Neo4j instance the
+Docker Compose services use and assert on the nodes and edges they leave:
+- CALL { } IN TRANSACTIONS passes of resolve_all_relationships
+- chained subqueries of resolve_calls_for_function
+- FOREACH ... DETACH DELETE in delete_file_subgraph
+- db.create.setNodeVectorProperty in set_embeddings_bulk
+
+Prerequisites:
+    - NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD set (the same .env that
+      `docker-compose -f docker-compose.cloud.yml up` uses)
+
+Every test writes under a unique ``itest_<hex>`` path prefix and removes
+its nodes afterwards.  The tests are skipped when Neo4j is not reachable.
+
+Run with:
+    python -m pytest tests/integration/test_graph_queries.py -v
+"""
+
+import os
+import uuid
+
+import pytest
+
+from src.agents.indexer.graph_manager import Neo4jGraphManager
+from src.shared.database import Neo4jHandler
+
+
+# ─── Fixtures ────────────────────────────────────────────────
+
+
+@pytest.fixture
+async def gm():
+    """Graph manager connected to the configured Neo4j, or skip."""
+    if not os.getenv("NEO4J_URI"):
+        pytest.skip("NEO4J_URI not set; Neo4j integration tests need a database")
+    manager = Neo4jGraphManager(Neo4jHandler())
+    try:
+        await manager.connect()
+    except Exception as exc:
+        pytest.skip(f"Neo4j not reachable: {exc}")
+    # resolve_* queries use index hints, so the schema must exist
+    await manager.ensure_schema()
+    yield manager
+    await manager.close()
+
+
+@pytest.fixture
+async def prefix(gm):
+    """Unique path/module prefix; everything under it is deleted afterwards."""
+    value = f"itest_{uuid.uuid4().hex[:12]}"
+    yield value
+    for label, key in (
+        ("File", "path"),
+        ("Module", "qualified_name"),
+        ("Function", "qualified_name"),
+        ("Class", "qualified_name"),
+    ):
+        await gm._write(
+            f"""
+            MATCH (n:{label}) WHERE n.{key} STARTS WITH $prefix
+            OPTIONAL MATCH (n)-[:HAS_PARAMETER|HAS_ATTRIBUTE]->(child)
+            DETACH DELETE child, n
+            """,
+            {"prefix": value},
+        )
+
+
+# ─── Helpers ─────────────────────────────────────────────────
+
+
+def _func(prefix: str, module: str, name: str, calls: list[str] | None = None) -> dict:
+    """Parsed-function dict as produced by the AST parser."""
+    return {
+        "qualified_name": f"{prefix}.{module}.{name}",
+        "name": name,
+        "source": f"def {name}(): pass",
+        "content_hash": uuid.uuid4().hex,
+        "lineno_start": 1,
+        "lineno_end": 1,
+        "calls": calls or [],
+    }
+
+
+async def _add_file(gm, prefix: str, module: str, funcs: list[dict]) -> str:
+    """Create a File node with top-level functions and return its path."""
+    path = f"{prefix}/{module}.py"
+    await gm.create_file_node(path, uuid.uuid4().hex)
+    for func in funcs:
+        await gm.create_function_node(path, func)
+    return path
+
+
+async def _import(gm, prefix: str, src: str, tgt: str) -> None:
+    """Record that module ``src`` imports module ``tgt``."""
+    await gm.create_import_edge(
+        f"{prefix}/{src}.py",
+        {"source_module": f"{prefix}.{src}", "module": f"{prefix}.{tgt}", "names": []},
+    )
+
+
+async def _callees(gm, qname: str) -> set[str]:
+    """Qualified names the function has CALLS edges to."""
+    rows = await gm._run(
+        """
+        MATCH (:Function {qualified_name: $qname})-[:CALLS]->(callee:Function)
+        RETURN callee.qualified_name AS qname
+        """,
+        {"qname": qname},
+    )
+    return {row["qname"] for row in rows}
+
+
+async def _stored_calls(gm, qname: str) -> list[str]:
+    """The ``_calls`` list stored on a Function node."""
+    row = await gm._run_single(
+        "MATCH (f:Function {qualified_name: $qname}) RETURN f._calls AS calls",
+        {"qname": qname},
+    )
+    return row["calls"]
+
+
+async def _embedding(gm, label: str, qname: str) -> list[float] | None:
+    """The ``embedding`` vector stored on a Function or Class node."""
+    row = await gm._run_single(
+        f"MATCH (n:{label} {{qualified_name: $qname}}) RETURN n.embedding AS embedding",
+        {"qname": qname},
+    )
+    return row["embedding"]
+
+
+# ─── Call Graph Fixture ──────────────────────────────────────
+
+
+async def _build_call_graph(gm, prefix: str) -> dict:
+    """
+    Build a small graph that exercises every resolution pass:
+
+    a.caller calls local (same file), imported (b.py, imported by a),
+    unique (c.py, globally unique name) and dup (defined in d.py and
+    e.py, so ambiguous and never resolved).
+    """
+    local, imported, unique, dup = (
+        f"{prefix}_local", f"{prefix}_imported", f"{prefix}_unique", f"{prefix}_dup",
+    )
+    caller = _func(prefix, "a", f"{prefix}_caller", [local, imported, unique, dup])
+    await _add_file(gm, prefix, "a", [caller, _func(prefix, "a", local)])
+    await _add_file(gm, prefix, "b", [_func(prefix, "b", imported)])
+    await _add_file(gm, prefix, "c", [_func(prefix, "c", unique)])
+    await _add_file(gm, prefix, "d", [_func(prefix, "d", dup)])
+    await _add_file(gm, prefix, "e", [_func(prefix, "e", dup)])
+    await _import(gm, prefix, "a", "b")
+    return {
+        "caller": caller["qualified_name"],
+        "local": f"{prefix}.a.{local}",
+        "imported": f"{prefix}.b.{imported}",
+        "unique": f"{prefix}.c.{unique}",
+        "calls": caller["calls"],
+    }
+
+
+# ─── resolve_all_relationships ───────────────────────────────
+
+
+class TestResolveAllRelationships:
+    """CALL { } IN TRANSACTIONS passes with RETURN sum(created)."""
+
+    async def test_each_pass_creates_its_edges(self, gm, prefix):
+        g = await _build_call_graph(gm, prefix)
+
+        created = await gm.resolve_all_relationships()
+
+        assert created >= 3
+        assert await _callees(gm, g["caller"]) == {g["local"], g["imported"], g["unique"]}
+        # The ambiguous name stays unresolved and _calls is left intact
+        assert await _stored_calls(gm, g["caller"]) == g["calls"]
+
+    async def test_rerun_creates_no_duplicate_edges(self, gm, prefix):
+        g = await _build_call_graph(gm, prefix)
+        await gm.resolve_all_relationships()
+
+        await gm.resolve_all_relationships()
+
+        rows = await gm._run(
+            """
+            MATCH (:Function {qualified_name: $qname})-[r:CALLS]->()
+            RETURN count(r) AS edges
+            """,
+            {"qname": g["caller"]},
+        )
+        assert rows[0]["edges"] == 3
+
+    async def test_edge_rederived_after_callee_file_is_reindexed(self, gm, prefix):
+        g = await _build_call_graph(gm, prefix)
+        await gm.resolve_all_relationships()
+
+        await gm.delete_file_subgraph(f"{prefix}/b.py")
+        assert g["imported"] not in await _callees(gm, g["caller"])
+        await _add_file(gm, prefix, "b", [_func(prefix, "b", f"{prefix}_imported")])
+        await gm.resolve_all_relationships()
+
+        assert await _callees(gm, g["caller"]) == {g["local"], g["imported"], g["unique"]}
+
+
+# ─── resolve_calls_for_function ──────────────────────────────
+
+
+class TestResolveCallsForFunction:
+    """Chained subqueries: same-file, import-based, then unique-name."""
+
+    async def test_all_strategies_link_the_caller(self, gm, prefix):
+        g = await _build_call_graph(gm, prefix)
+
+        await gm.resolve_calls_for_function(g["caller"], g["calls"])
+
+        assert await _callees(gm, g["caller"]) == {g["local"], g["imported"], g["unique"]}
+        assert await _stored_calls(gm, g["caller"]) == g["calls"]
+
+    async def test_old_edges_replaced_by_new_call_list(self, gm, prefix):
+        g = await _build_call_graph(gm, prefix)
+        await gm.resolve_calls_for_function(g["caller"], g["calls"])
+
+        new_calls = [f"{prefix}_unique"]
+        await gm.resolve_calls_for_function(g["caller"], new_calls)
+
+        assert await _callees(gm, g["caller"]) == {g["unique"]}
+        assert await _stored_calls(gm, g["caller"]) == new_calls
+
+
+# ─── delete_file_subgraph ────────────────────────────────────
+
+
+class TestDeleteFileSubgraph:
+    """FOREACH ... DETACH DELETE over everything the file contains."""
+
+    async def test_file_and_all_descendants_deleted(self, gm, prefix):
+        path = f"{prefix}/m.py"
+        cls_qname = f"{prefix}.m.Widget"
+        method = _func(prefix, "m", "render")
+        method["qualified_name"] = f"{cls_qname}.render"
+        nested = _func(prefix, "m", "inner")
+        nested["qualified_name"] = f"{cls_qname}.render.inner"
+        top = _func(prefix, "m", "build")
+
+        await gm.create_file_node(path, uuid.uuid4().hex)
+        await gm.create_class_node(path, {
+            "qualified_name": cls_qname,
+            "name": "Widget",
+            "source": "class Widget: pass",
+            "content_hash": uuid.uuid4().hex,
+            "lineno_start": 1,
+            "lineno_end": 1,
+        })
+        attr = f"{prefix}_size"
+        params = [f"{prefix}_x", f"{prefix}_y", f"{prefix}_z"]
+        await gm.create_class_attributes_bulk(cls_qname, [{"name": attr}])
+        await gm.create_function_node(path, method, parent_class="Widget")
+        await gm.create_function_node(path, nested, parent_function=method["qualified_name"])
+        await gm.create_function_node(path, top)
+        await gm.create_parameters_bulk(
+            top["qualified_name"], [{"name": params[0]}, {"name": params[1]}]
+        )
+        await gm.create_parameters_bulk(nested["qualified_name"], [{"name": params[2]}])
+
+        result = await gm.delete_file_subgraph(path)
+
+        # Entities: Widget, build; children: render
+        assert result == {"deleted_entities": 2, "deleted_children": 1}
+        rows = await gm._run(
+            """
+            OPTIONAL MATCH (f:File {path: $path})
+            OPTIONAL MATCH (fn:Function) WHERE fn.qualified_name STARTS WITH $prefix
+            OPTIONAL MATCH (c:Class {qualified_name: $cls})
+            OPTIONAL MATCH (p:Parameter) WHERE p.name IN $params
+            OPTIONAL MATCH (a:ClassAttribute {name: $attr})
+            RETURN count(f) AS files, count(fn) AS functions, count(c) AS classes,
+                   count(p) AS params, count(a) AS attrs
+            """,
+            {"path": path, "prefix": prefix, "cls": cls_qname, "params": params, "attr": attr},
+        )
+        assert rows[0] == {"files": 0, "functions": 0, "classes": 0, "params": 0, "attrs": 0}
+
+    async def test_module_node_kept(self, gm, prefix):
+        path = await _add_file(gm, prefix, "m", [_func(prefix, "m", "build")])
+
+        await gm.delete_file_subgraph(path)
+
+        row = await gm._run_single(
+            "MATCH (m:Module {qualified_name: $mod}) RETURN count(m) AS modules",
+            {"mod": f"{prefix}.m"},
+        )
+        assert row["modules"] == 1
+
+    async def test_other_files_untouched(self, gm, prefix):
+        g = await _build_call_graph(gm, prefix)
+        await gm.resolve_all_relationships()
+
+        await gm.delete_file_subgraph(f"{prefix}/c.py")
+
+        assert await _callees(gm, g["caller"]) == {g["local"], g["imported"]}
+
+    async def test_missing_file_returns_zero_counts(self, gm, prefix):
+        result = await gm.delete_file_subgraph(f"{prefix}/missing.py")
+
+        assert result == {"deleted_entities": 0, "deleted_children": 0}
+
+
+# ─── set_embeddings_bulk ─────────────────────────────────────
+
+
+class TestSetEmbeddingsBulk:
+    """UNWIND + db.create.setNodeVectorProperty on Function and Class nodes."""
+
+    DIMENSIONS = 3072  # Matches the vector indexes created by ensure_schema
+
+    async def test_vectors_stored_on_functions_and_classes(self, gm, prefix):
+        path = await _add_file(gm, prefix, "m", [_func(prefix, "m", "build")])
+        cls_qname = f"{prefix}.m.Widget"
+        await gm.create_class_node(path, {
+            "qualified_name": cls_qname,
+            "name": "Widget",
+            "source": "class Widget: pass",
+            "content_hash": uuid.uuid4().hex,
+            "lineno_start": 2,
+            "lineno_end": 2,
+        })
+        fn_vector = [0.5] * self.DIMENSIONS
+        cls_vector = [0.25] * self.DIMENSIONS
+
+        await gm.set_embeddings_bulk([
+            {"qname": f"{prefix}.m.build", "embedding": fn_vector},
+            {"qname": cls_qname, "embedding": cls_vector},
+            {"qname": f"{prefix}.m.missing", "embedding": fn_vector},
+        ])
+
+        fn_stored = await _embedding(gm, "Function", f"{prefix}.m.build")
+        cls_stored = await _embedding(gm, "Class", cls_qname)
+        assert len(fn_stored) == self.DIMENSIONS
+        assert fn_stored[0] == pytest.approx(0.5)
+        assert len(cls_stored) == self.DIMENSIONS
+        assert cls_stored[-1] == pytest.approx(0.25)
+
+    async def test_vector_replaced_on_rewrite(self, gm, prefix):
+        await _add_file(gm, prefix, "m", [_func(prefix, "m", "build")])
+        qname = f"{prefix}.m.build"
+
+        await gm.set_embedding(qname, [0.1] * self.DIMENSIONS)
+        await gm.set_embedding(qname, [0.9] * self.DIMENSIONS)
+
+        stored = await _embedding(gm, "Function", qname)
+        assert len(stored) == self.DIMENSIONS
+        assert stored[0] == pytest.approx(0.9)
@@ -1,6 +1,8 @@
 """Smoke test for the Code Analyst agent — exercises all 6 MCP tools."""
 
 import asyncio
+import time
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -34,6 +36,9 @@ QUERIES = [
     },
 ]
 
+# Queries in flight at once
+CONCURRENCY = 3
+
 
 async def main():
     print("=" * 60)
@@ -43,38 +48,59 @@ async def main():
     agent = await CodeAnalystAgent.create()
     print(f"Agent ready. Running {len(QUERIES)} queries...\n")
 
+    # The queries are independent, so overlap their LLM latency
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def run(query: str):
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                return await agent.invoke(query), None, time.perf_counter() - t0
+            except Exception as e:
+                return None, e, time.perf_counter() - t0
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run(q["query"]) for q in QUERIES))
+    wall_time = time.perf_counter() - started
+
     passed = 0
     failed = 0
 
-    for i, q in enumerate(QUERIES, 1):
+    # Report in the original order
+    for i, (q, (answer, error, elapsed)) in enumerate(zip(QUERIES, results), 1):
         tool = q["target_tool"]
         query = q["query"]
         separator = "-" * 60
         print(f"\n{separator}")
         print(f"  [{i}/{len(QUERIES)}] Target tool: {tool}")
         print(f"  Query: {query}")
+        print(f"  Time: {elapsed:.1f}s")
         print(separator)
 
-        try:
-            answer = await agent.invoke(query)
-            is_fallback = answer == "I was unable to produce an analysis for this query."
-            status = "FAIL (fallback)" if is_fallback else "PASS"
-            if is_fallback:
-                failed += 1
-            else:
-                passed += 1
-            print(f"\n  Status: {status}")
-            print(f"\n  Answer ({len(answer)} chars):\n")
-            preview = answer[:500] + ("..." if len(answer) > 500 else "")
-            print(preview)
-        except Exception as e:
+        if error is not None:
+            failed += 1
+            print(f"\n  Status: ERROR — {type(error).__name__}: {error}")
+            continue
+
+        is_fallback = answer == "I was unable to produce an analysis for this query."
+        status = "FAIL (fallback)" if is_fallback else "PASS"
+        if is_fallback:
             failed += 1
-            print(f"\n  Status: ERROR — {type(e).__name__}: {e}")
+        else:
+            passed += 1
+        print(f"\n  Status: {status}")
+        print(f"\n  Answer ({len(answer)} chars):\n")
+        preview = answer[:500] + ("..." if len(answer) > 500 else "")
+        print(preview)
 
     await agent.close()
 
     print("\n" + "=" * 60)
     print(f"  Results: {passed} passed, {failed} failed out of {len(QUERIES)}")
+    print(
+        f"  Wall time: {wall_time:.1f}s "
+        f"(sum of query times: {sum(r[2] for r in results):.1f}s)"
+    )
     print("=" * 60)
 
 
@@ -0,0 +1,102 @@
+"""
+Unit tests for the Code Analyst GraphContextRetriever.
+
+The Neo4jGraph is replaced with a recording fake, so no database is
+required; tests assert on the Cypher issued and the assembled result.
+Run with: pytest tests/test_code_analyst/test_graph_context.py -v
+"""
+
+import pytest
+
+from src.agents.code_analyst.graph_context import GraphContextRetriever
+
+
+# ─── Fakes ───────────────────────────────────────────────────
+
+
+class FakeGraph:
+    """Records every query; returns canned rows for the first matching marker."""
+
+    def __init__(self, results: dict[str, list[dict]]):
+        self.results = results
+        self.queries: list[str] = []
+
+    def query(self, cypher, params=None):
+        self.queries.append(cypher)
+        for marker, rows in self.results.items():
+            if marker in cypher:
+                return rows
+        return []
+
+
+def _retriever(results: dict[str, list[dict]]) -> GraphContextRetriever:
+    retriever = GraphContextRetriever.__new__(GraphContextRetriever)
+    retriever._graph = FakeGraph(results)
+    return retriever
+
+
+FUNCTION = {"qualified_name": "pkg.mod.run", "name": "run", "_label": "Function"}
+CLASS = {"qualified_name": "pkg.mod.App", "name": "App", "_label": "Class"}
+
+
+@pytest.fixture
+def function_retriever():
+    return _retriever({
+        "MATCH (n:Function {qualified_name: $name})": [{"entity": FUNCTION}],
+        "(n:Function {qualified_name: $qname}) RETURN f.path": [{"path": "pkg/mod.py"}],
+        "DECORATED_BY": [{"name": "cache", "arguments": None}],
+    })
+
+
+@pytest.fixture
+def class_retriever():
+    # The Function lookup finds nothing, so resolve_entity falls back to Class
+    return _retriever({
+        "MATCH (n:Class {qualified_name: $name})": [{"entity": CLASS}],
+        "(n:Class {qualified_name: $qname}) RETURN f.path": [{"path": "pkg/mod.py"}],
+    })
+
+
+# ─── Tests ───────────────────────────────────────────────────
+
+
+class TestGetImplementationDetails:
+    """Tests for the explain_implementation query set."""
+
+    def test_function_entity(self, function_retriever):
+        result = function_retriever.get_implementation_details("pkg.mod.run")
+
+        assert result["found"] is True
+        assert result["file_path"] == "pkg/mod.py"
+        assert result["decorators"] == [{"name": "cache", "arguments": None}]
+        queries = function_retriever._graph.queries
+        assert any("(n:Function {qualified_name: $qname})-[:DATA_FLOWS_TO" in q for q in queries)
+
+    def test_class_entity_queries_use_class_label(self, class_retriever):
+        result = class_retriever.get_implementation_details("pkg.mod.App")
+
+        assert result["found"] is True
+        assert result["file_path"] == "pkg/mod.py"
+        queries = class_retriever._graph.queries
+        assert any("(n:Class {qualified_name: $qname})-[:DECORATED_BY]" in q for q in queries)
+        assert any("(n:Class {qualified_name: $qname})-[:RELATES_TO_CONCEPT]" in q for q in queries)
+
+    def test_unknown_entity(self):
+        result = _retriever({}).get_implementation_details("missing")
+
+        assert result["found"] is False
+
+
+class TestGetFunctionAnalysis:
+    """Tests for the analyze_function query set."""
+
+    def test_file_path_for_function(self, function_retriever):
+        result = function_retriever.get_function_analysis("pkg.mod.run")
+
+        assert result["file_path"] == "pkg/mod.py"
+
+    def test_file_path_for_class_fallback(self, class_retriever):
+        result = class_retriever.get_function_analysis("pkg.mod.App")
+
+        assert result["found"] is True
+        assert result["file_path"] == "pkg/mod.py"
@@ -0,0 +1,439 @@
+"""
+Unit tests for Gateway route helpers.
+
+The Indexer MCP client is mocked; no running services are required.
+Run with: pytest tests/test_gateway/test_unit.py -v
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# ──────────────────────────────────────────────────
+# Test 1: Indexer tool lookup
+# ──────────────────────────────────────────────────
+
+
+class TestIndexerToolLookup:
+    """Tests for the cached tool-by-name lookup in the index routes."""
+
+    @pytest.fixture
+    def index_module(self):
+        from src.gateway.routes import index
+
+        index._indexer_tools_by_name = None
+        yield index
+        index._indexer_tools_by_name = None
+
+    @pytest.fixture
+    def mock_client(self):
+        tool = MagicMock()
+        tool.name = "get_index_status"
+        tool.ainvoke = AsyncMock(return_value=json.dumps({"status": "running"}))
+
+        client = MagicMock()
+        client.get_tools = AsyncMock(return_value=[tool])
+        return client
+
+    async def test_tools_fetched_once(self, index_module, mock_client):
+        with patch.object(
+            index_module, "_get_indexer_client", AsyncMock(return_value=mock_client)
+        ):
+            await index_module._call_indexer_tool("get_index_status", job_id="a")
+            result = await index_module._call_indexer_tool("get_index_status", job_id="b")
+
+        assert result == {"status": "running"}
+        mock_client.get_tools.assert_awaited_once()
+
+    async def test_unknown_tool_raises(self, index_module, mock_client):
+        from fastapi import HTTPException
+
+        with patch.object(
+            index_module, "_get_indexer_client", AsyncMock(return_value=mock_client)
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await index_module._call_indexer_tool("missing_tool")
+
+        assert exc_info.value.status_code == 500
+        assert "missing_tool" in exc_info.value.detail
+
+
+# ──────────────────────────────────────────────────
+# Test 2: Background index job submission
+# ──────────────────────────────────────────────────
+
+
+class TestIndexJobSubmission:
+    """Tests for queuing indexing jobs via BackgroundTasks."""
+
+    @pytest.fixture
+    def index_module(self):
+        from src.gateway.routes import index
+
+        index._index_jobs.clear()
+        yield index
+        index._index_jobs.clear()
+
+    async def test_trigger_returns_before_indexer_call(self, index_module):
+        from fastapi import BackgroundTasks
+
+        background_tasks = BackgroundTasks()
+        call_tool = AsyncMock(return_value={"job_id": "idx123", "status": "pending"})
+
+        with patch.object(index_module, "_call_indexer_tool", call_tool):
+            response = await index_module.trigger_indexing(
+                index_module.IndexRequest(repository_url="https://example.com/repo.git"),
+                background_tasks,
+            )
+            call_tool.assert_not_awaited()
+
+            status = await index_module.get_indexing_status(response.job_id)
+            assert status.status == "pending"
+
+            await background_tasks()
+
+        job = index_module._index_jobs[response.job_id]
+        assert job.status == "submitted"
+        assert job.indexer_job_id == "idx123"
+
+    async def test_failed_submission_reported(self, index_module):
+        job = index_module.GatewayIndexJob(job_id="gw1")
+        index_module._index_jobs[job.job_id] = job
+        call_tool = AsyncMock(side_effect=RuntimeError("indexer down"))
+
+        with patch.object(index_module, "_call_indexer_tool", call_tool):
+            await index_module._submit_index_job(job, repository_url="x")
+            status = await index_module.get_indexing_status("gw1")
+
+        assert status.status == "failed"
+        assert status.error == "indexer down"
+
+    def test_tracked_jobs_bounded(self, index_module):
+        with patch.object(index_module, "MAX_TRACKED_JOBS", 2):
+            for job_id in ("a", "b", "c"):
+                index_module._track_job(index_module.GatewayIndexJob(job_id=job_id))
+
+        assert list(index_module._index_jobs) == ["b", "c"]
+
+
+# ──────────────────────────────────────────────────
+# Test 3: Langfuse middleware gating
+# ──────────────────────────────────────────────────
+
+
+class TestLangfuseMiddleware:
+    """Tests for resolving the Langfuse switch once per middleware."""
+
+    @staticmethod
+    def _http_scope():
+        return {"type": "http", "method": "GET", "path": "/health", "headers": []}
+
+    async def test_disabled_passes_straight_through(self):
+        from src.shared import observability
+
+        app = AsyncMock()
+        send = AsyncMock()
+        middleware = observability.LangfuseMiddleware(app)
+
+        with patch.object(observability, "is_langfuse_enabled", return_value=False) as enabled:
+            await middleware(self._http_scope(), AsyncMock(), send)
+            await middleware(self._http_scope(), AsyncMock(), send)
+
+        assert app.await_count == 2
+        assert app.await_args.args[2] is send
+        enabled.assert_called_once()
+
+    async def test_lifespan_does_not_resolve_switch(self):
+        from src.shared import observability
+
+        app = AsyncMock()
+        middleware = observability.LangfuseMiddleware(app)
+
+        with patch.object(observability, "is_langfuse_enabled") as enabled:
+            await middleware({"type": "lifespan"}, AsyncMock(), AsyncMock())
+
+        enabled.assert_not_called()
+        assert middleware._enabled is None
+        app.assert_awaited_once()
+
+
+# ──────────────────────────────────────────────────
+# Test 4: Background trace updates
+# ──────────────────────────────────────────────────
+
+
+class TestTraceWorker:
+    """Tests for applying Langfuse trace updates off the request path."""
+
+    @pytest.fixture
+    def observability(self):
+        from src.shared import observability
+
+        observability._langfuse_client = None
+        yield observability
+        observability.shutdown_langfuse()
+        observability._langfuse_enabled = False
+
+    def test_updates_applied_in_callers_context(self, observability):
+        import contextvars
+
+        marker = contextvars.ContextVar("marker", default=None)
+        seen = []
+        client = MagicMock()
+        client.update_current_trace.side_effect = lambda **kwargs: seen.append(
+            (marker.get(), kwargs)
+        )
+
+        observability._langfuse_client = client
+        observability._start_trace_worker()
+        marker.set("request-1")
+        observability._enqueue_trace_update("update_current_trace", name="GET /health")
+        observability.shutdown_langfuse()
+
+        assert seen == [("request-1", {"name": "GET /health"})]
+
+    def test_failed_update_does_not_stop_worker(self, observability):
+        client = MagicMock()
+        client.update_current_trace.side_effect = [RuntimeError("boom"), None]
+
+        observability._langfuse_client = client
+        observability._start_trace_worker()
+        observability._enqueue_trace_update("update_current_trace", name="a")
+        observability._enqueue_trace_update("update_current_trace", name="b")
+        observability.shutdown_langfuse()
+
+        assert client.update_current_trace.call_count == 2
+
+    def test_init_builds_client_once(self, observability, monkeypatch):
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk")
+        monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk")
+
+        with patch.object(observability, "Langfuse") as langfuse_cls:
+            first = observability.init_langfuse()
+            second = observability.init_langfuse()
+            observability.shutdown_langfuse()
+            third = observability.init_langfuse()
+
+        assert first is second is third is langfuse_cls.return_value
+        assert langfuse_cls.call_count == 2
+        assert observability.is_langfuse_enabled()
+
+    def test_enforce_flush_can_be_disabled(self, observability, monkeypatch):
+        client = MagicMock()
+        observability._langfuse_client = client
+        monkeypatch.setenv("LANGFUSE_ENFORCE_FLUSH", "false")
+
+        observability.shutdown_langfuse()
+
+        client.flush.assert_not_called()
+        assert observability._langfuse_client is None
+
+
+# ──────────────────────────────────────────────────
+# Test 5: Trace sampling
+# ──────────────────────────────────────────────────
+
+
+class TestTraceSampling:
+    """Tests for tail-sampling request traces in the middleware."""
+
+    @pytest.fixture
+    def observability(self):
+        from src.shared import observability
+
+        return observability
+
+    @staticmethod
+    def _scope(path: str, headers: list | None = None, query_string: bytes = b""):
+        return {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query_string,
+            "headers": headers or [],
+        }
+
+    async def _dispatch(
+        self, observability, path: str, status: int, headers: list | None = None, **config
+    ):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": status, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = observability.LangfuseMiddleware(app)
+        middleware._enabled = True
+        middleware._sampling = observability._SampleConfig(**config)
+        send = AsyncMock()
+
+        with patch.object(observability, "_enqueue_trace_update") as enqueue:
+            await middleware(self._scope(path, headers), AsyncMock(), send)
+
+        assert send.await_count == 2
+        return enqueue
+
+    async def test_fast_success_dropped(self, observability):
+        enqueue = await self._dispatch(observability, "/health", 200, rate=0.0)
+        enqueue.assert_not_called()
+
+    async def test_errors_always_kept(self, observability):
+        enqueue = await self._dispatch(observability, "/health", 503, rate=0.0)
+        enqueue.assert_called_once()
+        assert enqueue.call_args.kwargs["output"]["status_code"] == 503
+        assert enqueue.call_args.kwargs["tags"] == ("http", "api", "get", "status_503")
+
+    async def test_allow_listed_path_kept(self, observability):
+        enqueue = await self._dispatch(
+            observability, "/api/chat", 200, rate=0.0, always_paths=frozenset({"/api/chat"})
+        )
+        enqueue.assert_called_once()
+        assert enqueue.call_args.kwargs["name"] == "GET /api/chat"
+
+    async def test_only_whitelisted_headers_traced(self, observability):
+        headers = [(b"user-agent", b"curl/8.0"), (b"cookie", b"session=" + b"x" * 4096)]
+
+        enqueue = await self._dispatch(observability, "/health", 200, headers=headers)
+
+        traced = enqueue.call_args.kwargs["metadata"]["headers"]
+        assert traced == {"user-agent": "curl/8.0"}
+
+    async def test_oversized_header_elided(self, observability):
+        headers = [(b"referer", b"https://example.com/?q=" + b"x" * 4096)]
+
+        enqueue = await self._dispatch(observability, "/health", 200, headers=headers)
+
+        traced = enqueue.call_args.kwargs["metadata"]["headers"]
+        assert traced == {"referer": "<4119B>"}
+
+    async def test_exception_recorded_and_reraised(self, observability):
+        app = AsyncMock(side_effect=RuntimeError("boom"))
+        middleware = observability.LangfuseMiddleware(app)
+        middleware._enabled = True
+
+        with patch.object(observability, "_enqueue_trace_update") as enqueue:
+            with pytest.raises(RuntimeError):
+                await middleware(self._scope("/api/chat"), AsyncMock(), AsyncMock())
+
+        assert enqueue.call_args.kwargs["output"] == {"error": "boom"}
+
+    def test_session_id_read_from_query_string(self, observability):
+        scope = self._scope("/api/chat", query_string=b"session_id=s%201&debug=")
+
+        fields = observability.LangfuseMiddleware._trace_input(scope)
+
+        assert fields["session_id"] == "s 1"
+        assert fields["metadata"]["query_params"] == {"session_id": "s 1", "debug": ""}
+
+    def test_config_from_env(self, observability, monkeypatch):
+        monkeypatch.setenv("LANGFUSE_SAMPLE_RATE", "0.1")
+        monkeypatch.setenv("LANGFUSE_ALWAYS_PATHS", "/api/chat, /api/index")
+
+        config = observability._SampleConfig.from_env()
+
+        assert config.rate == 0.1
+        assert config.always_paths == {"/api/chat", "/api/index"}
+
+
+# ──────────────────────────────────────────────────
+# Test 6: MCP trace context injection
+# ──────────────────────────────────────────────────
+
+
+class TestMCPTraceContextInterceptor:
+    """Tests for propagating trace context into MCP tool calls."""
+
+    @staticmethod
+    def _span(sampled: bool):
+        from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags
+
+        flags = TraceFlags(TraceFlags.SAMPLED if sampled else TraceFlags.DEFAULT)
+        return NonRecordingSpan(SpanContext(1, 2, is_remote=False, trace_flags=flags))
+
+    async def test_context_injected_into_headers_and_meta(self):
+        from src.shared import observability
+
+        ctx = {"traceparent": "00-abc-def-01"}
+        request = MagicMock(headers=None, args={"query": "q"})
+        next_handler = AsyncMock(return_value="ok")
+
+        with patch.object(observability, "is_langfuse_enabled", return_value=True), \
+                patch.object(observability.trace, "get_current_span", return_value=self._span(True)), \
+                patch.object(observability, "extract_trace_context", return_value=ctx):
+            result = await observability.MCPTraceContextInterceptor()(request, next_handler)
+
+        assert result == "ok"
+        assert request.headers == ctx
+        assert request.args["mcp_meta"] == {"trace_context": ctx}
+
+    async def test_no_context_leaves_request_untouched(self):
+        from src.shared import observability
+
+        request = MagicMock(headers=None, args={})
+
+        with patch.object(observability, "is_langfuse_enabled", return_value=True), \
+                patch.object(observability.trace, "get_current_span", return_value=self._span(True)), \
+                patch.object(observability, "extract_trace_context", return_value={}):
+            await observability.MCPTraceContextInterceptor()(request, AsyncMock())
+
+        assert request.headers is None
+        assert request.args == {}
+
+    async def test_unsampled_parent_skips_extraction(self):
+        from src.shared import observability
+
+        request = MagicMock(headers=None, args={})
+
+        with patch.object(observability, "is_langfuse_enabled", return_value=True), \
+                patch.object(observability.trace, "get_current_span", return_value=self._span(False)), \
+                patch.object(observability, "extract_trace_context") as extract:
+            await observability.MCPTraceContextInterceptor()(request, AsyncMock())
+
+        extract.assert_not_called()
+        assert request.headers is None
+
+    def test_traceparent_matches_propagator(self):
+        from opentelemetry import trace
+        from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+        from src.shared import observability
+
+        span = self._span(True)
+        expected: dict[str, str] = {}
+        with trace.use_span(span):
+            TraceContextTextMapPropagator().inject(expected)
+            with patch.object(observability, "is_langfuse_enabled", return_value=True):
+                headers = observability.extract_trace_context()
+
+        assert headers == expected
+
+
+# ──────────────────────────────────────────────────
+# Test 7: trace_context
+# ──────────────────────────────────────────────────
+
+
+class TestTraceContext:
+    """Tests for the trace_context async context manager."""
+
+    async def test_disabled_returns_shared_noop(self):
+        from src.shared import observability
+
+        with patch.object(observability, "is_langfuse_enabled", return_value=False):
+            cm = observability.trace_context("a")
+            async with cm:
+                pass
+
+        assert cm is observability.trace_context("b")
+
+    async def test_error_recorded_and_reraised(self):
+        from src.shared import observability
+
+        with patch.object(observability, "is_langfuse_enabled", return_value=True), \
+                patch.object(observability, "_enqueue_trace_update") as enqueue:
+            with pytest.raises(ValueError):
+                async with observability.trace_context("step", session_id="s1"):
+                    raise ValueError("bad")
+
+        assert enqueue.call_count == 2
+        assert enqueue.call_args_list[0].kwargs["session_id"] == "s1"
+        assert enqueue.call_args_list[1].kwargs["output"] == {"error": "bad"}
@@ -0,0 +1,578 @@
+"""
+Unit tests for the Indexer LLM enrichment pipeline.
+
+The LLM and Neo4j graph manager are replaced with in-memory fakes,
+so no external services are required.
+Run with: pytest tests/test_indexer/test_enrichment.py -v
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.shared.models import ClassEnrichment, FunctionEnrichment
+
+
+# ─── Fakes ───────────────────────────────────────────────────
+
+
+class FakeGraphManager:
+    """Answers the enricher's queries from in-memory function/class rows."""
+
+    def __init__(self, functions=None, classes=None, cache=None):
+        self.functions = functions or []
+        self.classes = classes or []
+        self.cache = dict(cache or {})
+        self.queries: list[str] = []
+        self.enriched: dict[str, dict] = {}
+        self.cache_lookups = 0
+        self.bulk_writes = 0
+
+    async def _run(self, query, params=None):
+        self.queries.append(query)
+        params = params or {}
+        if "UNWIND $qnames" in query and "(f:Function" in query:
+            rows = [
+                {
+                    "qname": qn,
+                    "decorators": [],
+                    "parameters": [
+                        {"name": "b", "position": 1},
+                        {"name": "a", "position": 0},
+                    ],
+                    "callers": ["caller"],
+                    "callees": [],
+                }
+                for qn in params["qnames"]
+            ]
+            if "AS parent_class" in query:  # include_parents=True
+                for row in rows:
+                    row.update(parent_class="pkg.Owner", parent_function=None)
+            return rows
+        if "UNWIND $qnames" in query and "(c:Class" in query:
+            return [
+                {
+                    "qname": qn,
+                    "bases": ["Base"],
+                    "methods": ["run"],
+                    "class_attributes": [],
+                    "decorators": [],
+                }
+                for qn in params["qnames"]
+            ]
+        if "MATCH (c:EnrichmentCache)" in query:
+            return [{"hash": h} for h in self.cache]
+        if "MATCH (f:Function)" in query:
+            return self._page(self.functions, params)
+        if "MATCH (c:Class)" in query:
+            return self._page(self.classes, params)
+        return []
+
+    async def _stream(self, query, params=None):
+        for row in await self._run(query, params):
+            yield row
+
+    async def _run_single(self, query, params=None):
+        self.queries.append(query)
+        rows = self.functions if "(n:Function)" in query else self.classes
+        pending = [r for r in rows if r["qname"] not in self.enriched]
+        return {"total": len(pending)}
+
+    def _page(self, rows, params):
+        """Keyset page over rows not yet enriched, ordered by qname."""
+        pending = sorted(
+            (r for r in rows if r["qname"] not in self.enriched and r["qname"] > params["after"]),
+            key=lambda r: r["qname"],
+        )
+        return [dict(r) for r in pending[: params["limit"]]]
+
+    async def get_cached_enrichment(self, content_hash):
+        self.cache_lookups += 1
+        return self.cache.get(content_hash)
+
+    async def set_enrichments_bulk(self, rows):
+        self.bulk_writes += 1
+        for row in rows:
+            self.enriched[row["qname"]] = row["enrichment"]
+
+    async def cache_enrichments_bulk(self, rows):
+        for row in rows:
+            self.cache[row["content_hash"]] = row["enrichment"]
+
+
+def _function_row(qname, content_hash, **extra):
+    row = {
+        "qname": qname,
+        "source": f"def {qname.rsplit('.', 1)[-1]}(): pass",
+        "content_hash": content_hash,
+        "docstring": "",
+        "is_method": False,
+        "is_nested": False,
+        "is_async": False,
+    }
+    row.update(extra)
+    return row
+
+
+def _class_row(qname, content_hash):
+    return {
+        "qname": qname,
+        "source": f"class {qname.rsplit('.', 1)[-1]}: pass",
+        "content_hash": content_hash,
+        "docstring": "",
+    }
+
+
+@pytest.fixture
+def enricher_and_chains():
+    """LLMEnricher with mocked structured-output chains."""
+    function_chain = MagicMock()
+    function_chain.ainvoke = AsyncMock(
+        return_value=FunctionEnrichment(purpose="does things", summary="", complexity="low")
+    )
+    class_chain = MagicMock()
+    class_chain.ainvoke = AsyncMock(
+        return_value=ClassEnrichment(purpose="holds things", summary="", role="model")
+    )
+    model = MagicMock()
+    model.model_name = "test-model"
+    model.with_structured_output.side_effect = (
+        lambda schema: function_chain if schema is FunctionEnrichment else class_chain
+    )
+
+    with patch("src.agents.indexer.enrichment.get_enrichment_model", return_value=model):
+        from src.agents.indexer.enrichment import LLMEnricher
+
+        yield LLMEnricher(batch_size=2, max_retries=1), function_chain, class_chain
+
+
+# ─── enrich_all_nodes ───────────────────────────────────────
+
+
+class TestEnrichAllNodes:
+    """Tests for the full-graph enrichment pass."""
+
+    async def test_enriches_functions_and_classes(self, enricher_and_chains):
+        enricher, function_chain, class_chain = enricher_and_chains
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", f"h{i}") for i in range(3)],
+            classes=[_class_row("pkg.C", "hc")],
+        )
+
+        count = await enricher.enrich_all_nodes(gm)
+
+        assert count == 4
+        assert set(gm.enriched) == {"pkg.f0", "pkg.f1", "pkg.f2", "pkg.C"}
+        assert gm.cache["h0"]["purpose"] == "does things"
+        assert gm.cache["hc"]["purpose"] == "holds things"
+        assert function_chain.ainvoke.await_count == 3
+        assert class_chain.ainvoke.await_count == 1
+
+    async def test_cache_hit_skips_llm(self, enricher_and_chains):
+        enricher, function_chain, _ = enricher_and_chains
+        cached = {"purpose": "from cache", "design_patterns": [], "domain_concepts": []}
+        gm = FakeGraphManager(
+            functions=[_function_row("pkg.f", "h1")],
+            cache={"h1": cached},
+        )
+
+        count = await enricher.enrich_all_nodes(gm)
+
+        assert count == 1
+        assert gm.enriched["pkg.f"] == cached
+        function_chain.ainvoke.assert_not_awaited()
+
+    async def test_duplicate_content_enriched_once(self, enricher_and_chains):
+        enricher, function_chain, _ = enricher_and_chains
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", "same") for i in range(3)]
+            + [_function_row("pkg.g", "other")],
+        )
+
+        count = await enricher.enrich_all_nodes(gm)
+
+        assert count == 4
+        assert set(gm.enriched) == {"pkg.f0", "pkg.f1", "pkg.f2", "pkg.g"}
+        assert function_chain.ainvoke.await_count == 2
+
+    async def test_failed_representative_releases_duplicates(
+        self, enricher_and_chains, caplog
+    ):
+        enricher, _, _ = enricher_and_chains
+        enricher.enrich_entity = AsyncMock(side_effect=RuntimeError("bad row"))
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", "same") for i in range(3)],
+        )
+
+        count = await enricher.enrich_all_nodes(gm)
+
+        assert count == 0
+        assert enricher._inflight == {}
+        assert "duplicates of pkg.f0: pkg.f1" in caplog.text
+        # Every entity is reported, as a failure or as a skipped duplicate
+        assert all(f"pkg.f{i}" in caplog.text for i in range(3))
+
+    async def test_unknown_hashes_skip_cache_lookup(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", f"h{i}") for i in range(3)],
+            cache={"h1": {"purpose": "from cache"}},
+        )
+
+        await enricher.enrich_all_nodes(gm)
+
+        # Only the hash known to be cached costs a Neo4j lookup
+        assert gm.cache_lookups == 1
+
+    async def test_local_cache_serves_repeat_lookups(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager(cache={"h1": {"purpose": "from cache"}})
+        await enricher._load_known_hashes(gm)
+
+        first = await enricher.get_cached_enrichment(gm, "h1")
+        second = await enricher.get_cached_enrichment(gm, "h1")
+
+        assert first == second == {"purpose": "from cache"}
+        assert gm.cache_lookups == 1
+
+    async def test_context_fetched_once_per_batch(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", f"h{i}") for i in range(4)],
+        )
+
+        await enricher.enrich_all_nodes(gm)
+
+        bundle_queries = [q for q in gm.queries if "UNWIND $qnames" in q]
+        assert len(bundle_queries) == 2  # 4 functions, batch_size=2
+
+    async def test_writes_buffered_into_bulk_batches(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", f"h{i}") for i in range(5)],
+        )
+
+        await enricher.enrich_all_nodes(gm)
+
+        assert len(gm.enriched) == 5
+        # 5 results, batch_size=2; results landing during an in-flight flush
+        # join the next batch, so there are at most 3 writes
+        assert 2 <= gm.bulk_writes <= 3
+        assert enricher._pending_writes == []
+
+    async def test_failed_node_writes_not_counted(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", f"h{i}") for i in range(3)],
+        )
+        gm.set_enrichments_bulk = AsyncMock(side_effect=RuntimeError("deadlock"))
+
+        enriched = await enricher.enrich_all_nodes(gm)
+
+        assert enriched == 0
+
+    async def test_cache_written_when_node_write_fails(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager()
+        gm.set_enrichments_bulk = AsyncMock(side_effect=RuntimeError("deadlock"))
+
+        await enricher._queue_write(gm, "pkg.f", "function", {"purpose": "p"}, "h1")
+        await enricher._flush_writes(gm)
+
+        gm.set_enrichments_bulk.assert_awaited_once()
+        assert gm.cache == {"h1": {"purpose": "p"}}
+        assert enricher._failed_writes == 1
+
+
+# ─── Incremental enrichment ─────────────────────────────────
+
+
+class TestIncrementalEnrichmentCache:
+    """Tests for the incremental updater's use of the enricher's cache."""
+
+    async def test_computed_result_served_from_memory(self, enricher_and_chains):
+        from src.agents.indexer.incremental_updater import _enrich_entity_incremental
+
+        enricher, function_chain, _ = enricher_and_chains
+        gm = FakeGraphManager()
+        gm.transaction = MagicMock()
+        for name in ("delete_semantic_edges", "set_enrichment",
+                     "create_semantic_edges", "cache_enrichment"):
+            setattr(gm, name, AsyncMock())
+        entity = {"qualified_name": "pkg.f", "content_hash": "h1",
+                  "source": "def f(): pass"}
+
+        first = await _enrich_entity_incremental(gm, enricher, entity, "function")
+        second = await _enrich_entity_incremental(gm, enricher, entity, "function")
+
+        assert (first, second) == ("computed", "cached")
+        assert function_chain.ainvoke.await_count == 1
+        assert gm.cache_lookups == 1  # the second lookup never reaches Neo4j
+
+
+# ─── Context helpers ────────────────────────────────────────
+
+
+class TestFunctionContext:
+    """Tests for building prompt context from fetched bundles."""
+
+    async def test_parent_class_only_for_methods(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager()
+
+        plain = await enricher._build_function_context(gm, {"qname": "pkg.f"})
+        method = await enricher._build_function_context(
+            gm, {"qname": "pkg.Owner.f", "is_method": True}
+        )
+
+        assert plain == {"callers": ["caller"]}
+        assert method["parent_class"] == "pkg.Owner"
+
+    async def test_seed_row_parents_used_without_extra_fetch(self, enricher_and_chains):
+        enricher, function_chain, _ = enricher_and_chains
+        gm = FakeGraphManager(functions=[
+            _function_row("pkg.Owner.f", "h1", is_method=True, parent_class="pkg.Owner"),
+        ])
+
+        await enricher.enrich_all_nodes(gm)
+
+        prompt = function_chain.ainvoke.await_args.args[0][1].content
+        assert "This is a method of class: pkg.Owner" in prompt
+        bundle_queries = [q for q in gm.queries if "UNWIND $qnames" in q]
+        assert not any("AS parent_class" in q for q in bundle_queries)
+
+    async def test_parameters_ordered_by_position(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        gm = FakeGraphManager()
+
+        bundles = await enricher._fetch_function_bundle(gm, ["pkg.f"])
+
+        assert [p["name"] for p in bundles["pkg.f"]["parameters"]] == ["a", "b"]
+
+
+# ─── OpenAI Batch API path ──────────────────────────────────
+
+
+class TestBatchApi:
+    """Tests for routing cold-cache enrichment through the Batch API."""
+
+    @staticmethod
+    def _batch_output(items):
+        lines = []
+        for i, purpose in items:
+            body = {"choices": [{"message": {"content": FunctionEnrichment(
+                purpose=purpose, summary="", complexity="low",
+            ).model_dump_json()}}]}
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "response": {"status_code": 200, "body": body},
+            }))
+        return "\n".join(lines)
+
+    async def test_batch_results_stored_without_realtime_calls(self, enricher_and_chains):
+        enricher, function_chain, _ = enricher_and_chains
+        enricher._use_batch_api = True
+        enricher._batch_poll_interval = 0
+
+        client = MagicMock()
+        client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+        client.batches.create = AsyncMock(return_value=MagicMock(id="batch-1", status="in_progress"))
+        client.batches.retrieve = AsyncMock(return_value=MagicMock(
+            id="batch-1", status="completed", output_file_id="file-out",
+        ))
+        client.files.content = AsyncMock(return_value=MagicMock(
+            text=self._batch_output([(0, "batched"), (1, "batched")]),
+        ))
+        enricher._openai_client = client
+
+        gm = FakeGraphManager(
+            functions=[_function_row(f"pkg.f{i}", f"h{i}") for i in range(3)],
+        )
+
+        count = await enricher.enrich_all_nodes(gm)
+
+        assert count == 3
+        assert gm.enriched["pkg.f0"]["purpose"] == "batched"
+        assert gm.enriched["pkg.f1"]["purpose"] == "batched"
+        # Item missing from the batch output falls back to a real-time call
+        assert gm.enriched["pkg.f2"]["purpose"] == "does things"
+        assert function_chain.ainvoke.await_count == 1
+
+
+# ─── Prompt building ────────────────────────────────────────
+
+
+class TestEnrichmentPrompt:
+    """Tests for the enrichment prompt builder."""
+
+    def test_prompt_memoized_by_content_hash_and_context(self):
+        from src.agents.indexer import enrichment_prompts
+
+        entity = {"source": "def f(): pass", "content_hash": "memo1"}
+        first = enrichment_prompts.build_enrichment_prompt(entity, "function", {})
+        second = enrichment_prompts.build_enrichment_prompt(dict(entity), "function", {})
+        with_context = enrichment_prompts.build_enrichment_prompt(
+            entity, "function", {"parent_class": "pkg.Owner"}
+        )
+
+        assert first is second
+        assert "pkg.Owner" in with_context
+        assert "pkg.Owner" not in first
+
+    def test_view_renders_same_prompt_as_dict(self):
+        from src.agents.indexer.enrichment_prompts import _render_enrichment_prompt
+        from src.agents.indexer.models import FunctionView
+
+        fields = {
+            "source": "async def f(a): pass",
+            "qualified_name": "pkg.f",
+            "content_hash": "v1",
+            "docstring": "Doc.",
+            "is_async": True,
+            "decorators": [{"name": "cache"}],
+            "parameters": [{"name": "a"}],
+        }
+
+        assert _render_enrichment_prompt(FunctionView(**fields), "function", {}) == (
+            _render_enrichment_prompt(fields, "function", {})
+        )
+
+    def test_long_function_source_truncated(self):
+        from src.agents.indexer import enrichment_prompts
+
+        source = "def f():\n" + "    x = 1\n" * 2000
+        prompt = enrichment_prompts.build_enrichment_prompt({"source": source}, "function", {})
+
+        assert "# ... [truncated] ..." in prompt
+        assert len(prompt) < enrichment_prompts.MAX_SOURCE_CHARS + 500
+
+    def test_long_class_method_bodies_collapsed(self):
+        from src.agents.indexer.enrichment_prompts import build_enrichment_prompt
+
+        body = "        x = 1\n" * 400
+        source = (
+            "class A:\n"
+            "    def f(self):\n"
+            '        """Doc for f."""\n' + body +
+            "    def g(self):\n" + body
+        )
+        prompt = build_enrichment_prompt({"source": source}, "class", {})
+
+        assert "def f(self):" in prompt and "def g(self):" in prompt
+        assert "Doc for f." in prompt
+        assert "x = 1" not in prompt
+        assert "[truncated]" not in prompt
+
+    def test_prompt_formats_signature_details(self):
+        from src.agents.indexer.enrichment_prompts import build_enrichment_prompt
+
+        prompt = build_enrichment_prompt(
+            {
+                "source": "def f(a): pass",
+                "decorators": [{"name": "cache", "arguments": "1"}, {"name": "x"}],
+                "parameters": [
+                    {"name": "a", "type_annotation": "int", "default_value": "1",
+                     "kind": "keyword_only"},
+                    {"name": "b", "kind": "positional_or_keyword"},
+                ],
+                "calls": [{"callee": "g"}, "h"],
+            },
+            "function",
+            {},
+        )
+
+        assert "Decorators: cache(1), x\n" in prompt
+        assert "Parameters: a: int = 1  [keyword_only], b\n" in prompt
+        assert "Calls: g, h\n" in prompt
+
+
+# ─── Failure fallback ───────────────────────────────────────
+
+
+class TestEnrichmentFallback:
+    """Tests for the minimal enrichment returned when all retries fail."""
+
+    @pytest.mark.parametrize(
+        ("entity_type", "schema", "extra"),
+        [
+            ("function", FunctionEnrichment, {"complexity": "low"}),
+            ("class", ClassEnrichment, {"role": "other"}),
+        ],
+    )
+    async def test_fallback_matches_schema_dump(
+        self, enricher_and_chains, entity_type, schema, extra
+    ):
+        enricher, function_chain, class_chain = enricher_and_chains
+        function_chain.ainvoke.side_effect = RuntimeError("down")
+        class_chain.ainvoke.side_effect = RuntimeError("down")
+
+        result = await enricher.enrich_entity(
+            {"qualified_name": "pkg.x", "docstring": "Does x."}, entity_type
+        )
+
+        assert result == schema(purpose="Does x.", summary="", **extra).model_dump()
+
+
+# ─── Rate limiting ──────────────────────────────────────────
+
+
+class TestCreditSemaphore:
+    """Tests for the requests/tokens-per-minute credit limiter."""
+
+    async def test_waits_for_refund_when_exhausted(self):
+        import asyncio
+
+        from src.shared.llms import CreditSemaphore
+
+        sem = CreditSemaphore(capacity=2, refund_time=0.05)
+        await sem.acquire()
+        await sem.acquire()
+        assert sem.available == 0
+
+        waiter = asyncio.create_task(sem.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await asyncio.wait_for(waiter, timeout=1)
+
+    async def test_oversized_request_clamped_to_capacity(self):
+        from src.shared.llms import CreditSemaphore
+
+        sem = CreditSemaphore(capacity=10, refund_time=60)
+        await sem.acquire(credits=1_000)
+
+        assert sem.available == 0
+
+    async def test_enricher_spends_request_and_token_credits(self, enricher_and_chains):
+        enricher, _, _ = enricher_and_chains
+        rpm_before = enricher._rpm_sem.available
+        tpm_before = enricher._tpm_sem.available
+
+        await enricher.enrich_entity({"qualified_name": "pkg.f", "source": "x" * 400}, "function")
+
+        assert enricher._rpm_sem.available == rpm_before - 1
+        assert enricher._tpm_sem.available < tpm_before - 100
+
+
+# ─── Semantic edge fingerprint ──────────────────────────────
+
+
+class TestSemanticHash:
+    """Tests for the fingerprint that lets bulk writes skip unchanged edges."""
+
+    def test_ignores_order_and_non_edge_fields(self):
+        from src.agents.indexer.graph_enrichment import _semantic_hash
+
+        first = {"purpose": "a", "design_patterns": ["factory", "singleton"]}
+        second = {"purpose": "b", "design_patterns": ["singleton", "factory"]}
+
+        assert _semantic_hash(first) == _semantic_hash(second)
+
+    def test_changes_with_edge_fields(self):
+        from src.agents.indexer.graph_enrichment import _semantic_hash
+
+        base = {"design_patterns": ["factory"], "domain_concepts": ["routing"]}
+        changed = {**base, "domain_concepts": ["validation"]}
+
+        assert _semantic_hash(base) != _semantic_hash(changed)
@@ -0,0 +1,795 @@
+"""
+Unit tests for the Indexer Neo4j graph manager.
+
+The Neo4jHandler is replaced with a recording fake, so no database is
+required; tests assert on the Cypher and round trips issued.
+Run with: pytest tests/test_indexer/test_graph_manager.py -v
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.indexer.graph_manager import Neo4jGraphManager
+
+
+# ─── Fakes ───────────────────────────────────────────────────
+
+
+class RecordingResult:
+    """Minimal async driver result over canned rows."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def consume(self):
+        return None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield SimpleNamespace(data=lambda row=row: row)
+
+
+class RecordingTransaction:
+    """Explicit transaction that records its statements."""
+
+    def __init__(self, handler):
+        self._handler = handler
+        self.statements: list[tuple[str, dict | None]] = []
+
+    async def run(self, query, params=None):
+        self.statements.append((query, params))
+        for marker, rows in self._handler.results.items():
+            if marker in query:
+                return RecordingResult(rows)
+        return RecordingResult([])
+
+
+class RecordingHandler:
+    """Records every query sent through the handler helpers."""
+
+    def __init__(self, results=None, fail_transactions=False):
+        self.results = results or {}
+        self.fail_transactions = fail_transactions
+        self.writes: list[tuple[str, dict | None]] = []
+        self.reads: list[tuple[str, dict | None]] = []
+        self.transactions: list[list[tuple[str, dict | None]]] = []
+        self.autocommits: list[tuple[str, dict | None]] = []
+        self.routed_reads: list[str] = []
+
+    async def run(self, query, params=None):
+        self.reads.append((query, params))
+        for marker, rows in self.results.items():
+            if marker in query:
+                return rows
+        return []
+
+    async def stream(self, query, params=None):
+        for row in await self.run(query, params):
+            yield row
+
+    async def run_read(self, query, params=None):
+        self.routed_reads.append(query)
+        return await self.run(query, params)
+
+    async def run_single(self, query, params=None):
+        rows = await self.run(query, params)
+        return rows[0] if rows else None
+
+    async def write(self, query, params=None):
+        self.writes.append((query, params))
+
+    async def run_autocommit(self, query, params=None):
+        self.autocommits.append((query, params))
+        for marker, rows in self.results.items():
+            if marker in query:
+                return rows
+        return []
+
+    async def write_in_transaction(self, statements):
+        if self.fail_transactions:
+            raise RuntimeError("equivalent index already exists")
+        self.transactions.append(list(statements))
+
+    @asynccontextmanager
+    async def transaction(self):
+        tx = RecordingTransaction(self)
+        yield tx
+        self.transactions.append(tx.statements)
+
+    @property
+    def round_trips(self) -> int:
+        return (
+            len(self.writes) + len(self.reads)
+            + len(self.transactions) + len(self.autocommits)
+        )
+
+
+@pytest.fixture
+def handler():
+    return RecordingHandler()
+
+
+@pytest.fixture
+def gm(handler):
+    return Neo4jGraphManager(handler)
+
+
+# ─── Schema ─────────────────────────────────────────────────
+
+
+class TestEnsureSchema:
+    """Tests for constraint/index bootstrapping."""
+
+    async def test_schema_created_in_two_transactions(self, gm, handler):
+        await gm.ensure_schema()
+
+        assert handler.writes == []
+        assert len(handler.transactions) == 2
+        assert any("CONSTRAINT file_path" in q for q, _ in handler.transactions[0])
+        assert all("VECTOR INDEX" in q for q, _ in handler.transactions[1])
+        assert any("func_name_qname" in q for q, _ in handler.transactions[0])
+        assert any("class_unresolved" in q for q, _ in handler.transactions[0])
+
+    async def test_falls_back_to_per_statement_writes(self, handler):
+        handler.fail_transactions = True
+        gm = Neo4jGraphManager(handler)
+
+        await gm.ensure_schema()
+
+        assert any("CONSTRAINT file_path" in q for q, _ in handler.writes)
+        assert any("VECTOR INDEX" in q for q, _ in handler.writes)
+
+    async def test_vector_indexes_quantized(self, gm, handler):
+        await gm.ensure_schema()
+
+        vector_statements = [q for q, _ in handler.transactions[1]]
+        assert len(vector_statements) == 2
+        assert all("`vector.quantization.enabled`: true" in q for q in vector_statements)
+
+    async def test_plain_vector_index_when_quantization_rejected(self, handler):
+        handler.fail_transactions = True
+        original_write = handler.write
+
+        async def write(query, params=None):
+            if "quantization" in query:
+                raise RuntimeError("Invalid index configuration")
+            await original_write(query, params)
+
+        handler.write = write
+        gm = Neo4jGraphManager(handler)
+
+        await gm.ensure_schema()
+
+        vector_writes = [q for q, _ in handler.writes if "VECTOR INDEX" in q]
+        assert len(vector_writes) == 2
+        assert not any("quantization" in q for q in vector_writes)
+
+
+class TestTransaction:
+    """Tests for grouping graph operations into one transaction."""
+
+    async def test_operations_share_one_transaction(self, gm, handler):
+        async with gm.transaction():
+            await gm.delete_semantic_edges("pkg.f")
+            await gm.set_enrichment("pkg.f", {"purpose": "p"}, "function")
+            async with gm.transaction():  # nested blocks join the outer one
+                await gm.create_semantic_edges("pkg.f", {"design_patterns": ["Factory"]})
+
+        assert handler.writes == []
+        assert len(handler.transactions) == 1
+        assert len(handler.transactions[0]) == 3
+
+    async def test_reads_inside_transaction_see_its_rows(self):
+        handler = RecordingHandler(results={"AS class_attributes": [{"classes": []}]})
+        gm = Neo4jGraphManager(handler)
+
+        async with gm.transaction():
+            entities = await gm.get_file_entities("pkg.py")
+
+        assert entities["classes"] == {}
+        assert handler.reads == []
+        assert len(handler.transactions[0]) == 1
+
+    async def test_streamed_reads_use_transaction(self):
+        handler = RecordingHandler(results={"AS key": [
+            {"key": "pkg.py", "hash": "h", "start": None, "end": None},
+        ]})
+        gm = Neo4jGraphManager(handler)
+
+        async with gm.transaction():
+            assert await gm.prime_hash_cache() == 1
+
+        assert handler.reads == []
+        assert len(handler.transactions[0]) == 1
+
+    async def test_writes_outside_block_unaffected(self, gm, handler):
+        async with gm.transaction():
+            pass
+        await gm.delete_parameters("pkg.f")
+
+        assert len(handler.writes) == 1
+
+
+# ─── Node operations ────────────────────────────────────────
+
+
+class TestCreateFileNode:
+    """Tests for File node creation."""
+
+    async def test_name_is_last_path_component(self, gm, handler):
+        await gm.create_file_node("pkg\\sub/mod.py", "h")
+        await gm.create_file_node("top.py", "h")
+
+        assert [p["name"] for _, p in handler.writes] == ["mod.py", "top.py"]
+
+
+class TestClearAll:
+    """Tests for wiping the graph before a full re-index."""
+
+    async def test_deletes_in_batched_autocommit_transactions(self, gm, handler):
+        await gm.clear_all()
+
+        assert handler.writes == []
+        query, params = handler.autocommits[0]
+        assert "IN TRANSACTIONS OF $batch ROWS" in query
+        assert params == {"batch": 10_000}
+
+
+class TestDeleteFileSubgraph:
+    """Tests for removing a file and everything it contains."""
+
+    async def test_single_round_trip_with_counts(self):
+        handler = RecordingHandler(results={
+            "DETACH DELETE f": [{"entities": 3, "children": 5}],
+        })
+        gm = Neo4jGraphManager(handler)
+
+        result = await gm.delete_file_subgraph("pkg/mod.py")
+
+        assert result == {"deleted_entities": 3, "deleted_children": 5}
+        assert handler.round_trips == 1
+
+    async def test_missing_file_reports_zero(self, gm):
+        result = await gm.delete_file_subgraph("missing.py")
+
+        assert result == {"deleted_entities": 0, "deleted_children": 0}
+
+
+class TestBulkChildWrites:
+    """Tests for UNWIND-batched parameter/attribute/decorator writes."""
+
+    async def test_parameters_written_in_one_round_trip(self, gm, handler):
+        await gm.create_parameters_bulk(
+            "pkg.f", [{"name": "a", "position": 0}, {"name": "b", "position": 1}]
+        )
+
+        assert handler.round_trips == 1
+        _, params = handler.writes[0]
+        assert [p["name"] for p in params["params"]] == ["a", "b"]
+        assert params["params"][0]["kind"] == "positional_or_keyword"
+
+    async def test_class_attributes_written_in_one_round_trip(self, gm, handler):
+        await gm.create_class_attributes_bulk(
+            "pkg.C", [{"name": "x", "type_annotation": "int"}, {"name": "y"}]
+        )
+
+        assert handler.round_trips == 1
+        assert handler.writes[0][1]["attrs"][0]["type_ann"] == "int"
+
+    async def test_decorators_written_in_one_round_trip(self, gm, handler):
+        await gm.create_decorator_edges_bulk(
+            "pkg.f", [{"name": "cache"}, {"name": "route", "arguments": "'/'"}]
+        )
+
+        assert handler.round_trips == 1
+        assert handler.writes[0][1]["decorators"][1] == {"name": "route", "arguments": "'/'"}
+
+    async def test_empty_lists_skip_the_write(self, gm, handler):
+        await gm.create_parameters_bulk("pkg.f", [])
+        await gm.create_class_attributes_bulk("pkg.C", [])
+        await gm.create_decorator_edges_bulk("pkg.f", [])
+
+        assert handler.round_trips == 0
+
+    async def test_delete_decorator_edges_matches_entity_label(self, gm, handler):
+        await gm.delete_decorator_edges("pkg.f")
+        await gm.delete_decorator_edges("pkg.C", "Class")
+
+        assert "MATCH (e:Function {qualified_name: $qname})" in handler.writes[0][0]
+        assert "MATCH (e:Class {qualified_name: $qname})" in handler.writes[1][0]
+        assert handler.writes[1][1] == {"qname": "pkg.C"}
+
+    async def test_delete_decorator_edges_rejects_unknown_label(self, gm, handler):
+        with pytest.raises(ValueError):
+            await gm.delete_decorator_edges("pkg.m", "Module")
+
+        assert handler.round_trips == 0
+
+
+class TestCreateClassNode:
+    """Tests for class creation with decorators and bases."""
+
+    async def test_class_decorators_and_bases_in_one_write(self, gm, handler):
+        await gm.create_class_node("pkg/mod.py", {
+            "qualified_name": "pkg.mod.C",
+            "name": "C",
+            "source": "class C(A, B): pass",
+            "content_hash": "abc",
+            "lineno_start": 1,
+            "lineno_end": 1,
+            "decorators": [{"name": "dataclass"}],
+            "bases": ["A", "B"],
+        })
+
+        assert handler.round_trips == 1
+        _, params = handler.writes[0]
+        assert params["bases"] == ["A", "B"]
+        assert params["decorators"] == [{"name": "dataclass", "arguments": None}]
+
+    async def test_unchanged_source_not_rewritten(self, gm, handler):
+        await gm.create_class_node("pkg/mod.py", {
+            "qualified_name": "pkg.mod.C",
+            "name": "C",
+            "source": "class C: pass",
+            "content_hash": "abc",
+            "lineno_start": 1,
+            "lineno_end": 1,
+        })
+
+        query, _ = handler.writes[0]
+        assert "ON CREATE SET c.name = $name" in query
+        assert "CASE WHEN c.content_hash = $hash THEN [] ELSE [1] END" in query
+
+
+def _parsed_function(qname, nested=(), **extra):
+    func = {
+        "qualified_name": qname,
+        "name": qname.rsplit(".", 1)[-1],
+        "source": "def f(): pass",
+        "content_hash": "h",
+        "lineno_start": 1,
+        "lineno_end": 1,
+        "parameters": [{"name": "x"}],
+        "decorators": [],
+        "nested_functions": list(nested),
+    }
+    func.update(extra)
+    return func
+
+
+class TestCreateFunctionsBulk:
+    """Tests for writing all functions of a file in a few UNWIND queries."""
+
+    async def test_one_write_per_parent_kind_and_nesting_depth(self, gm, handler):
+        inner = _parsed_function("pkg.f.g.h")
+        nested = _parsed_function("pkg.f.g", nested=[inner])
+        top = _parsed_function("pkg.f", nested=[nested])
+        method = _parsed_function("pkg.C.m")
+
+        count = await gm.create_functions_bulk(
+            "pkg.py", [top, _parsed_function("pkg.k")], {"C": [method]},
+        )
+
+        assert count == 5
+        assert handler.round_trips == 4  # top-level, methods, depth 1, depth 2
+        top_write, method_write, depth1, depth2 = handler.writes
+        assert [r["qname"] for r in top_write[1]["rows"]] == ["pkg.f", "pkg.k"]
+        assert method_write[1]["rows"][0]["parent"] == "C"
+        assert method_write[1]["rows"][0]["is_method"] is True
+        assert depth1[1]["rows"][0]["parent"] == "pkg.f"
+        assert depth2[1]["rows"][0]["is_nested"] is True
+        assert "USING INDEX f:File(path)" in method_write[0]
+
+    async def test_no_functions_no_writes(self, gm, handler):
+        assert await gm.create_functions_bulk("pkg.py", []) == 0
+        assert handler.round_trips == 0
+
+
+class TestDecoratorEdges:
+    """Tests for DECORATED_BY edge creation."""
+
+    async def test_single_edge_reuses_bulk_query(self, gm, handler):
+        await gm.create_decorator_edge("pkg.C", {"name": "dataclass"}, "Class")
+        await gm.create_decorator_edges_bulk("pkg.D", [{"name": "total_ordering"}], "Class")
+
+        first, second = (q for q, _ in handler.writes)
+        assert first is second
+        assert "(e:Class {qualified_name: $qname})" in first
+
+    async def test_unknown_label_rejected(self, gm):
+        with pytest.raises(ValueError):
+            await gm.create_decorator_edge("pkg.x", {"name": "d"}, "Module) DETACH DELETE (e")
+
+
+# ─── Edge operations ────────────────────────────────────────
+
+
+class TestImportEdges:
+    """Tests for IMPORTS edge creation."""
+
+    async def test_aliases_stored_as_json(self, gm, handler):
+        await gm.create_import_edge("pkg/a.py", {
+            "source_module": "pkg.a",
+            "module": "numpy",
+            "names": ["numpy"],
+            "aliases": {"numpy": "np"},
+        })
+
+        assert json.loads(handler.writes[0][1]["aliases"]) == {"numpy": "np"}
+
+    async def test_file_imports_written_concurrently(self, handler):
+        in_flight = peak = 0
+        record = handler.write
+
+        async def slow_write(query, params=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            await record(query, params)
+            in_flight -= 1
+
+        handler.write = slow_write
+        gm = Neo4jGraphManager(handler, write_concurrency=2)
+        imports = [{"source_module": "pkg.a", "module": m} for m in ("os", "sys", "re", "")]
+
+        await gm.create_import_edges("pkg/a.py", imports)
+
+        assert [p["tgt_mod"] for _, p in handler.writes] == ["os", "sys", "re"]
+        assert peak == 2
+
+    async def test_write_concurrency_capped_by_pool_size(self, handler):
+        handler.max_connection_pool_size = 4
+
+        gm = Neo4jGraphManager(handler, write_concurrency=16)
+
+        assert gm._write_sem._value == 4
+
+
+class TestResolveAllRelationships:
+    """Tests for global CALLS/INHERITS_FROM resolution."""
+
+    async def test_call_passes_run_in_batched_transactions(self):
+        handler = RecordingHandler(results={
+            "MERGE (caller)-[:CALLS]->(callee)": [{"created": 2}],
+        })
+        gm = Neo4jGraphManager(handler)
+
+        edge_count = await gm.resolve_all_relationships()
+
+        call_passes = [q for q, _ in handler.autocommits if "[:CALLS]->(callee)" in q]
+        assert len(call_passes) == 3
+        assert all("IN TRANSACTIONS OF $batch ROWS" in q for q in call_passes)
+        assert all("USING INDEX callee:Function(name)" in q for q in call_passes)
+        # `_calls` is kept intact; already-linked names are skipped instead
+        assert all("NOT (caller)-[:CALLS]->(:Function {name: callee_name})" in q for q in call_passes)
+        assert not any("SET caller._calls" in q for q in call_passes)
+        assert edge_count >= 6
+
+    async def test_function_calls_resolved_in_one_round_trip(self, gm, handler):
+        await gm.resolve_calls_for_function("pkg.f", ["g", "h", "g"])
+
+        assert handler.round_trips == 1
+        query, params = handler.writes[0]
+        assert "DELETE r" in query
+        assert params == {"qname": "pkg.f", "calls": ["g", "h", "g"]}
+        assert "SET caller._calls = $calls" in query
+
+
+# ─── Enrichment ─────────────────────────────────────────────
+
+
+class TestSetEnrichment:
+    """Tests for storing a single entity's enrichment."""
+
+    async def test_common_and_specific_fields_in_one_write(self, gm, handler):
+        await gm.set_enrichment("pkg.f", {
+            "purpose": "p",
+            "side_effects": ["io"],
+            "parameters_explained": [{"name": "x", "explanation": "y"}],
+        }, "function")
+        await gm.set_enrichment("pkg.C", {"purpose": "p", "role": "r"}, "class")
+
+        assert handler.round_trips == 2
+        fn_query, fn_params = handler.writes[0]
+        cls_query, cls_params = handler.writes[1]
+        assert "(n:Function {qualified_name: $qname})" in fn_query
+        assert "n.parameters_explained" in fn_query and "n.role" not in fn_query
+        assert fn_params["side_effects"] == ["io"]
+        assert "(n:Class {qualified_name: $qname})" in cls_query
+        assert cls_params["role"] == "r"
+
+
+class TestCreateSemanticEdges:
+    """Tests for pattern/concept/collaborator/data-flow edge creation."""
+
+    async def test_all_edge_kinds_in_one_write(self, gm, handler):
+        await gm.create_semantic_edges("pkg.C", {
+            "design_patterns": ["Factory", "Singleton"],
+            "domain_concepts": ["auth"],
+            "collaborators": ["Session"],
+            "data_flows_to": ["save"],
+        })
+
+        assert handler.round_trips == 1
+        _, params = handler.writes[0]
+        assert params["patterns"] == ["Factory", "Singleton"]
+        assert params["collaborators"] == ["Session"]
+
+    @pytest.mark.parametrize("call", [
+        lambda gm: gm.create_semantic_edges("pkg.C", {}),
+        lambda gm: gm.delete_semantic_edges("pkg.C"),
+        lambda gm: gm.set_enrichment("pkg.C", {}, entity_type="module"),
+        lambda gm: gm.set_enrichments_bulk(
+            [{"qname": "pkg.C", "entity_type": "class", "enrichment": {}}]
+        ),
+    ])
+    async def test_anchor_uses_labelled_seek(self, gm, handler, call):
+        await call(gm)
+
+        query, _ = handler.writes[0]
+        assert "MATCH (n {qualified_name" not in query
+        assert "n:Function {qualified_name" in query
+        assert "n:Class {qualified_name" in query
+
+
+class TestEnrichmentCache:
+    """Tests for the EnrichmentCache JSON blob."""
+
+    async def test_round_trip(self, gm, handler):
+        enrichment = {"purpose": "größe", "design_patterns": ["Factory"]}
+
+        await gm.cache_enrichment("h1", enrichment)
+        _, params = handler.writes[0]
+        handler.results["EnrichmentCache"] = [{"data": params["data"]}]
+
+        assert isinstance(params["data"], str)
+        assert await gm.get_cached_enrichment("h1") == enrichment
+
+
+# ─── Embeddings ─────────────────────────────────────────────
+
+
+class TestSetEmbeddingsBulk:
+    """Tests for batched embedding writes."""
+
+    async def test_chunks_rows(self, gm, handler, monkeypatch):
+        from src.agents.indexer import graph_embeddings
+
+        monkeypatch.setattr(graph_embeddings, "EMBED_BATCH_ROWS", 2)
+        items = [{"qname": f"pkg.f{i}", "embedding": [0.1, 0.2]} for i in range(5)]
+
+        await gm.set_embeddings_bulk(items)
+
+        assert [len(params["rows"]) for _, params in handler.writes] == [2, 2, 1]
+        assert "UNWIND $rows" in handler.writes[0][0]
+
+    async def test_create_all_embeddings_writes_each_api_batch(self):
+        handler = RecordingHandler(results={"AS qname": [
+            {"qname": f"pkg.f{i}", "name": f"f{i}", "label": "Function"} for i in range(3)
+        ]})
+        gm = Neo4jGraphManager(handler)
+        model = SimpleNamespace(
+            aembed_documents=lambda texts: asyncio.sleep(0, [[0.5]] * len(texts))
+        )
+
+        count = await gm.create_all_embeddings(model, batch_size=2)
+
+        assert count == 3
+        # Written as each API batch returns, never buffered across batches
+        assert [len(params["rows"]) for _, params in handler.writes] == [2, 1]
+
+
+# ─── Stats ──────────────────────────────────────────────────
+
+
+class TestGetFileEntities:
+    """Tests for loading a file's stored entities for incremental diffing."""
+
+    async def test_single_round_trip_shaped_by_kind(self):
+        handler = RecordingHandler(results={
+            "AS class_attributes": [{
+                "classes": [{"name": "C", "qualified_name": "pkg.C", "content_hash": "c"}],
+                "functions": [{"name": "f", "qualified_name": "pkg.f", "content_hash": "f"}],
+                "methods": [{"name": "m", "qualified_name": "pkg.C.m", "class_name": "C"}],
+                "nested_functions": [],
+                "class_attributes": [{"name": "x", "class_qname": "pkg.C"}],
+            }],
+        })
+        gm = Neo4jGraphManager(handler)
+
+        entities = await gm.get_file_entities("pkg.py")
+
+        assert handler.round_trips == 1
+        assert "CONTAINS*" not in handler.reads[0][0]
+        assert list(entities["classes"]) == ["pkg.C"]
+        assert entities["methods"]["pkg.C.m"]["class_name"] == "C"
+        assert entities["nested_functions"] == {}
+        assert entities["class_attributes"] == [{"name": "x", "class_qname": "pkg.C"}]
+
+    async def test_missing_file_is_empty(self, gm):
+        entities = await gm.get_file_entities("missing.py")
+
+        assert entities == {
+            "classes": {}, "functions": {}, "methods": {},
+            "nested_functions": {}, "class_attributes": [],
+        }
+
+
+class TestCounts:
+    """Tests for node/edge counts from apoc.meta.stats with a scan fallback."""
+
+    async def test_counts_from_meta_stats(self, gm, handler):
+        handler.results["apoc.meta.stats"] = [{
+            "labels": {"Function": 3, "Class": 1, "Stale": 0},
+            "relTypesCount": {"CALLS": 2, "CONTAINS": 4},
+        }]
+
+        assert await gm.get_node_counts() == {"Function": 3, "Class": 1}
+        assert await gm.get_edge_counts() == {"CALLS": 2, "CONTAINS": 4}
+        assert all("apoc.meta.stats" in q for q, _ in handler.reads)
+
+    async def test_falls_back_to_scan_without_apoc(self, gm, handler):
+        from neo4j.exceptions import ClientError
+
+        original_run = handler.run
+
+        async def run(query, params=None):
+            if "apoc.meta.stats" in query:
+                raise ClientError("There is no procedure with the name `apoc.meta.stats`")
+            return await original_run(query, params)
+
+        handler.run = run
+        handler.results["labels(n)[0]"] = [
+            {"counts": [{"label": "Function", "count": 3}]}
+        ]
+
+        assert await gm.get_node_counts() == {"Function": 3}
+        gm._stats_cache.clear()
+        assert await gm.get_node_counts() == {"Function": 3}
+        # APOC is only probed once
+        assert len(handler.routed_reads) == 3
+
+
+class TestStatsCache:
+    """Tests for the short-lived stats cache."""
+
+    async def test_concurrent_pollers_share_one_query(self, gm, handler):
+        results = await asyncio.gather(*(gm.get_enrichment_stats() for _ in range(5)))
+
+        assert len(handler.reads) == 1
+        assert all(r == results[0] for r in results)
+
+    async def test_expired_entry_refetched(self, gm, handler, monkeypatch):
+        from src.agents.indexer import graph_stats
+
+        await gm.get_index_state()
+        monkeypatch.setattr(graph_stats, "STATS_CACHE_TTL", 0.0)
+        gm._stats_cache.clear()
+        await gm.get_index_state()
+        await gm.get_index_state()
+
+        assert len(handler.reads) == 3
+
+    async def test_state_update_invalidates(self, gm, handler):
+        await gm.get_node_counts()
+        await gm.update_index_state(status="indexed")
+        await gm.get_node_counts()
+
+        assert len([q for q, _ in handler.reads if "apoc.meta.stats" in q]) == 2
+
+
+class TestValidationWarnings:
+    """Tests for the orphan / stale-enrichment checks."""
+
+    async def test_both_checks_reported(self):
+        handler = RecordingHandler(results={
+            "NOT ()-[:CONTAINS]->(n)": [{"qname": "pkg.lost"}],
+            "count(n) as count": [{"count": 2}],
+        })
+        gm = Neo4jGraphManager(handler)
+
+        warnings = await gm.get_validation_warnings()
+
+        assert warnings == [
+            "Found 1 orphan nodes: ['pkg.lost']",
+            "2 nodes have stale enrichment",
+        ]
+
+
+class TestReadRouting:
+    """Tests that read-only queries go to the reader-routed helper."""
+
+    async def test_stats_use_read_routing(self, gm, handler):
+        handler.results["apoc.meta.stats"] = [{"labels": {}, "relTypesCount": {}}]
+        await gm.get_node_counts()
+        await gm.get_edge_counts()
+        await gm.get_enrichment_stats()
+        await gm.get_validation_warnings()
+        await gm.get_index_state()
+        await gm.get_cached_enrichment("h1")
+        await gm.get_file_entities("pkg.py")
+
+        assert len(handler.routed_reads) == 8
+        assert len(handler.reads) == 8
+
+    async def test_reads_inside_transaction_stay_on_it(self, gm, handler):
+        async with gm.transaction():
+            await gm.get_cached_enrichment("h1")
+
+        assert handler.routed_reads == []
+        assert len(handler.transactions[0]) == 1
+
+
+# ─── Hash cache ─────────────────────────────────────────────
+
+
+class TestHashCache:
+    """Tests for skipping writes of nodes that are already up to date."""
+
+    async def test_primed_unchanged_nodes_are_not_rewritten(self):
+        handler = RecordingHandler(results={
+            "UNION ALL": [
+                {"key": "pkg.py", "hash": "fh", "start": None, "end": None},
+                {"key": "pkg.f", "hash": "h", "start": 1, "end": 1},
+            ],
+        })
+        gm = Neo4jGraphManager(handler)
+        assert await gm.prime_hash_cache() == 2
+
+        assert await gm.create_file_node("pkg.py", "fh") is False
+        count = await gm.create_functions_bulk(
+            "pkg.py", [_parsed_function("pkg.f"), _parsed_function("pkg.g")],
+        )
+
+        assert count == 2
+        assert len(handler.writes) == 1
+        assert [r["qname"] for r in handler.writes[0][1]["rows"]] == ["pkg.g"]
+
+    async def test_second_identical_write_skipped(self, gm, handler):
+        func = _parsed_function("pkg.f")
+
+        assert await gm.create_function_node("pkg.py", func) is True
+        assert await gm.create_function_node("pkg.py", func) is False
+        assert await gm.create_function_node("pkg.py", {**func, "lineno_end": 2}) is True
+        assert len(handler.writes) == 2
+
+    async def test_delete_forgets_file_entities(self, gm, handler):
+        func = _parsed_function("pkg.mod.f")
+        await gm.create_function_node("pkg/mod.py", func)
+
+        await gm.delete_file_subgraph("pkg/mod.py")
+
+        assert await gm.create_function_node("pkg/mod.py", func) is True
+
+
+# ─── Plan warm-up ───────────────────────────────────────────
+
+
+class TestWarmQueryPlans:
+    """Tests for EXPLAIN-ing hot queries at startup."""
+
+    async def test_hot_queries_explained_once_each(self, gm, handler):
+        planned = await gm.warm_query_plans()
+
+        queries = [q for q, _ in handler.reads]
+        assert planned == len(queries) == len(set(queries))
+        assert all(q.startswith("EXPLAIN ") for q in queries)
+        assert any("MERGE (f:File {path: $path})" in q for q in queries)
+        assert any("n.parameters_explained" in q for q in queries)
+        assert handler.writes == []
+
+    async def test_failures_are_skipped(self, gm, handler):
+        async def failing_run(query, params=None):
+            raise RuntimeError("planner unavailable")
+
+        handler.run = failing_run
+
+        assert await gm.warm_query_plans() == 0
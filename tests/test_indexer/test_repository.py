@@ -0,0 +1,77 @@
+"""
+Unit tests for the Indexer's RepositoryManager file helpers.
+
+Only local filesystem operations are exercised; no git remote is needed.
+"""
+
+import os
+
+import pytest
+
+from src.agents.indexer.repository import RepositoryManager
+
+
+# ─── Fixtures ────────────────────────────────────────────────
+
+
+@pytest.fixture
+def repo(tmp_path):
+    files = [
+        "main.py",
+        "setup.py",
+        "README.md",
+        "pkg/__init__.py",
+        "pkg/core/engine.py",
+        "pkg/__pycache__/engine.cpython-312.py",
+        "tests/test_main.py",
+        "pkg.egg-info/meta.py",
+    ]
+    for rel in files:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+    return tmp_path
+
+
+@pytest.fixture
+def repo_mgr(tmp_path_factory):
+    return RepositoryManager(clone_dir=str(tmp_path_factory.mktemp("clones")))
+
+
+# ─── Discovery ───────────────────────────────────────────────
+
+
+class TestDiscoverPythonFiles:
+    async def test_skips_excluded_dirs_and_files(self, repo, repo_mgr):
+        files = await repo_mgr.discover_python_files(repo)
+
+        assert files == ["main.py", "pkg/__init__.py", "pkg/core/engine.py"]
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unsupported")
+    async def test_symlinked_dirs_not_followed(self, repo, repo_mgr, tmp_path_factory):
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "other.py").write_text("y = 2\n")
+        os.symlink(outside, repo / "linked", target_is_directory=True)
+
+        files = await repo_mgr.discover_python_files(repo)
+
+        assert "linked/other.py" not in files
+
+
+# ─── Reading ─────────────────────────────────────────────────
+
+
+class TestReadFile:
+    async def test_reads_relative_path(self, repo, repo_mgr):
+        (repo / "pkg" / "core" / "engine.py").write_text("def run():\n    pass\n")
+
+        source = await repo_mgr.read_file(repo, "pkg/core/engine.py")
+
+        assert source == "def run():\n    pass\n"
+
+    async def test_invalid_utf8_replaced(self, repo, repo_mgr):
+        (repo / "main.py").write_bytes(b"x = '\xff'\n")
+
+        source = await repo_mgr.read_file(repo, "main.py")
+
+        assert source == "x = '�'\n"